@@ -4,9 +4,11 @@ app.py
 SAG Mill Degradation Monitor — Application Entry Point.
 
 Startup sequence:
-  1. Initialize SQLite DB and seed with 90-day simulated history
-  2. Create Dash app with DARKLY bootstrap theme
-  3. Register all callbacks
+  1. Create Dash app with DARKLY bootstrap theme
+  2. Register all callbacks
+  3. Initialize SQLite DB and seed with 90-day simulated history — inline, or
+     in a background thread when SEED_IN_BACKGROUND=true (pages show a
+     warming-up state until the DB is ready)
   4. Run dev server (or expose `server` for gunicorn in production)
 """
 
@@ -14,15 +16,9 @@ import dash
 import dash_bootstrap_components as dbc
 
 from config.settings import settings
-from src.data.store import initialize_db
 from src.layout.main import create_layout
 
-# ── 1. Seed database on startup ───────────────────────────────────────────────
-print("Initializing database and seeding simulation data...")
-initialize_db()
-print("Database ready.")
-
-# ── 2. Dash app ───────────────────────────────────────────────────────────────
+# ── 1. Dash app ───────────────────────────────────────────────────────────────
 app = dash.Dash(
     __name__,
     external_stylesheets=[dbc.themes.DARKLY],
@@ -34,7 +30,7 @@ app = dash.Dash(
 server = app.server  # gunicorn / Render entry point
 app.layout = create_layout()
 
-# ── 3. Register callbacks ─────────────────────────────────────────────────────
+# ── 2. Register callbacks ─────────────────────────────────────────────────────
 from src.callbacks import alerts, equipment, navigation, trends
 
 navigation.register(app)
@@ -42,6 +38,19 @@ equipment.register(app)
 alerts.register(app)
 trends.register(app)
 
+# ── 3. Seed database ──────────────────────────────────────────────────────────
+if settings.SEED_IN_BACKGROUND:
+    from src.data.startup import start_background_seeding
+
+    print("Seeding database in the background; serving warming-up page meanwhile.")
+    start_background_seeding()
+else:
+    from src.data.store import initialize_db
+
+    print("Initializing database and seeding simulation data...")
+    initialize_db()
+    print("Database ready.")
+
 # ── 4. Run ────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     app.run(
@@ -21,6 +21,7 @@ class AlertCategory(str, Enum):
     POWER = "power"
     DEGRADATION = "degradation"
     HEALTH = "health"
+    MULTIVARIATE = "multivariate"
 
 
 SEVERITY_COLORS: dict[str, str] = {
@@ -12,6 +12,7 @@ ISO 10816 vibration severity zones (mm/s RMS):
 ISO 13381: Condition monitoring prognostics framework.
 """
 
+import math
 from dataclasses import dataclass
 
 
@@ -34,6 +35,64 @@ class EquipmentThresholds:
     load_pct: dict[str, float]  # min / opt_low / opt_high / max
 
 
+@dataclass(frozen=True)
+class WeightProfile:
+    """Health-index weights of the four sub-indices; they must add up to 1."""
+
+    version: int
+    vibration: float
+    thermal: float
+    pressure: float
+    power: float
+
+    def __post_init__(self) -> None:
+        total = self.vibration + self.thermal + self.pressure + self.power
+        if abs(total - 1.0) > 1e-9:
+            raise ValueError(f"HI weights v{self.version} add up to {total}, not 1")
+
+
+@dataclass(frozen=True)
+class BearingGeometry:
+    """Rolling-element bearing geometry; its defect frequencies are orders of shaft speed."""
+
+    n_rollers: int
+    roller_diameter_mm: float
+    pitch_diameter_mm: float
+    contact_angle_deg: float = 0.0
+
+    @property
+    def _ratio(self) -> float:
+        return (
+            self.roller_diameter_mm
+            / self.pitch_diameter_mm
+            * math.cos(math.radians(self.contact_angle_deg))
+        )
+
+    @property
+    def bpfo(self) -> float:
+        """Ball-pass frequency, outer race (× shaft speed)."""
+        return self.n_rollers / 2 * (1 - self._ratio)
+
+    @property
+    def bpfi(self) -> float:
+        """Ball-pass frequency, inner race (× shaft speed)."""
+        return self.n_rollers / 2 * (1 + self._ratio)
+
+    @property
+    def bsf(self) -> float:
+        """Ball (roller) spin frequency (× shaft speed)."""
+        d_over_p = self.roller_diameter_mm / self.pitch_diameter_mm
+        return 1 / (2 * d_over_p) * (1 - self._ratio**2)
+
+
+@dataclass(frozen=True)
+class DriveTrain:
+    """Shaft speed and bearing of the drive-end measurement point."""
+
+    shaft_hz: float
+    bearing: BearingGeometry
+
+
 # ── SAG Mill thresholds ───────────────────────────────────────────────────────
 SAG_THRESHOLDS = EquipmentThresholds(
     vibration=VibrationZones(zone_a=2.3, zone_b=4.5, zone_c=7.1),
@@ -52,6 +111,31 @@ BALL_THRESHOLDS = EquipmentThresholds(
     load_pct={"min": 25.0, "opt_low": 40.0, "opt_high": 50.0, "max": 60.0},
 )
 
+# ── Drive trains (vibration spectral analysis) ──────────────────────────────
+# Drive-end bearing of each mill's motor, where the accelerometer sits.
+SAG_DRIVE = DriveTrain(
+    shaft_hz=16.5,  # 990 rpm motor ahead of the gear reducer
+    bearing=BearingGeometry(
+        n_rollers=18, roller_diameter_mm=42.0, pitch_diameter_mm=240.0, contact_angle_deg=10.0
+    ),
+)
+BALL_DRIVE = DriveTrain(
+    shaft_hz=24.75,  # 1485 rpm
+    bearing=BearingGeometry(
+        n_rollers=16, roller_diameter_mm=32.0, pitch_diameter_mm=180.0, contact_angle_deg=10.0
+    ),
+)
+
+# ── Health-index weight profiles ──────────────────────────────────────────────
+# Append-only history per equipment type; the last profile is the active one.
+# Stored readings remember the version that scored them, so adding a version
+# here and running scripts/rescore_health.py (or restarting the app) rescores
+# the history with it. Never edit a published version in place.
+HI_WEIGHT_PROFILES: dict[str, tuple[WeightProfile, ...]] = {
+    "SAG": (WeightProfile(version=1, vibration=0.30, thermal=0.25, pressure=0.20, power=0.25),),
+    "BALL": (WeightProfile(version=1, vibration=0.30, thermal=0.25, pressure=0.20, power=0.25),),
+}
+
 # ── Equipment registry ────────────────────────────────────────────────────────
 EQUIPMENT_CONFIG: dict[str, dict] = {
     "SAG-01": {
@@ -61,6 +145,7 @@ EQUIPMENT_CONFIG: dict[str, dict] = {
         "color": "#58a6ff",
         "color_rgba": "rgba(88,166,255,0.15)",
         "thresholds": SAG_THRESHOLDS,
+        "drive": SAG_DRIVE,
         "variables": [
             "vibration_mms",
             "bearing_temp_c",
@@ -80,6 +165,7 @@ EQUIPMENT_CONFIG: dict[str, dict] = {
         "color": "#2ea44f",
         "color_rgba": "rgba(46,164,79,0.15)",
         "thresholds": BALL_THRESHOLDS,
+        "drive": BALL_DRIVE,
         "variables": [
             "vibration_mms",
             "bearing_temp_c",
@@ -0,0 +1,54 @@
+"""
+config/gunicorn_conf.py
+───────────────────────
+Production gunicorn configuration.
+
+    gunicorn -c config/gunicorn_conf.py app:server
+
+The app is imported once in the master (preload_app) and the workers are
+forked from it, sharing its modules and read-only tables copy-on-write:
+  - Right before each fork the master disables GC and freezes its heap, so
+    collections in the workers don't write to the inherited pages (see the
+    gc.freeze() docs). GC stays on while the app loads and seeds inline.
+  - when_ready() builds the lookup tables every worker would otherwise build
+    on its first request (src.data.startup.preload_shared_state).
+  - post_fork() gives each worker its own SQLite connection (connections must
+    not cross fork()) and, with SEED_IN_BACKGROUND=true, starts seeding there:
+    the master never runs a seeding thread that a fork could cut in half.
+"""
+
+import gc
+import os
+
+from config.settings import settings
+from src.data.startup import seed_in_workers
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+timeout = 120
+preload_app = True
+
+# With SEED_IN_BACKGROUND=true the seeding thread starts in each worker
+seed_in_workers()
+
+
+def when_ready(server) -> None:
+    from src.data.startup import preload_shared_state
+
+    preload_shared_state()
+    gc.collect()  # drop seeding garbage once, before the heap is frozen
+    server.log.info("Shared read-only state built; forking workers")
+
+
+def pre_fork(server, worker) -> None:
+    # No collection between here and the fork may leave "holes" in the
+    # pages the worker will inherit
+    gc.disable()
+    gc.freeze()
+
+
+def post_fork(server, worker) -> None:
+    from src.data.startup import after_fork
+
+    gc.enable()
+    after_fork()
@@ -24,6 +24,19 @@ class Settings:
     # Simulation
     SIMULATION_SEED: int = int(os.getenv("SIMULATION_SEED", "42"))
     HISTORY_DAYS: int = int(os.getenv("HISTORY_DAYS", "90"))
+    # Seconds between two readings of one equipment (3600 = hourly; 1, 60, 600 for dense feeds)
+    SAMPLE_PERIOD_S: int = int(os.getenv("SAMPLE_PERIOD_S", "3600"))
+
+    # Startup: seed the DB in a background thread and serve a warming-up page
+    # meanwhile, instead of blocking the import of app.py until seeding ends
+    SEED_IN_BACKGROUND: bool = os.getenv("SEED_IN_BACKGROUND", "false").lower() == "true"
+
+    # Query results / figures shared by all workers in "<DATABASE_URL>.cache"
+    # (ignored for an in-memory DATABASE_URL)
+    RESULT_CACHE: bool = os.getenv("RESULT_CACHE", "true").lower() == "true"
+
+    # Raw vibration waveform segments + their index (default: <DATABASE_URL>.waveforms)
+    WAVEFORM_DIR: str = os.getenv("WAVEFORM_DIR", "")
 
     # i18n
     DEFAULT_LANG: str = os.getenv("DEFAULT_LANG", "es")
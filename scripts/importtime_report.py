@@ -0,0 +1,78 @@
+"""
+scripts/importtime_report.py
+─────────────────────────────
+Import-time audit for the Dash entry point.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+prints the total import time, the slowest top-level imports and which of the
+heavy libraries were pulled in at import time (they should load lazily, on
+the first request that needs them).
+
+Usage:
+    python scripts/importtime_report.py [--module app] [--top 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pandas", "numpy", "plotly.graph_objects", "pydantic", "scipy", "sklearn")
+
+
+def run_importtime(module: str) -> list[tuple[int, int, int, str]]:
+    """Return (cumulative_us, self_us, depth, name) for every import recorded."""
+    env = {
+        **os.environ,
+        # Keep the audit about imports, not about seeding a database
+        "DATABASE_URL": ":memory:",
+        "SEED_IN_BACKGROUND": "true",
+        "HISTORY_DAYS": "1",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cum_us), int(self_us), depth, name.strip()))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = run_importtime(args.module)
+    names = {name for _, _, _, name in rows}
+    target = next((r for r in rows if r[3] == args.module), None)
+    total_ms = (target[0] if target else sum(r[0] for r in rows if r[2] == 0)) / 1000
+
+    print(f"import {args.module}: {total_ms:.0f} ms ({len(rows)} modules)\n")
+    print("Slowest top-level imports (cumulative ms, self ms):")
+    top_level = sorted((r for r in rows if r[2] <= 1), reverse=True)[: args.top]
+    for cum_us, self_us, _, name in top_level:
+        print(f"  {cum_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+    print("\nHeavy libraries loaded at import time:")
+    loaded = [m for m in HEAVY_MODULES if m in names]
+    for m in loaded:
+        print(f"  - {m}")
+    if not loaded:
+        print("  (none)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+scripts/rescore_health.py
+──────────────────────────
+Apply the active health-index weight profiles to the stored history.
+
+After appending a WeightProfile version to config.equipment.HI_WEIGHT_PROFILES,
+this recomputes health_index and the sub-scores of every reading scored with
+an older version (the app does the same at startup). It writes in chunks, so
+a running dashboard keeps serving while it works.
+
+Usage:
+    python scripts/rescore_health.py [--force] [--chunk-size 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _progress_bar(start: float):
+    def report(done: int, total: int) -> None:
+        width = 30
+        filled = width * done // total
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        bar = "█" * filled + "·" * (width - filled)
+        print(f"\r  {bar} {done:>9,}/{total:,} rows  {rate:>9,.0f} rows/s", end="", flush=True)
+        if done == total:
+            print()
+
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--force", action="store_true", help="rescore every reading")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    from config.settings import settings
+    from src.data import store
+
+    print(f"Rescoring {settings.DATABASE_URL}")
+    start = time.perf_counter()
+    done = store.rescore_health(
+        chunk_size=args.chunk_size, force=args.force, progress=_progress_bar(start)
+    )
+    print(f"{done:,} readings rescored in {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
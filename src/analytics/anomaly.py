@@ -3,58 +3,137 @@ src/analytics/anomaly.py
 ────────────────────────
 Anomaly detection for equipment sensor streams.
 
-Algorithm: Rolling Z-score on a 24-hour sliding window.
+Algorithm: Rolling Z-score on a 24-hour sliding window. Given timestamps, a
+time window covers that span of the timestamps (rolling.py), so gaps,
+duplicate timestamps and rate changes cannot stretch or shrink it. Without
+them it is converted to rows at the configured sample period (timebase.py).
+An int window is always a row count.
   z = (x - μ_window) / σ_window
   |z| > threshold → anomaly
 
+The mean and σ are pulled toward the very spikes they should flag, so
+method="mad" scores against the rolling median and MAD instead:
+  z = (x - median_window) / (1.4826 · MAD_window)
+where MAD_window is the median of |x - median_window| over the window's
+own readings (the true window MAD). Both run in batch (detect_anomalies)
+and per reading (StreamingDetector) with the same results.
+
 Returns a boolean mask and Z-score series for plotting.
+
+Any timestamped numeric column works, not only sensor readings: the
+per-window vibration spectrum features of spectral.spectral_frame()
+(order_2x_ratio, bpfo, bearing_ratio, ...) go through the same functions;
+their windows are seconds apart, so pass a window such as "5min".
 """
 
 from __future__ import annotations
 
+import math
+from datetime import datetime, timedelta
+
 import numpy as np
 import pandas as pd
 
-DEFAULT_WINDOW = 24  # hours
+from src.analytics.rolling import MadWindow, TimeWindow, rolling_mean_std, rolling_median_mad
+from src.analytics.timebase import Span, to_timedelta, window_rows
+
+DEFAULT_WINDOW = timedelta(hours=24)
 DEFAULT_THRESHOLD = 2.5  # standard deviations
+DEFAULT_METHOD = "zscore"
+MAD_SCALE = 1.4826  # σ / MAD for normal data
 
 
 def rolling_zscore(
     series: pd.Series,
-    window: int = DEFAULT_WINDOW,
+    window: Span = DEFAULT_WINDOW,
     min_periods: int = 4,
+    sample_period: timedelta | None = None,
+    times: pd.Series | None = None,
 ) -> pd.Series:
     """
     Compute rolling Z-score for a time series.
 
     Args:
         series: Numeric pandas Series (indexed by time)
-        window: Rolling window size (number of observations)
+        window: Rolling window, a time span ("24h", timedelta) or a number
+            of observations
         min_periods: Minimum observations needed to compute score
+        sample_period: Interval between observations, default the configured
+            sample period (used only without timestamps)
+        times: Timestamp of each observation; defaults to a DatetimeIndex
+            on the series. With them a time window follows the timestamps
 
     Returns:
         Z-score Series (NaN where window not yet full)
     """
-    roll_mean = series.rolling(window=window, min_periods=min_periods).mean()
-    roll_std = series.rolling(window=window, min_periods=min_periods).std()
+    if times is None and isinstance(series.index, pd.DatetimeIndex):
+        times = series.index
+    if times is not None and not isinstance(window, int):
+        roll_mean, roll_std = rolling_mean_std(series, times, window, min_periods)
+    else:
+        rows = window_rows(window, sample_period)
+        roll_mean = series.rolling(window=rows, min_periods=min_periods).mean()
+        roll_std = series.rolling(window=rows, min_periods=min_periods).std()
     # Avoid division by zero
     roll_std = roll_std.replace(0.0, np.nan)
     return (series - roll_mean) / roll_std
 
 
+def rolling_robust_zscore(
+    series: pd.Series,
+    window: Span = DEFAULT_WINDOW,
+    min_periods: int = 4,
+    sample_period: timedelta | None = None,
+    times: pd.Series | None = None,
+) -> pd.Series:
+    """
+    Rolling robust Z-score, (x - median) / (1.4826 · MAD), over the same windows
+    as rolling_zscore() (arguments are the same).
+
+    Returns:
+        Robust Z-score Series (NaN where window not yet full or MAD is 0)
+    """
+    if times is None and isinstance(series.index, pd.DatetimeIndex):
+        times = series.index
+    if times is not None and not isinstance(window, int):
+        median, mad = rolling_median_mad(series, times, window, min_periods)
+    else:
+        rows = window_rows(window, sample_period)
+        median, mad = rolling_median_mad(series, None, rows, min_periods)
+    median.index = mad.index = series.index
+    return (series - median) / (MAD_SCALE * mad.replace(0.0, np.nan))
+
+
+METHODS = {"zscore": rolling_zscore, "mad": rolling_robust_zscore}
+
+
+def _scorer(method: str):
+    try:
+        return METHODS[method]
+    except KeyError:
+        raise ValueError(
+            f"unknown anomaly method {method!r}, expected one of {list(METHODS)}"
+        ) from None
+
+
 def detect_anomalies(
     series: pd.Series,
-    window: int = DEFAULT_WINDOW,
+    window: Span = DEFAULT_WINDOW,
     threshold: float = DEFAULT_THRESHOLD,
+    sample_period: timedelta | None = None,
+    times: pd.Series | None = None,
+    method: str = DEFAULT_METHOD,
 ) -> tuple[pd.Series, pd.Series]:
     """
     Detect anomalies in a sensor time series.
 
+    `method` is "zscore" (rolling mean / std) or "mad" (rolling median / MAD).
+
     Returns:
         (zscore_series, anomaly_mask)
         where anomaly_mask is a boolean Series (True = anomaly)
     """
-    zscores = rolling_zscore(series, window=window)
+    zscores = _scorer(method)(series, window=window, sample_period=sample_period, times=times)
     anomaly_mask = zscores.abs() > threshold
     return zscores, anomaly_mask
 
@@ -62,11 +141,15 @@ def detect_anomalies(
 def annotate_anomalies(
     df: pd.DataFrame,
     variable: str,
-    window: int = DEFAULT_WINDOW,
+    window: Span = DEFAULT_WINDOW,
     threshold: float = DEFAULT_THRESHOLD,
+    sample_period: timedelta | None = None,
+    timestamp_col: str = "timestamp",
+    method: str = DEFAULT_METHOD,
 ) -> pd.DataFrame:
     """
     Add z-score and anomaly columns to a DataFrame for a given variable.
+    Time windows run on `timestamp_col` when the frame has it.
 
     Returns a copy of df with added columns:
       {variable}_zscore, {variable}_anomaly
@@ -75,7 +158,14 @@ def annotate_anomalies(
     if variable not in df.columns:
         return df
 
-    zscores, mask = detect_anomalies(df[variable], window=window, threshold=threshold)
+    zscores, mask = detect_anomalies(
+        df[variable],
+        window=window,
+        threshold=threshold,
+        sample_period=sample_period,
+        times=df[timestamp_col] if timestamp_col in df.columns else None,
+        method=method,
+    )
     df[f"{variable}_zscore"] = zscores.round(3)
     df[f"{variable}_anomaly"] = mask
     return df
@@ -86,13 +176,24 @@ def get_anomaly_periods(
     variable: str,
     timestamp_col: str = "timestamp",
     threshold: float = DEFAULT_THRESHOLD,
+    window: Span = DEFAULT_WINDOW,
+    sample_period: timedelta | None = None,
+    method: str = DEFAULT_METHOD,
 ) -> list[dict]:
     """
     Extract discrete anomaly periods (start, end, peak_zscore).
 
     Useful for highlighting anomalous regions on trend charts.
     """
-    df = annotate_anomalies(df, variable, threshold=threshold)
+    df = annotate_anomalies(
+        df,
+        variable,
+        window=window,
+        threshold=threshold,
+        sample_period=sample_period,
+        timestamp_col=timestamp_col,
+        method=method,
+    )
     anomaly_col = f"{variable}_anomaly"
     zscore_col = f"{variable}_zscore"
 
@@ -127,3 +228,45 @@ def get_anomaly_periods(
         )
 
     return periods
+
+
+class StreamingDetector:
+    """
+    Per-reading form of detect_anomalies() for live feeds: update() each new
+    reading of one variable, in timestamp order, and get the score the batch
+    functions would give it over the same time window.
+    """
+
+    def __init__(
+        self,
+        window: str | timedelta = DEFAULT_WINDOW,
+        threshold: float = DEFAULT_THRESHOLD,
+        method: str = DEFAULT_METHOD,
+        min_periods: int = 4,
+    ) -> None:
+        _scorer(method)
+        self.window = to_timedelta(window)
+        self.threshold = threshold
+        self.method = method
+        self.min_periods = min_periods
+        if method == "mad":
+            self._robust_stats = MadWindow(self.window)
+        else:
+            self._stats = TimeWindow(self.window)
+
+    def update(self, ts: datetime, value: float) -> tuple[float, bool]:
+        """Returns (zscore, is_anomaly); the score is NaN until the window fills."""
+        z = self._robust(ts, value) if self.method == "mad" else self._zscore(ts, value)
+        return z, abs(z) > self.threshold
+
+    def _zscore(self, ts: datetime, value: float) -> float:
+        stats = self._stats.push(ts, value)
+        if stats.count < self.min_periods or not stats.std:
+            return math.nan
+        return (value - stats.mean) / stats.std
+
+    def _robust(self, ts: datetime, value: float) -> float:
+        median, mad = self._robust_stats.push(ts, value)
+        if len(self._robust_stats) < self.min_periods or not mad:
+            return math.nan
+        return (value - median) / (MAD_SCALE * mad)
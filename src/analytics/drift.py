@@ -0,0 +1,464 @@
+"""
+src/analytics/drift.py
+──────────────────────
+Drift detectors: EWMA control chart and two-sided CUSUM per variable.
+
+A rolling z-score compares each reading with the last 24 h, so a slow rise
+(the incipient stage of bearing wear) drags the window along with it and
+never stands out by more than a fraction of σ. These detectors score each
+reading against a slow reference instead and accumulate the evidence:
+
+  z   = (x − level) / σ           level, σ: exponentially weighted mean / std
+                                  of the variable before x (config.half_life)
+  EWMA    e ← (1 − λ)·e + λ·z     alarm when |e| > L·σ_e(n),
+                                  σ_e(n)² = λ/(2 − λ)·(1 − (1 − λ)^2n)
+  CUSUM   S⁺ ← max(0, S⁺ + z − k),  S⁻ ← max(0, S⁻ − z − k),  alarm when S > h
+
+Each side (up / down) runs in episodes: one starts when its statistic leaves
+zero (EWMA: when e takes that sign) and ends when it returns there. The
+alarm fires once per episode and its DriftEvent reports the episode's first
+reading as the onset, plus the shift in the variable's units: σ·(k + S/N)
+over the N readings of the episode for CUSUM, σ·e for the EWMA.
+
+Readings score nothing while the reference holds less than min_weight
+readings' worth of weight: at first, and after a gap long enough to forget
+it. The charts count readings, not time (λ, k and h are per reading).
+
+update() folds one reading in O(1). update_many() folds a history with the
+recurrences in closed form (decay sums for the reference and the EWMA, a
+running minimum of the cumulative sum for CUSUM), with the same statistics,
+events and end state. The store keeps one detector of each kind per variable
+of DRIFT_CONFIG and machine, advances them on ingest and raises alerts.
+"""
+
+from __future__ import annotations
+
+import math
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from config.alerts import AlertCategory, AlertSeverity
+from src.data.models import Alert
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_LN2 = math.log(2.0)
+_BLOCK = 4_096  # rows per vectorised block
+_STREAM_MAX = 16  # update_many() folds up to this many readings one by one
+_MAX_EXP = 600.0  # keep the decay factors of a block well inside float64
+
+
+@dataclass(frozen=True)
+class DriftConfig:
+    k: float = 0.5  # CUSUM allowance (σ): half the smallest shift of interest
+    h: float = 8.0  # CUSUM decision interval (σ)
+    lam: float = 0.1  # EWMA weight of the newest reading, 0 < λ ≤ 1
+    limit: float = 3.5  # EWMA control limit L, in σ of the EWMA statistic
+    half_life: timedelta = timedelta(days=14)  # forgetting of the reference level / σ
+    min_weight: float = 48.0  # reference weight needed before scoring
+
+
+# Per variable; a variable missing here is not tracked by the store. Power
+# follows the ore feed, so it takes a longer sustained shift to flag.
+DRIFT_CONFIG: dict[str, DriftConfig] = {
+    "vibration_mms": DriftConfig(),
+    "bearing_temp_c": DriftConfig(),
+    "hydraulic_pressure_bar": DriftConfig(),
+    "power_kw": DriftConfig(h=10.0, limit=4.0),
+}
+
+
+class DriftEvent(NamedTuple):
+    detector: str  # "cusum" | "ewma"
+    direction: int  # +1 rising, −1 falling
+    onset: datetime  # first reading of the episode
+    detected: datetime  # reading that raised the alarm
+    magnitude: float  # estimated shift at detection, in the variable's units
+
+
+class DriftScores(NamedTuple):
+    z: np.ndarray  # standardised reading, NaN when not scored
+    upper: np.ndarray  # statistic of the rising side (CUSUM S⁺, EWMA e)
+    lower: np.ndarray  # ... of the falling side (CUSUM S⁻, EWMA −e)
+    threshold: np.ndarray  # alarm level of both sides (h, L·σ_e(n))
+    events: list[DriftEvent]
+
+
+def _us(ts: datetime) -> int:
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def _ts(epoch_us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(epoch_us))
+
+
+def _fresh(t: np.ndarray, last: int | None) -> np.ndarray:
+    """Indices of the readings newer than every one before them (and than `last`)."""
+    first = t[0] - 1 if last is None else last
+    prev = np.maximum.accumulate(np.concatenate(([first], t[:-1])))
+    return np.flatnonzero(t > prev)
+
+
+@dataclass
+class DriftReference:
+    """Exponentially weighted level and σ of one variable, forgetting by time."""
+
+    half_life_h: float
+    weight: float = 0.0  # W, forgetting-weighted reading count
+    mean: float = 0.0
+    scatter: float = 0.0  # W·σ²
+    timestamp_us: int | None = None
+
+    def update(self, x: float, t_us: int) -> tuple[float, float, float]:
+        """(level, σ, W) before `x`, then fold `x` in."""
+        before = self.mean, self._std(self.scatter, self.weight), self.weight
+        if self.timestamp_us is not None:
+            lam = 0.5 ** ((t_us - self.timestamp_us) / 3.6e9 / self.half_life_h)
+            self.weight *= lam
+            self.scatter *= lam
+        d = x - self.mean
+        self.weight += 1.0
+        self.mean += d / self.weight
+        self.scatter += (1.0 - 1.0 / self.weight) * d * d
+        self.timestamp_us = t_us
+        return before
+
+    def update_many(
+        self, x: np.ndarray, t_us: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """update() over increasing timestamps, in closed form per block."""
+        n = len(x)
+        level, std, weight = np.empty(n), np.empty(n), np.empty(n)
+        origin = t_us[0] if self.timestamp_us is None else self.timestamp_us
+        g = (t_us - origin) * (_LN2 / 3.6e9 / self.half_life_h)
+        start, carried = 0, 0.0
+        while start < n:
+            span = int(np.searchsorted(g[start:], g[start] + _MAX_EXP, side="right"))
+            end = start + min(_BLOCK, span)
+            rows = slice(start, end)
+            level[rows], std[rows], weight[rows] = self._fold_block(x[rows], g[rows] - carried)
+            start, carried = end, g[end - 1]
+        self.timestamp_us = int(t_us[-1])
+        return level, std, weight
+
+    def _fold_block(self, x: np.ndarray, g: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        Scalar form of MahalanobisTracker._fold_block: sums centred on the
+        block's first value, decayed by e^(−g) since the carried state.
+        """
+        centre = x[0]
+        xc = x - centre
+        m0 = self.mean - centre
+        e = np.exp(g - g[0])
+        carry = math.exp(-g[0])
+        w = (self.weight * carry + np.cumsum(e)) / e
+        s1 = (self.weight * carry * m0 + np.cumsum(e * xc)) / e
+        s2 = ((self.scatter + self.weight * m0 * m0) * carry + np.cumsum(e * xc * xc)) / e
+        mean = s1 / w
+        scatter = s2 - s1 * mean
+
+        prev_w = np.concatenate(([self.weight], w[:-1]))
+        prev_mean = np.concatenate(([m0], mean[:-1])) + centre
+        prev_scatter = np.concatenate(([self.scatter], scatter[:-1]))
+        self.mean = float(centre + mean[-1])
+        self.scatter = float(scatter[-1])
+        self.weight = float(w[-1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            prev_std = np.sqrt(np.maximum(prev_scatter, 0.0) / prev_w)
+        return prev_mean, prev_std, prev_w
+
+    @staticmethod
+    def _std(scatter: float, weight: float) -> float:
+        return math.sqrt(max(scatter, 0.0) / weight) if weight > 0 else math.nan
+
+
+@dataclass
+class _Side:
+    """One direction of a chart: the current episode and whether it alarmed."""
+
+    alarm: bool = False
+    run_n: int = 0  # scored readings in the episode, 0 with the statistic at zero
+    run_start_us: int | None = None
+
+    def step(self, stat: float, threshold: float, t_us: int) -> bool:
+        """Advance one reading; True when it raises the episode's alarm."""
+        if stat <= 0.0:
+            self.alarm, self.run_n, self.run_start_us = False, 0, None
+            return False
+        if not self.run_n:
+            self.run_start_us = t_us
+        self.run_n += 1
+        if stat > threshold and not self.alarm:
+            self.alarm = True
+            return True
+        return False
+
+    def step_many(
+        self, stat: np.ndarray, threshold: np.ndarray, t_us: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """step() over arrays: (alarm indices, episode length, episode start) per reading."""
+        n = len(stat)
+        idx = np.arange(n)
+        reset = stat <= 0.0
+        last_reset = np.maximum.accumulate(np.where(reset, idx, -1))
+        carried = last_reset < 0
+        run_n = np.where(carried, self.run_n + idx + 1, idx - last_reset)
+        run_n[reset] = 0
+        first = self.run_start_us if self.run_n else t_us[0]
+        run_start = np.where(carried, first, t_us[np.minimum(last_reset + 1, n - 1)])
+
+        # Latch: set above the threshold, cleared by a reset, else held
+        signal = np.where(stat > threshold, 1, np.where(reset, -1, 0))
+        signal = np.concatenate(([1 if self.alarm else -1], signal))
+        held = np.maximum.accumulate(np.where(signal != 0, np.arange(n + 1), 0))
+        state = signal[held] == 1
+        onsets = np.flatnonzero(state[1:] & ~state[:-1])
+
+        self.alarm = bool(state[-1])
+        self.run_n = int(run_n[-1])
+        self.run_start_us = int(run_start[-1]) if self.run_n else None
+        return onsets, run_n, run_start
+
+
+@dataclass
+class _Chart(ABC):
+    """Reference, sides and persistence shared by the two detectors."""
+
+    name = ""
+
+    config: DriftConfig = field(default_factory=DriftConfig)
+    reference: DriftReference | None = None
+    up: _Side = field(default_factory=_Side)
+    down: _Side = field(default_factory=_Side)
+
+    def __post_init__(self) -> None:
+        half_life_h = self.config.half_life / timedelta(hours=1)
+        if self.reference is None:
+            self.reference = DriftReference(half_life_h)
+        self.reference.half_life_h = half_life_h
+
+    @property
+    def timestamp(self) -> datetime | None:
+        """Time of the last reading folded in."""
+        t = self.reference.timestamp_us
+        return None if t is None else _ts(t)
+
+    def update(self, ts: datetime, value: float) -> list[DriftEvent]:
+        """Fold one reading in; NaN and readings not newer than the last are ignored."""
+        scored = self._update(_us(ts), value)
+        return scored[-1] if scored else []
+
+    def update_many(self, values: np.ndarray, epoch_us: np.ndarray) -> DriftScores:
+        """update() for each reading (epoch µs, time order), vectorised."""
+        x = np.asarray(values, dtype=np.float64)
+        t = np.asarray(epoch_us, dtype=np.int64)
+        n = len(x)
+        out = np.full((4, n), np.nan)
+        if n <= _STREAM_MAX:
+            events = []
+            for i in range(n):
+                scored = self._update(int(t[i]), float(x[i]))
+                if scored:
+                    out[:, i] = scored[:4]
+                    events += scored[4]
+            return DriftScores(*out, events)
+
+        keep = _fresh(t, self.reference.timestamp_us)
+        keep = keep[~np.isnan(x[keep])]
+        if not keep.size:
+            return DriftScores(*out, [])
+        level, std, weight = self.reference.update_many(x[keep], t[keep])
+        ok = (weight >= self.config.min_weight) & (std > 0)
+        rows, std = keep[ok], std[ok]
+        if not rows.size:
+            return DriftScores(*out, [])
+        z = (x[rows] - level[ok]) / std
+        upper, lower, threshold = self._advance_many(z)
+        out[:, rows] = z, upper, lower, threshold
+
+        events = []
+        for side, direction, stat in ((self.up, 1, upper), (self.down, -1, lower)):
+            onsets, run_n, run_start = side.step_many(stat, threshold, t[rows])
+            events += [
+                DriftEvent(
+                    self.name,
+                    direction,
+                    _ts(run_start[i]),
+                    _ts(t[rows[i]]),
+                    float(direction * self._shift(stat[i], run_n[i]) * std[i]),
+                )
+                for i in onsets.tolist()
+            ]
+        return DriftScores(*out, sorted(events, key=lambda e: e.detected))
+
+    def _update(self, t_us: int, value: float):
+        """(z, upper, lower, threshold, events) of a scored reading, else None."""
+        last = self.reference.timestamp_us
+        if (last is not None and t_us <= last) or math.isnan(value):
+            return None
+        level, std, weight = self.reference.update(value, t_us)
+        if weight < self.config.min_weight or not std > 0:
+            return None
+        z = (value - level) / std
+        upper, lower, threshold = self._advance(z)
+        events = []
+        for side, direction, stat in ((self.up, 1, upper), (self.down, -1, lower)):
+            if side.step(stat, threshold, t_us):
+                shift = direction * self._shift(stat, side.run_n) * std
+                start = _ts(side.run_start_us)
+                events.append(DriftEvent(self.name, direction, start, _ts(t_us), shift))
+        return z, upper, lower, threshold, events
+
+    @abstractmethod
+    def _advance(self, z: float) -> tuple[float, float, float]:
+        """(upper, lower, threshold) after folding in one z-score."""
+
+    @abstractmethod
+    def _advance_many(self, z: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """_advance() over an array of z-scores, vectorised."""
+
+    @abstractmethod
+    def _shift(self, stat: float, run_n: int) -> float:
+        """Estimated shift in σ from one side's statistic (positive)."""
+
+    def state(self) -> dict:
+        """JSON-serialisable state; the config is not part of it."""
+        out = {name: value for name, value in vars(self).items() if name != "config"}
+        for part in ("reference", "up", "down"):
+            out[part] = dict(vars(out[part]))
+        return out
+
+    @classmethod
+    def from_state(cls, state: dict, config: DriftConfig | None = None):
+        """Detector from state() and the (possibly retuned) config."""
+        state = dict(state)
+        reference = DriftReference(**state.pop("reference"))
+        up, down = _Side(**state.pop("up")), _Side(**state.pop("down"))
+        return cls(config or DriftConfig(), reference, up, down, **state)
+
+
+@dataclass
+class CusumDetector(_Chart):
+    """Two-sided tabular CUSUM of the standardised variable."""
+
+    name = "cusum"
+
+    upper: float = 0.0  # S⁺
+    lower: float = 0.0  # S⁻
+
+    def _advance(self, z: float) -> tuple[float, float, float]:
+        k = self.config.k
+        self.upper = max(0.0, self.upper + z - k)
+        self.lower = max(0.0, self.lower - z - k)
+        return self.upper, self.lower, self.config.h
+
+    def _advance_many(self, z: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # S_t = max(0, S_(t−1) + y_t) is C_t − min(−S_0, min_(j≤t) C_j), C = cumsum(y)
+        k = self.config.k
+        c_up = np.cumsum(z - k)
+        c_down = np.cumsum(-z - k)
+        upper = c_up - np.minimum(-self.upper, np.minimum.accumulate(c_up))
+        lower = c_down - np.minimum(-self.lower, np.minimum.accumulate(c_down))
+        self.upper, self.lower = float(upper[-1]), float(lower[-1])
+        return upper, lower, np.full(len(z), self.config.h)
+
+    def _shift(self, stat: float, run_n: int) -> float:
+        return self.config.k + stat / run_n
+
+
+@dataclass
+class EwmaDetector(_Chart):
+    """EWMA control chart of the standardised variable, with exact start-up limits."""
+
+    name = "ewma"
+
+    value: float = 0.0  # e
+    count: int = 0  # readings charted, for the start-up limits
+
+    def _limit(self, count):
+        lam = self.config.lam
+        return self.config.limit * np.sqrt(lam / (2.0 - lam) * (1.0 - (1.0 - lam) ** (2 * count)))
+
+    def _advance(self, z: float) -> tuple[float, float, float]:
+        self.value += self.config.lam * (z - self.value)
+        self.count += 1
+        return self.value, -self.value, float(self._limit(self.count))
+
+    def _advance_many(self, z: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # e_i = a^i·(e_0 + λ·Σ_(j≤i) z_j / a^j) with a = 1 − λ, in blocks
+        # short enough for a^(−block) to stay finite
+        lam = self.config.lam
+        a = 1.0 - lam
+        n = len(z)
+        if a == 0.0:
+            value = z.copy()
+            self.value = float(value[-1])
+        else:
+            step = max(1, min(_BLOCK, int(_MAX_EXP / -math.log(a))))
+            value = np.empty(n)
+            for start in range(0, n, step):
+                block = z[start : start + step]
+                decay = a ** np.arange(1, len(block) + 1)
+                value[start : start + len(block)] = decay * (
+                    self.value + lam * np.cumsum(block / decay)
+                )
+                self.value = float(value[start + len(block) - 1])
+        count = self.count + np.arange(1, n + 1)
+        self.count = int(count[-1])
+        return value, -value, self._limit(count)
+
+    def _shift(self, stat: float, run_n: int) -> float:
+        return stat
+
+
+DETECTORS: dict[str, type[_Chart]] = {"cusum": CusumDetector, "ewma": EwmaDetector}
+
+
+def _epoch_us(times: pd.Series | pd.DatetimeIndex | np.ndarray) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(times, utc=True)).as_unit("us").asi8
+
+
+def cusum(
+    values: pd.Series | np.ndarray,
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    config: DriftConfig | None = None,
+) -> DriftScores:
+    """Two-sided CUSUM of a whole series (time order) from a fresh detector."""
+    return CusumDetector(config or DriftConfig()).update_many(values, _epoch_us(times))
+
+
+def ewma_chart(
+    values: pd.Series | np.ndarray,
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    config: DriftConfig | None = None,
+) -> DriftScores:
+    """EWMA chart of a whole series (time order) from a fresh detector."""
+    return EwmaDetector(config or DriftConfig()).update_many(values, _epoch_us(times))
+
+
+def drift_alerts(equipment_id: str, variable: str, events: list[DriftEvent]) -> list[Alert]:
+    """One degradation Alert per drift event, dated when it was detected."""
+    config = DRIFT_CONFIG.get(variable, DriftConfig())
+    return [
+        Alert(
+            id=str(uuid.uuid4()),
+            timestamp=e.detected,
+            equipment_id=equipment_id,
+            severity=AlertSeverity.WARNING.value,
+            category=AlertCategory.DEGRADATION.value,
+            variable=variable,
+            value=round(e.magnitude, 3),
+            threshold=config.h if e.detector == "cusum" else config.limit,
+            message=(
+                f"{equipment_id}: deriva {'al alza' if e.direction > 0 else 'a la baja'} "
+                f"de {variable} ({e.magnitude:+.3g}) desde {e.onset:%d/%m %H:%M} UTC, "
+                f"detectada por {e.detector.upper()}"
+            ),
+        )
+        for e in events
+    ]
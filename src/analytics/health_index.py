@@ -5,25 +5,61 @@ Composite Health Index (HI) calculation.
 
 HI ∈ [0, 100] where 100 = perfect condition, 0 = failure imminent.
 
-Weighted sub-indices (ISO 13381 guidance):
+Weighted sub-indices (ISO 13381 guidance; default weights, the active
+profile per equipment type lives in config.equipment.HI_WEIGHT_PROFILES):
   vibration_score  30%  — ISO 10816 zone mapping
   thermal_score    25%  — bearing temperature vs thresholds
   pressure_score   20%  — hydraulic pressure vs operating range
   power_score      25%  — power draw vs nominal range
 
+Sub-indices are piecewise-linear in their sensor value and are evaluated from
+tables compiled once per EquipmentThresholds (score_tables.py), for single
+readings and for whole arrays alike. compute_health_batch() scores arrays of
+readings (used to rescore stored history when a weight profile changes);
+compute_health_frame() does the same for a frame mixing equipment.
+
+compute_health_summary() optionally takes the spectral summary of the
+vibration waveform (spectral.py) and reports its fault diagnosis (2X ratio,
+bearing envelope ratio, suggested mode) next to the scores.
+
 RUL (Remaining Useful Life) estimation:
-  Linear extrapolation of HI trend over last 24 h → time to reach HI = 20.
+  Linear extrapolation of HI trend over last 48 h → time to reach HI = 20.
+  Windows and slopes are in hours whatever the sample period (timebase.py).
+  compute_rul_batch() gives the same estimate at every sample of many series
+  at once, in O(n) via sliding least-squares sums.
 """
 
 from __future__ import annotations
 
+from datetime import timedelta
+
 import numpy as np
 import pandas as pd
 
-from config.equipment import BALL_THRESHOLDS, SAG_THRESHOLDS, EquipmentThresholds
-from src.data.models import HealthSummary, SensorReading
+from config.equipment import (
+    BALL_THRESHOLDS,
+    EQUIPMENT_CONFIG,
+    HI_WEIGHT_PROFILES,
+    SAG_THRESHOLDS,
+    EquipmentThresholds,
+    WeightProfile,
+)
+from src.analytics.score_tables import ScoreTables, compile_thresholds
+from src.analytics.spectral import SpectralSummary
+from src.analytics.timebase import period_hours, window_rows
+from src.data.models import HealthSummary, ReadingRecord, SensorReading
 
 # ── Sub-index helpers ─────────────────────────────────────────────────────────
+# Scoring rules are compiled per EquipmentThresholds into piecewise-linear
+# tables (src/analytics/score_tables.py); scalar and batch callers share them.
+
+
+_TABLES = {"SAG-01": compile_thresholds(SAG_THRESHOLDS)}
+_DEFAULT_TABLES = compile_thresholds(BALL_THRESHOLDS)
+
+
+def _tables(equipment_id: str) -> ScoreTables:
+    return _TABLES.get(equipment_id, _DEFAULT_TABLES)
 
 
 def _vibration_score(vib: float, thr: EquipmentThresholds) -> float:
@@ -32,111 +68,89 @@ def _vibration_score(vib: float, thr: EquipmentThresholds) -> float:
     Zone A → 100, Zone B → 65, Zone C → 30, Zone D → 0.
     Linear interpolation between zone boundaries.
     """
-    za, zb, zc = thr.vibration.zone_a, thr.vibration.zone_b, thr.vibration.zone_c
-    if vib <= za:
-        # Zone A: perfect to upper-A
-        return float(100.0 - (vib / za) * 15.0)
-    if vib <= zb:
-        # Zone A→B: 85 → 65
-        t = (vib - za) / (zb - za)
-        return float(85.0 - t * 20.0)
-    if vib <= zc:
-        # Zone B→C: 65 → 30
-        t = (vib - zb) / (zc - zb)
-        return float(65.0 - t * 35.0)
-    # Zone D: 30 → 0 for 2× zone_c
-    t = min((vib - zc) / zc, 1.0)
-    return float(30.0 - t * 30.0)
+    return compile_thresholds(thr).vibration.score(vib)
 
 
 def _thermal_score(temp: float, thr: EquipmentThresholds) -> float:
     """Score bearing temperature vs warning/alert/critical thresholds."""
-    warn = thr.bearing_temp_c["warning"]
-    alert = thr.bearing_temp_c["alert"]
-    crit = thr.bearing_temp_c["critical"]
-    # Assume 20°C baseline
-    baseline = 20.0
-    if temp <= warn:
-        t = max(0.0, (temp - baseline) / (warn - baseline))
-        return float(100.0 - t * 15.0)
-    if temp <= alert:
-        t = (temp - warn) / (alert - warn)
-        return float(85.0 - t * 35.0)
-    if temp <= crit:
-        t = (temp - alert) / (crit - alert)
-        return float(50.0 - t * 40.0)
-    # Above critical
-    excess = temp - crit
-    return float(max(0.0, 10.0 - excess * 2.0))
+    return compile_thresholds(thr).thermal.score(temp)
 
 
 def _pressure_score(pressure: float, thr: EquipmentThresholds) -> float:
     """Score hydraulic pressure: penalize both below-min and above-max."""
-    p_min = thr.hydraulic_pressure_bar["min"]
-    p_max = thr.hydraulic_pressure_bar["max"]
-    p_crit_high = thr.hydraulic_pressure_bar["critical_high"]
-    p_mid = (p_min + p_max) / 2.0
-
-    if p_min <= pressure <= p_max:
-        # Within operating range: penalty based on distance from midpoint
-        t = abs(pressure - p_mid) / (p_max - p_min) * 2.0
-        return float(100.0 - t * 10.0)
-    if pressure < p_min:
-        drop = (p_min - pressure) / p_min
-        return float(max(0.0, 90.0 - drop * 150.0))
-    if pressure <= p_crit_high:
-        t = (pressure - p_max) / (p_crit_high - p_max)
-        return float(90.0 - t * 60.0)
-    # Above critical high
-    return 0.0
+    return compile_thresholds(thr).pressure.score(pressure)
 
 
 def _power_score(power: float, thr: EquipmentThresholds) -> float:
     """Score power draw vs nominal operating range."""
-    p_min = thr.power_kw["min"]
-    p_nom = thr.power_kw["nominal"]
-    p_max = thr.power_kw["max"]
-
-    if power < p_min:
-        # Underpowered
-        t = (p_min - power) / p_min
-        return float(max(0.0, 80.0 - t * 120.0))
-    if power <= p_nom * 1.05:
-        # Nominal zone
-        return 100.0
-    if power <= p_max:
-        t = (power - p_nom * 1.05) / (p_max - p_nom * 1.05)
-        return float(100.0 - t * 25.0)
-    # Above max
-    excess = (power - p_max) / p_max
-    return float(max(0.0, 75.0 - excess * 150.0))
+    return compile_thresholds(thr).power.score(power)
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    round(v, 2) element-wise. np.round scales by 100 first and so can break
+    near-ties (89.675 → 89.68) differently from Python; those few elements
+    are rounded in Python to match HealthSummary exactly.
+    """
+    scaled = values * 100.0
+    out = np.rint(scaled)  # np.round(values, 2) without scaling twice
+    near_tie = np.abs(np.abs(scaled - out) - 0.5) < 1e-6
+    out /= 100.0
+    if near_tie.any():
+        out[near_tie] = [round(v, 2) for v in values[near_tie].tolist()]
+    return out
 
 
 # ── Main API ──────────────────────────────────────────────────────────────────
 
-WEIGHTS = {
-    "vibration": 0.30,
-    "thermal": 0.25,
-    "pressure": 0.20,
-    "power": 0.25,
-}
 
+def weight_profile(equipment_id: str) -> WeightProfile:
+    """Active HI weight profile for the equipment's type."""
+    equipment_type = EQUIPMENT_CONFIG.get(equipment_id, {}).get("type", "BALL")
+    return HI_WEIGHT_PROFILES[equipment_type][-1]
 
-def compute_health_summary(reading: SensorReading) -> HealthSummary:
-    """Compute a HealthSummary from a single SensorReading."""
-    thr = SAG_THRESHOLDS if reading.equipment_id == "SAG-01" else BALL_THRESHOLDS
 
-    vib_s = _vibration_score(reading.vibration_mms, thr)
-    temp_s = _thermal_score(reading.bearing_temp_c, thr)
-    pres_s = _pressure_score(reading.hydraulic_pressure_bar, thr)
-    pwr_s = _power_score(reading.power_kw, thr)
+SUBSCORE_COLUMNS = ("vibration_score", "thermal_score", "pressure_score", "power_score")
 
-    hi = (
-        WEIGHTS["vibration"] * vib_s
-        + WEIGHTS["thermal"] * temp_s
-        + WEIGHTS["pressure"] * pres_s
-        + WEIGHTS["power"] * pwr_s
+
+def compute_subscores(
+    equipment_id: str,
+    vibration_mms: float,
+    bearing_temp_c: float,
+    hydraulic_pressure_bar: float,
+    power_kw: float,
+) -> tuple[float, float, float, float]:
+    """Unrounded (vibration, thermal, pressure, power) sub-indices, in SUBSCORE_COLUMNS order."""
+    t = _tables(equipment_id)
+    return (
+        t.vibration.score(vibration_mms),
+        t.thermal.score(bearing_temp_c),
+        t.pressure.score(hydraulic_pressure_bar),
+        t.power.score(power_kw),
     )
+
+
+def compute_health_summary(
+    reading: SensorReading | ReadingRecord, spectral: SpectralSummary | None = None
+) -> HealthSummary:
+    """
+    Compute a HealthSummary from a single SensorReading (or ReadingRecord).
+
+    `spectral` (spectral.summarize() of the waveform behind the reading) adds
+    the spectrum's diagnosis to the summary. The HI itself is still scored
+    from the reading alone, so it matches compute_health_batch() and the
+    stored history.
+    """
+    vib_s, temp_s, pres_s, pwr_s = compute_subscores(
+        reading.equipment_id,
+        reading.vibration_mms,
+        reading.bearing_temp_c,
+        reading.hydraulic_pressure_bar,
+        reading.power_kw,
+    )
+
+    w = weight_profile(reading.equipment_id)
+    hi = w.vibration * vib_s + w.thermal * temp_s + w.pressure * pres_s + w.power * pwr_s
     hi = float(np.clip(hi, 0.0, 100.0))
 
     return HealthSummary(
@@ -148,39 +162,109 @@ def compute_health_summary(reading: SensorReading) -> HealthSummary:
         pressure_score=round(pres_s, 2),
         power_score=round(pwr_s, 2),
         degradation_mode=reading.degradation_mode,
+        **(_spectral_fields(spectral) if spectral is not None else {}),
     )
 
 
-def compute_rul(health_series: pd.Series, window_hours: int = 48) -> float | None:
+def _spectral_fields(spectral: SpectralSummary) -> dict:
+    def rounded(v: float) -> float | None:
+        return round(v, 2) if np.isfinite(v) else None
+
+    return {
+        "spectral_mode": spectral.mode,
+        "order_2x_ratio": rounded(spectral.order_2x_ratio),
+        "bearing_envelope_ratio": rounded(spectral.bearing_ratio),
+    }
+
+
+def compute_health_batch(
+    equipment_id: str,
+    vibration_mms: np.ndarray,
+    bearing_temp_c: np.ndarray,
+    hydraulic_pressure_bar: np.ndarray,
+    power_kw: np.ndarray,
+    profile: WeightProfile | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised compute_health_summary() for many readings of one equipment.
+
+    Returns:
+        (health_index, sub_scores): shapes (n,) and (n, 4) with the sub-scores
+        in SUBSCORE_COLUMNS order, rounded to 2 decimals like HealthSummary.
+        `profile` defaults to the active weight profile of the equipment.
+    """
+    t = _tables(equipment_id)
+    w = profile or weight_profile(equipment_id)
+    vib_s = t.vibration.scores(vibration_mms)
+    temp_s = t.thermal.scores(bearing_temp_c)
+    pres_s = t.pressure.scores(hydraulic_pressure_bar)
+    pwr_s = t.power.scores(power_kw)
+
+    hi = w.vibration * vib_s + w.thermal * temp_s + w.pressure * pres_s + w.power * pwr_s
+    hi = np.clip(hi, 0.0, 100.0)
+    scores = np.column_stack([vib_s, temp_s, pres_s, pwr_s])
+    return _round2(hi), _round2(scores)
+
+
+def compute_health_frame(df: pd.DataFrame) -> np.ndarray:
+    """
+    Health index of every row of a readings frame that may mix equipment
+    (e.g. store.get_latest_many()): one compute_health_batch() per equipment.
+    """
+    hi = np.empty(len(df))
+    for equipment_id, rows in df.groupby("equipment_id", sort=False).indices.items():
+        part = df.iloc[rows]
+        hi[rows], _ = compute_health_batch(
+            equipment_id,
+            part["vibration_mms"].to_numpy(),
+            part["bearing_temp_c"].to_numpy(),
+            part["hydraulic_pressure_bar"].to_numpy(),
+            part["power_kw"].to_numpy(),
+        )
+    return hi
+
+
+_RUL_CRITICAL_HI = 20.0
+_RUL_SLOPE_EPS = 1e-6  # slopes above -eps count as flat (see compute_rul)
+
+
+def compute_rul(
+    health_series: pd.Series,
+    window_hours: int = 48,
+    sample_period: timedelta | None = None,
+) -> float | None:
     """
     Estimate Remaining Useful Life (days) using linear extrapolation.
 
     Uses the last `window_hours` of health index data to estimate
     the degradation rate, then projects to HI = 20 (critical threshold).
+    Readings are `sample_period` apart (default: the configured period).
 
     Returns None if trend is stable or improving.
     """
     if len(health_series) < 4:
         return None
 
-    recent = health_series.iloc[-min(window_hours, len(health_series)) :]
+    step_h = period_hours(sample_period)
+    window = window_rows(timedelta(hours=window_hours), sample_period)
+    recent = health_series.iloc[-min(window, len(health_series)) :]
     x = np.arange(len(recent), dtype=float)
     y = recent.values.astype(float)
 
     # Fit linear trend
     coeffs = np.polyfit(x, y, 1)
-    slope = coeffs[0]  # HI change per hour
+    slope = coeffs[0] / step_h  # HI change per hour
 
     # Use a small epsilon to guard against floating-point noise on flat series.
     # np.polyfit on perfectly identical values returns a slope that is not
     # exactly 0.0 (e.g. ~-7e-13), which would bypass the >= 0 guard and
     # produce an astronomically large (and meaningless) RUL estimate.
-    if slope >= -1e-6:
+    if slope >= -_RUL_SLOPE_EPS:
         # Stable or improving — no meaningful RUL projection
         return None
 
     current_hi = float(recent.iloc[-1])
-    critical_threshold = 20.0
+    critical_threshold = _RUL_CRITICAL_HI
 
     if current_hi <= critical_threshold:
         return 0.0
@@ -190,6 +274,69 @@ def compute_rul(health_series: pd.Series, window_hours: int = 48) -> float | Non
     return round(hours_to_critical / 24.0, 1)
 
 
+def compute_rul_batch(
+    health: np.ndarray | pd.Series,
+    window_hours: int = 48,
+    sample_period: timedelta | None = None,
+) -> np.ndarray:
+    """
+    compute_rul() evaluated at every sample of one or many health series.
+
+    Element [..., i] equals compute_rul(series[: i + 1], window_hours), with
+    NaN where compute_rul returns None. The least-squares slope of each
+    window comes from closed-form sums over prefix sums (cumulative-sum
+    sliding regression), so a 90-day backtest costs O(n) instead of one
+    np.polyfit per hour. Slopes agree with np.polyfit to ~1e-12, far inside
+    the -1e-6 flat-series guard, and days are rounded with Python's round()
+    like compute_rul.
+
+    Args:
+        health: Health index values, shape (n,) for one series or
+                (n_series, n) for aligned series (e.g. the whole fleet)
+        window_hours: Regression window, as in compute_rul
+        sample_period: Interval between samples, as in compute_rul
+
+    Returns:
+        RUL in days, same shape as `health`; [..., -1] is the current RUL.
+    """
+    y = np.asarray(health, dtype=float)
+    single = y.ndim == 1
+    y = np.atleast_2d(y)
+    n = y.shape[1]
+    rul = np.full(y.shape, np.nan)
+    if n < 4:
+        return rul[0] if single else rul
+
+    step_h = period_hours(sample_period)
+    window = window_rows(timedelta(hours=window_hours), sample_period)
+    end = np.arange(n)
+    start = np.maximum(end - window + 1, 0)
+    size = (end - start + 1).astype(float)
+
+    # Shifting y by a constant leaves the slope unchanged and keeps the prefix
+    # sums small, which limits cancellation in the differences below.
+    yc = y - y[:, :1]
+    zeros = np.zeros((y.shape[0], 1))
+    sum_y = np.concatenate([zeros, np.cumsum(yc, axis=1)], axis=1)
+    sum_jy = np.concatenate([zeros, np.cumsum(yc * np.arange(n), axis=1)], axis=1)
+
+    # Window x = 0 … size-1 (compute_rul re-indexes each window from 0)
+    sy = sum_y[:, end + 1] - sum_y[:, start]
+    sxy = sum_jy[:, end + 1] - sum_jy[:, start] - start * sy
+    sx = size * (size - 1) / 2
+    sxx = size * (size * size - 1) / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (sxy - sx * sy / size) / sxx / step_h  # HI per hour
+
+    # compute_rul needs 4 readings in the series, not in the window
+    falling = (slope < -_RUL_SLOPE_EPS) & (end >= 3)
+    rul[falling & (y <= _RUL_CRITICAL_HI)] = 0.0
+    project = falling & (y > _RUL_CRITICAL_HI)
+    days = (y[project] - _RUL_CRITICAL_HI) / np.abs(slope[project]) / 24.0
+    rul[project] = [round(d, 1) for d in days.tolist()]
+    return rul[0] if single else rul
+
+
 def compute_fleet_health(summaries: list[HealthSummary]) -> float:
     """Fleet-level health index: minimum of individual equipment HI."""
     if not summaries:
@@ -0,0 +1,362 @@
+"""
+src/analytics/multivariate.py
+─────────────────────────────
+Multivariate anomaly detection: Mahalanobis distance per machine.
+
+Bearing damage raises vibration and bearing temperature together. Each can
+stay inside its own z-score band while the pair has moved well away from how
+the two normally vary together. The tracker keeps an exponentially weighted
+mean and covariance of the HI sensors of one machine and scores each reading
+against the state *before* it:
+
+  d   = x − μ
+  D²  = dᵀ Σ⁻¹ d                  ~ χ² with len(VARIABLES) dof for normal data
+  λ   = 0.5 ** (Δt / half_life)   forgetting per reading, from its time step
+  W   ← λ·W + 1,  a = 1 / W
+  μ   ← μ + a·d
+  M   ← λ·M + (1 − a)·d·dᵀ        Σ = M / W
+
+update() keeps M⁻¹ current with a Sherman–Morrison rank-1 update, so a live
+reading costs O(d²). The update divides by λ, which amplifies its round-off
+as fast as old readings are forgotten, so M is re-inverted once per elapsed
+half-life, and at least every REFRESH_EVERY updates. update_many() folds in
+a whole history with the same recurrences in closed form over vectorised
+blocks, with the same scores and end state.
+Readings score NaN while the state holds less than MIN_WEIGHT readings'
+worth of weight W: at first, and again after a gap long enough to forget it.
+
+Like TrendTracker, the state is a few arrays: the store persists it per
+machine, advances it on ingest and raises alerts (alert_onsets) from it.
+"""
+
+from __future__ import annotations
+
+import math
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from config.alerts import AlertCategory, AlertSeverity
+from src.data.models import Alert
+
+VARIABLES = ("vibration_mms", "bearing_temp_c", "hydraulic_pressure_bar", "power_kw")
+HALF_LIFE = timedelta(days=3)
+MIN_WEIGHT = 48.0  # W needed to score (W tends to 1 / (1 − λ) ≈ 104 hourly)
+REFRESH_EVERY = 1_000  # rank-1 updates between re-inversions of M
+ALERT_PROBABILITY = 1e-4  # χ² tail probability that opens an alert
+CRITICAL_PROBABILITY = 1e-6  # ... and that makes it critical
+CLEAR_PROBABILITY = 1e-2  # an open alert clears once D² is back under this quantile
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_LN2 = math.log(2.0)
+_BLOCK = 4_096  # rows per vectorised block
+_STREAM_MAX = 16  # update_many() folds up to this many readings one by one
+_MAX_EXP = 600.0  # keep e^g of a block well inside float64
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """P(χ²_dof > x) for an integer dof, in closed form."""
+    if x <= 0:
+        return 1.0
+    h = x / 2.0
+    if dof % 2 == 0:
+        term = total = 1.0
+        for i in range(1, dof // 2):
+            term *= h / i
+            total += term
+        return math.exp(-h) * total
+    total = math.erfc(math.sqrt(h))
+    term = math.sqrt(h) * math.exp(-h) / math.gamma(1.5)
+    for i in range(1, (dof + 1) // 2):
+        total += term
+        term *= h / (i + 0.5)
+    return total
+
+
+def chi2_isf(p: float, dof: int) -> float:
+    """x with P(χ²_dof > x) = p (bisection on chi2_sf)."""
+    lo, hi = 0.0, 1.0
+    while chi2_sf(hi, dof) > p:
+        hi *= 2.0
+    for _ in range(100):
+        mid = (lo + hi) / 2.0
+        if chi2_sf(mid, dof) > p:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+ALERT_D2 = chi2_isf(ALERT_PROBABILITY, len(VARIABLES))
+CRITICAL_D2 = chi2_isf(CRITICAL_PROBABILITY, len(VARIABLES))
+CLEAR_D2 = chi2_isf(CLEAR_PROBABILITY, len(VARIABLES))
+
+
+def _ridge(scatter: np.ndarray) -> np.ndarray:
+    """Diagonal loading that keeps M invertible while a sensor has not moved yet."""
+    return 1e-9 * np.diagonal(scatter, axis1=-2, axis2=-1) + 1e-12
+
+
+def _inverse(scatter: np.ndarray) -> np.ndarray:
+    return np.linalg.inv(scatter + np.diag(_ridge(scatter)))
+
+
+def _solve(scatter: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """
+    M⁻¹·d for a stack of (n, k, k) M and (n, k) d. A Cholesky factorisation
+    unrolled over the k² entries, each step a vector operation over the n
+    matrices: for small k several times faster than np.linalg on the stack.
+    Pivots are floored at the ridge, so round-off on a flat sensor cannot
+    make them negative.
+    """
+    ridge = _ridge(scatter)
+    a = scatter + ridge[..., None] * np.eye(scatter.shape[-1])
+    k = a.shape[-1]
+    low = np.zeros_like(a)
+    for j in range(k):
+        pivot = a[:, j, j] - (low[:, j, :j] ** 2).sum(axis=1)
+        low[:, j, j] = np.sqrt(np.maximum(pivot, ridge[:, j]))
+        for i in range(j + 1, k):
+            low[:, i, j] = (a[:, i, j] - (low[:, i, :j] * low[:, j, :j]).sum(axis=1)) / low[:, j, j]
+    z = np.empty_like(d)
+    for i in range(k):  # L·z = d
+        z[:, i] = (d[:, i] - (low[:, i, :i] * z[:, :i]).sum(axis=1)) / low[:, i, i]
+    y = np.empty_like(d)
+    for i in reversed(range(k)):  # Lᵀ·y = z
+        y[:, i] = (z[:, i] - (low[:, i + 1 :, i] * y[:, i + 1 :]).sum(axis=1)) / low[:, i, i]
+    return y
+
+
+class MahalanobisScores(NamedTuple):
+    d2: np.ndarray  # (n,) squared distance of each reading, NaN in warm-up
+    contributions: np.ndarray  # (n, d) per-variable terms d_i·(Σ⁻¹d)_i, summing to D²
+
+
+@dataclass
+class MahalanobisTracker:
+    mean: np.ndarray
+    scatter: np.ndarray  # M = W·Σ
+    weight: float = 1.0  # W, the forgetting-weighted reading count
+    n: int = 1
+    timestamp: datetime | None = None
+    half_life_h: float = HALF_LIFE / timedelta(hours=1)
+    in_alert: bool = False
+    precision: np.ndarray | None = field(default=None, repr=False)  # M⁻¹ of the rank-1 path
+    _since_refresh: int = field(default=0, repr=False)
+    _decayed: float = field(default=0.0, repr=False)  # half-lives since the inversion
+
+    @classmethod
+    def start(
+        cls,
+        values: np.ndarray,
+        timestamp: datetime | None = None,
+        half_life: timedelta = HALF_LIFE,
+    ) -> MahalanobisTracker:
+        x = np.asarray(values, dtype=float)
+        return cls(
+            mean=x.copy(),
+            scatter=np.zeros((x.size, x.size)),
+            timestamp=timestamp,
+            half_life_h=half_life / timedelta(hours=1),
+        )
+
+    @property
+    def covariance(self) -> np.ndarray:
+        return self.scatter / self.weight
+
+    def update(self, values: np.ndarray, timestamp: datetime) -> float:
+        """
+        Score one reading against the current state, then fold it in: O(d²).
+        Readings not newer than the state are ignored (NaN).
+        """
+        if self.timestamp is not None and timestamp <= self.timestamp:
+            return math.nan
+        dt_h = 1.0 if self.timestamp is None else (timestamp - self.timestamp) / timedelta(hours=1)
+        d2, _ = self._step(np.asarray(values, dtype=float), dt_h)
+        self.timestamp = timestamp
+        return d2
+
+    def update_many(self, values: np.ndarray, epoch_us: np.ndarray) -> MahalanobisScores:
+        """
+        Fold in readings given as an (n, d) array and UTC epoch microseconds in
+        time order, with the same scores and end state as update() per reading.
+        A few readings (a live batch) take the O(d²) rank-1 path, longer runs
+        are computed in vectorised blocks. Readings not newer than the last
+        one score NaN and are skipped.
+        """
+        x = np.asarray(values, dtype=float).reshape(-1, self.mean.size)
+        t = np.asarray(epoch_us, dtype=np.int64)
+        d2 = np.full(len(x), np.nan)
+        contrib = np.full(x.shape, np.nan)
+        last = (
+            None
+            if self.timestamp is None
+            else (self.timestamp - _EPOCH) // timedelta(microseconds=1)
+        )
+        # Only strictly increasing timestamps are folded in, as update() does
+        prev = np.maximum.accumulate(np.concatenate(([last if last is not None else t[0] - 1], t)))
+        keep = np.flatnonzero(t > prev[:-1]) if len(t) else np.empty(0, np.int64)
+        if keep.size == 0:
+            return MahalanobisScores(d2, contrib)
+
+        hours = (t[keep] - (last if last is not None else t[keep[0]] - 3_600_000_000)) / 3.6e9
+        if keep.size <= _STREAM_MAX:
+            steps = np.diff(hours, prepend=0.0).tolist()
+            for row, dt_h in zip(keep.tolist(), steps, strict=True):
+                d2[row], row_contrib = self._step(x[row], dt_h)
+                if row_contrib is not None:
+                    contrib[row] = row_contrib
+        else:
+            start = 0
+            while start < keep.size:
+                g = hours[start:] * (_LN2 / self.half_life_h)
+                end = start + min(_BLOCK, int(np.searchsorted(g, g[0] + _MAX_EXP, side="right")))
+                rows = keep[start:end]
+                d2[rows], contrib[rows] = self._fold_block(x[rows], g[: end - start])
+                hours = hours - hours[end - 1]
+                start = end
+            self.precision = None  # re-inverted by the next rank-1 step
+        self.timestamp = _EPOCH + timedelta(microseconds=int(t[keep[-1]]))
+        return MahalanobisScores(d2, contrib)
+
+    def _step(self, x: np.ndarray, dt_h: float) -> tuple[float, np.ndarray | None]:
+        """Rank-1 score and update for one reading `dt_h` hours after the state."""
+        lam = 0.5 ** (dt_h / self.half_life_h)
+        d = x - self.mean
+        new_weight = lam * self.weight + 1.0
+        c = 1.0 - 1.0 / new_weight
+
+        d2, contrib = math.nan, None
+        if self.weight >= MIN_WEIGHT:
+            if self.precision is None:
+                self._refresh()
+            u = self.precision @ d
+            q = float(d @ u)
+            d2, contrib = self.weight * q, self.weight * d * u
+            self.precision = (
+                self.precision - (c / lam) * np.outer(u, u) / (1.0 + c * q / lam)
+            ) / lam
+            self._since_refresh += 1
+            self._decayed += dt_h / self.half_life_h
+            if self._since_refresh >= REFRESH_EVERY or self._decayed >= 1.0:
+                self.precision = None
+        else:
+            self.precision = None
+
+        self.mean = self.mean + d / new_weight
+        self.scatter = lam * self.scatter + c * np.outer(d, d)
+        self.weight = new_weight
+        self.n += 1
+        return d2, contrib
+
+    def _refresh(self) -> None:
+        self.precision = _inverse(self.scatter)
+        self._since_refresh = 0
+        self._decayed = 0.0
+
+    def _fold_block(self, x: np.ndarray, g: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        One block in closed form. Values are centred on the block's first
+        reading c (small sums, no cancellation when the level has moved), and
+        e^(−g_t) is the decay from the carried state to row t:
+          W_t  = e^(−g_t)·(W_0 + Σ_{i≤t} e^(g_i))
+          S1_t = e^(−g_t)·(W_0·(μ_0 − c) + Σ e^(g_i)·x_i)
+          S2_t = e^(−g_t)·(M_0 + W_0·(μ_0 − c)(μ_0 − c)ᵀ + Σ e^(g_i)·x_i·x_iᵀ)
+          μ_t  = c + S1_t / W_t,   M_t = S2_t − S1_t·S1_tᵀ / W_t
+        The exponents are taken relative to g_0 so they stay bounded.
+        """
+        n, dim = x.shape
+        centre = x[0]
+        xc = x - centre
+        m0 = self.mean - centre
+        e = np.exp(g - g[0])  # ≤ e^_MAX_EXP
+        carry = math.exp(-g[0])  # decay of the carried state to row 0
+        w = (self.weight * carry + np.cumsum(e)) / e
+        s1 = (self.weight * carry * m0 + np.cumsum(e[:, None] * xc, axis=0)) / e[:, None]
+        s2 = (
+            (self.scatter + self.weight * np.outer(m0, m0)) * carry
+            + np.cumsum(e[:, None, None] * (xc[:, :, None] * xc[:, None, :]), axis=0)
+        ) / e[:, None, None]
+        mean = s1 / w[:, None]
+        scatter = s2 - s1[:, :, None] * s1[:, None, :] / w[:, None, None]
+
+        # State before each row: the carried one, then the block's own
+        prev_w = np.concatenate(([self.weight], w[:-1]))
+        prev_mean = np.concatenate((m0[None], mean[:-1]))
+        prev_scatter = np.concatenate((self.scatter[None], scatter[:-1]))
+        warm = prev_w >= MIN_WEIGHT
+        d2 = np.full(n, np.nan)
+        contrib = np.full((n, dim), np.nan)
+        if warm.any():
+            d = xc[warm] - prev_mean[warm]
+            y = _solve(prev_scatter[warm], d)
+            contrib[warm] = prev_w[warm, None] * d * y
+            d2[warm] = contrib[warm].sum(axis=1)
+
+        self.mean = centre + mean[-1]
+        self.scatter = scatter[-1]
+        self.weight = float(w[-1])
+        self.n += n
+        return d2, contrib
+
+
+def alert_onsets(d2: np.ndarray, in_alert: bool = False) -> tuple[np.ndarray, bool]:
+    """
+    Indices where D² opens an alert (crosses ALERT_D2 while none is open) and
+    whether one is still open at the end. An alert stays open until D² drops
+    under CLEAR_D2; NaN scores change nothing.
+    """
+    signal = np.where(d2 > ALERT_D2, 1, np.where(d2 < CLEAR_D2, -1, 0))
+    signal = np.concatenate(([1 if in_alert else -1], signal))
+    last_set = np.maximum.accumulate(np.where(signal != 0, np.arange(signal.size), 0))
+    state = signal[last_set] == 1
+    onsets = np.flatnonzero(state[1:] & ~state[:-1])
+    return onsets, bool(state[-1])
+
+
+def onset_alerts(
+    equipment_id: str, epoch_us: np.ndarray, scores: MahalanobisScores, onsets: np.ndarray
+) -> list[Alert]:
+    """One Alert per onset, naming the two variables that weigh most in its D²."""
+    alerts = []
+    for i in onsets.tolist():
+        d2 = float(scores.d2[i])
+        critical = d2 > CRITICAL_D2
+        top = np.argsort(scores.contributions[i])[::-1][:2]
+        alerts.append(
+            Alert(
+                id=str(uuid.uuid4()),
+                timestamp=_EPOCH + timedelta(microseconds=int(epoch_us[i])),
+                equipment_id=equipment_id,
+                severity=(AlertSeverity.CRITICAL if critical else AlertSeverity.ALERT).value,
+                category=AlertCategory.MULTIVARIATE.value,
+                variable="mahalanobis",
+                value=round(d2, 2),
+                threshold=round(CRITICAL_D2 if critical else ALERT_D2, 2),
+                message=(
+                    f"{equipment_id}: desviación conjunta D² = {d2:.1f} "
+                    f"(umbral: {ALERT_D2:.1f}); mayor aporte: "
+                    + ", ".join(VARIABLES[j] for j in top.tolist())
+                ),
+            )
+        )
+    return alerts
+
+
+def mahalanobis_frame(df: pd.DataFrame, half_life: timedelta = HALF_LIFE) -> pd.Series:
+    """
+    Mahalanobis distance D of each row of a readings frame (timestamp +
+    VARIABLES), from a tracker started at its first row. NaN in warm-up.
+    """
+    if df.empty:
+        return pd.Series(dtype=float, index=df.index)
+    stamps = pd.DatetimeIndex(pd.to_datetime(df["timestamp"], utc=True))
+    epoch_us = stamps.as_unit("us").asi8
+    x = df[list(VARIABLES)].to_numpy(dtype=float)
+    tracker = MahalanobisTracker.start(x[0], stamps[0].to_pydatetime(), half_life)
+    d2 = np.concatenate(([np.nan], tracker.update_many(x[1:], epoch_us[1:]).d2))
+    return pd.Series(np.sqrt(d2), index=df.index)
@@ -0,0 +1,436 @@
+"""
+src/analytics/rolling.py
+────────────────────────
+Time-indexed rolling statistics for irregularly sampled series.
+
+A "24h" window ends at each reading and holds the readings of the previous
+24 hours by timestamp, (t − 24 h, t], however many there are: a gap shrinks
+it, duplicate timestamps or a faster feed grow it. A row-count window
+(series.rolling(24)) silently changes meaning when any of that happens.
+Readings that share a timestamp enter in row order, so each one sees the
+ones before it, as in pandas.
+
+  - rolling_mean_std(), rolling_median(): batch forms on the timestamps
+    (pandas offset windows, variable-size kernels; the median keeps the
+    window in an indexable skip-list, O(log w) per step); unsorted input is
+    sorted and the result put back in the caller's order
+  - TimeWindow: streaming mean / std for live readings. A deque of the
+    window's points with Welford add/remove updates, plus monotonic deques
+    that keep the window min and max; O(1) amortised per push
+  - MedianWindow: streaming median. Two heaps split the window at its
+    middle; values that leave are deleted lazily when they reach a top,
+    O(log w) amortised per push
+  - rolling_median_mad() / MadWindow: median and median absolute deviation
+    of each window against its own median. Windows of up to 128 readings
+    are sorted in chunks as rows of a NaN-padded matrix; wider ones, and
+    the stream, keep the window as a sorted list and select the MAD from
+    the deviations on either side of the median (two sorted runs) in
+    O(log w), without sorting them
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from bisect import bisect_left, insort
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.timebase import to_timedelta
+
+
+def _time_rolling(
+    values: pd.Series | np.ndarray,
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    span: str | timedelta,
+    min_periods: int,
+    *aggs: str,
+) -> list[pd.Series]:
+    """Offset-window aggregations on the sorted timestamps, returned in the caller's order."""
+    index = values.index if isinstance(values, pd.Series) else None
+    stamps = pd.DatetimeIndex(pd.to_datetime(times, utc=True))
+    x = pd.Series(np.asarray(values, dtype=float), index=stamps)
+    inverse = None
+    if not stamps.is_monotonic_increasing:
+        order = np.argsort(stamps.asi8, kind="stable")
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(order.size)
+        x = x.iloc[order]
+
+    roll = x.rolling(to_timedelta(span), min_periods=min_periods)
+    out = []
+    for agg in aggs:
+        result = getattr(roll, agg)().to_numpy()
+        out.append(pd.Series(result if inverse is None else result[inverse], index=index))
+    return out
+
+
+def rolling_mean_std(
+    values: pd.Series | np.ndarray,
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    span: str | timedelta,
+    min_periods: int = 1,
+) -> tuple[pd.Series, pd.Series]:
+    """
+    Rolling mean and standard deviation (ddof=1) over the trailing `span` of time.
+
+    Args:
+        values: Numeric values, NaN skipped
+        times: Timestamp of each value (any order, duplicates allowed)
+        span: Window length ("24h", timedelta)
+        min_periods: Minimum non-NaN values in the window, else NaN
+
+    Returns:
+        (mean, std) aligned with `values` (its index when it is a Series)
+    """
+    mean, std = _time_rolling(values, times, span, min_periods, "mean", "std")
+    return mean, std
+
+
+def rolling_median(
+    values: pd.Series | np.ndarray,
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    span: str | timedelta,
+    min_periods: int = 1,
+) -> pd.Series:
+    """Rolling median over the trailing `span` of time; arguments as rolling_mean_std()."""
+    (median,) = _time_rolling(values, times, span, min_periods, "median")
+    return median
+
+
+class WindowStats(NamedTuple):
+    count: int
+    mean: float
+    std: float  # ddof=1, NaN below two points
+    min: float
+    max: float
+
+
+class TimeWindow:
+    """
+    Trailing time window over a live stream.
+
+    push() readings in timestamp order (ties allowed); each call evicts what
+    fell out of (ts − span, ts] and returns the window statistics including
+    the new value, matching rolling_mean_std() on the same data.
+    """
+
+    def __init__(self, span: str | timedelta) -> None:
+        self.span = to_timedelta(span)
+        self._points: deque[tuple[datetime, float]] = deque()
+        self._min: deque[tuple[datetime, float]] = deque()  # values increasing
+        self._max: deque[tuple[datetime, float]] = deque()  # values decreasing
+        self._last: datetime | None = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def push(self, ts: datetime, value: float) -> WindowStats:
+        if self._last is not None and ts < self._last:
+            raise ValueError(f"reading at {ts} is older than the last one ({self._last})")
+        self._last = ts
+        cutoff = ts - self.span
+        points = self._points
+        while points and points[0][0] <= cutoff:
+            self._remove(points.popleft()[1])
+        for extreme in (self._min, self._max):
+            while extreme and extreme[0][0] <= cutoff:
+                extreme.popleft()
+
+        if not math.isnan(value):
+            points.append((ts, value))
+            self._add(value)
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((ts, value))
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((ts, value))
+        return self.stats()
+
+    def stats(self) -> WindowStats:
+        n = len(self._points)
+        if n == 0:
+            return WindowStats(0, math.nan, math.nan, math.nan, math.nan)
+        std = math.sqrt(max(self._m2, 0.0) / (n - 1)) if n > 1 else math.nan
+        return WindowStats(n, self._mean, std, self._min[0][1], self._max[0][1])
+
+    def _add(self, x: float) -> None:
+        n = len(self._points)
+        delta = x - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x: float) -> None:
+        n = len(self._points)
+        if n == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / n
+        self._m2 -= delta * (x - self._mean)
+
+
+class MedianWindow:
+    """
+    Trailing time-window median over a live stream, matching rolling_median().
+
+    `_lo` is a max-heap (negated) with the lower half of the window and `_hi`
+    a min-heap with the upper half; `_lo` holds the extra value when the count
+    is odd. An evicted value is only counted in `_delayed` and popped once it
+    surfaces at the top of its heap, so sizes are tracked separately.
+    """
+
+    def __init__(self, span: str | timedelta) -> None:
+        self.span = to_timedelta(span)
+        self._points: deque[tuple[datetime, float]] = deque()
+        self._lo: list[float] = []
+        self._hi: list[float] = []
+        self._lo_n = 0
+        self._hi_n = 0
+        self._delayed: defaultdict[float, int] = defaultdict(int)
+        self._last: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def push(self, ts: datetime, value: float) -> float:
+        """Add a reading (NaN only evicts) and return the window median."""
+        if self._last is not None and ts < self._last:
+            raise ValueError(f"reading at {ts} is older than the last one ({self._last})")
+        self._last = ts
+        cutoff = ts - self.span
+        while self._points and self._points[0][0] <= cutoff:
+            self._discard(self._points.popleft()[1])
+        if not math.isnan(value):
+            self._points.append((ts, value))
+            self._insert(value)
+        return self.median()
+
+    def median(self) -> float:
+        if not self._points:
+            return math.nan
+        if self._lo_n > self._hi_n:
+            return -self._lo[0]
+        return (-self._lo[0] + self._hi[0]) / 2
+
+    def _insert(self, x: float) -> None:
+        if not self._lo_n or x <= -self._lo[0]:
+            heapq.heappush(self._lo, -x)
+            self._lo_n += 1
+        else:
+            heapq.heappush(self._hi, x)
+            self._hi_n += 1
+        self._balance()
+
+    def _discard(self, x: float) -> None:
+        self._delayed[x] += 1
+        if x <= -self._lo[0]:
+            self._lo_n -= 1
+            if x == -self._lo[0]:
+                self._prune(self._lo, -1.0)
+        else:
+            self._hi_n -= 1
+            if x == self._hi[0]:
+                self._prune(self._hi, 1.0)
+        self._balance()
+
+    def _prune(self, heap: list[float], sign: float) -> None:
+        while heap:
+            x = sign * heap[0]
+            if not self._delayed.get(x):
+                return
+            self._delayed[x] -= 1
+            if not self._delayed[x]:
+                del self._delayed[x]
+            heapq.heappop(heap)
+
+    def _balance(self) -> None:
+        if self._lo_n > self._hi_n + 1:
+            heapq.heappush(self._hi, -heapq.heappop(self._lo))
+            self._lo_n -= 1
+            self._hi_n += 1
+            self._prune(self._lo, -1.0)
+        elif self._lo_n < self._hi_n:
+            heapq.heappush(self._lo, -heapq.heappop(self._hi))
+            self._hi_n -= 1
+            self._lo_n += 1
+            self._prune(self._hi, 1.0)
+
+
+class _SortedValues:
+    """Multiset of floats kept sorted, with its median and MAD."""
+
+    def __init__(self) -> None:
+        self._s: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._s)
+
+    def add(self, x: float) -> None:
+        insort(self._s, x)
+
+    def remove(self, x: float) -> None:
+        del self._s[bisect_left(self._s, x)]
+
+    def median(self) -> float:
+        s, k = self._s, len(self._s)
+        if not k:
+            return math.nan
+        return s[k // 2] if k % 2 else (s[k // 2 - 1] + s[k // 2]) / 2
+
+    def mad(self, median: float) -> float:
+        """
+        Median of |x − median| over the values. Below p = bisect_left(median)
+        the deviations median − s[i] grow leftwards, from p on s[i] − median
+        grow rightwards: binary-search how many of the r + 1 smallest come
+        from the left run (r = (k − 1) // 2). An even k also needs the next
+        one, the smaller of the two runs' next deviations.
+        """
+        s, m, k = self._s, median, len(self._s)
+        if not k:
+            return math.nan
+        p = bisect_left(s, m)
+        r = (k - 1) // 2
+        lo, hi = r + 1 - (k - p), r + 1
+        if lo < 0:
+            lo = 0
+        if hi > p:
+            hi = p
+        while lo < hi:
+            a = (lo + hi) // 2  # left deviations taken, r + 1 − a right ones
+            if m - s[p - 1 - a] < s[p + r - a] - m:
+                lo = a + 1
+            else:
+                hi = a
+        b = r + 1 - lo
+        left = m - s[p - lo] if lo else -math.inf
+        right = s[p + b - 1] - m if b else -math.inf
+        dev = left if left > right else right
+        if k % 2:
+            return dev
+        left = m - s[p - 1 - lo] if lo < p else math.inf
+        right = s[p + b] - m if p + b < k else math.inf
+        return (dev + (left if left < right else right)) / 2
+
+
+_SORTED_WINDOW_MAX = 128  # widest window still sorted as a matrix row
+_SORTED_CHUNK = 1 << 21  # matrix cells per chunk
+
+
+def _median_mad_sorted(
+    x: np.ndarray, start: np.ndarray, widest: int, min_periods: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Narrow windows: sort each chunk of windows as a NaN-padded matrix."""
+    n = x.size
+    median, mad = np.full(n, np.nan), np.full(n, np.nan)
+    offsets = np.arange(widest - 1, -1, -1)
+    step = max(1, _SORTED_CHUNK // widest)
+    for lo in range(0, n, step):
+        rows = np.arange(lo, min(lo + step, n))
+        cols = rows[:, None] - offsets
+        window = np.where(cols >= start[rows, None], x[np.maximum(cols, 0)], np.nan)
+        window.sort(axis=1)  # NaN (padding and missing readings) last
+        count = widest - np.isnan(window).sum(axis=1)
+        ok = count >= max(min_periods, 1)
+        mid = np.stack([(count - 1) // 2, count // 2], axis=1).clip(0)
+        med = np.take_along_axis(window, mid, axis=1).mean(axis=1)
+        dev = np.abs(window - med[:, None])
+        dev.sort(axis=1)
+        median[rows[ok]] = med[ok]
+        mad[rows[ok]] = np.take_along_axis(dev, mid, axis=1).mean(axis=1)[ok]
+    return median, mad
+
+
+def _median_mad_stream(
+    x: np.ndarray, start: np.ndarray, widest: int, min_periods: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Wide windows: slide one _SortedValues along the readings."""
+    median, mad = np.full(x.size, np.nan), np.full(x.size, np.nan)
+    window = _SortedValues()
+    values = x.tolist()
+    first = 0
+    for i, begin in enumerate(start.tolist()):
+        for j in range(first, begin):
+            if values[j] == values[j]:  # not NaN
+                window.remove(values[j])
+        first = max(first, begin)
+        if values[i] == values[i]:
+            window.add(values[i])
+        if len(window) >= min_periods:
+            median[i] = window.median()
+            mad[i] = window.mad(median[i])
+    return median, mad
+
+
+def rolling_median_mad(
+    values: pd.Series | np.ndarray,
+    times: pd.Series | pd.DatetimeIndex | np.ndarray | None,
+    span: str | timedelta | int,
+    min_periods: int = 1,
+) -> tuple[pd.Series, pd.Series]:
+    """
+    Rolling median and median absolute deviation, MAD = median(|x − median|)
+    of each window against that window's own median.
+
+    Arguments as rolling_mean_std(); an int `span` is a row count and
+    `times` is then ignored. Returns (median, mad) aligned with `values`.
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    x = np.asarray(values, dtype=float)
+    n = x.size
+    inverse = None
+    if isinstance(span, int):
+        start = np.maximum(np.arange(n) - span + 1, 0)
+    else:
+        stamps = pd.DatetimeIndex(pd.to_datetime(times, utc=True)).as_unit("ns").asi8
+        if not (np.diff(stamps) >= 0).all():
+            order = np.argsort(stamps, kind="stable")
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(n)
+            x, stamps = x[order], stamps[order]
+        span_ns = to_timedelta(span) // timedelta(microseconds=1) * 1_000
+        start = np.searchsorted(stamps, stamps - span_ns, side="right")
+
+    widest = int((np.arange(n) - start).max(initial=0)) + 1
+    kernel = _median_mad_sorted if widest <= _SORTED_WINDOW_MAX else _median_mad_stream
+    median, mad = kernel(x, start, widest, min_periods)
+    if inverse is not None:
+        median, mad = median[inverse], mad[inverse]
+    return pd.Series(median, index=index), pd.Series(mad, index=index)
+
+
+class MadWindow:
+    """
+    Trailing time-window median and MAD over a live stream, matching
+    rolling_median_mad(): push() readings in timestamp order (ties allowed).
+    """
+
+    def __init__(self, span: str | timedelta) -> None:
+        self.span = to_timedelta(span)
+        self._points: deque[tuple[datetime, float]] = deque()
+        self._values = _SortedValues()
+        self._last: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def push(self, ts: datetime, value: float) -> tuple[float, float]:
+        """Add a reading (NaN only evicts) and return the window (median, MAD)."""
+        if self._last is not None and ts < self._last:
+            raise ValueError(f"reading at {ts} is older than the last one ({self._last})")
+        self._last = ts
+        cutoff = ts - self.span
+        while self._points and self._points[0][0] <= cutoff:
+            self._values.remove(self._points.popleft()[1])
+        if not math.isnan(value):
+            self._points.append((ts, value))
+            self._values.add(value)
+        median = self._values.median()
+        return median, self._values.mad(median)
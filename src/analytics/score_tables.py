@@ -0,0 +1,163 @@
+"""
+src/analytics/score_tables.py
+─────────────────────────────
+EquipmentThresholds compiled to piecewise-linear scoring tables.
+
+Each health sub-index is a piecewise-linear function of one sensor value.
+compile_thresholds() turns an equipment's thresholds into flat arrays once:
+the sorted breakpoints, plus for each segment an anchor x0, a score f0, a
+width w (negative when the score falls towards lower x) and a scale k. A value
+x in segment j scores
+
+    max(0, f0[j] − ((x − x0[j]) / w[j]) · k[j])
+
+which is the arithmetic of the original threshold rules, rounding included
+(dividing by −w flips the sign exactly, so "(min − x) / min" is kept).
+np.interp would interpolate with slope·(x − xp) + fp instead. That differs in
+the last bit and flips some 2-decimal rounding ties in stored scores. A batch
+is scored with one np.searchsorted and a few gathers; a single value uses
+bisect, so both paths agree bit for bit.
+
+  sub-index   segments (lower breakpoint → rule)
+  vibration   0 → 100−15·t, zone_a → 85−20·t, zone_b → 65−35·t, zone_c → 30−30·t (Zone D)
+  thermal     <20 °C → 100, 20 → 100−15·t, warning → 85−35·t, alert → 50−40·t,
+              critical → 10 − 2 per °C above (above-critical tail)
+  pressure    <min → 90 − 150·relative drop, min … max → 100 − 20·|x−mid|/range,
+              max → 90−60·t, critical_high → 30, just above critical_high → 0
+  power       <min → 80 − 120·relative shortfall, min → 100,
+              1.05·nominal → 100−25·t, max → 75 − 150·relative excess
+
+t is the position within the segment (0 → 1). The max(0, ·) clamp ends the
+falling tails at 0.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+
+import numpy as np
+
+from config.equipment import EquipmentThresholds
+
+# One segment: (anchor x0, score f0, signed width w, scale k)
+_Segment = tuple[float, float, float, float]
+
+
+def _flat(score: float) -> _Segment:
+    return (0.0, score, 1.0, 0.0)
+
+
+class PiecewiseLinear:
+    """Scoring table: len(breakpoints) + 1 segments, segment j starts at breakpoints[j-1]."""
+
+    __slots__ = ("breakpoints", "_segments", "_columns", "_bp")
+
+    def __init__(self, breakpoints: list[float], segments: list[_Segment]) -> None:
+        if len(segments) != len(breakpoints) + 1 or any(
+            b1 <= b0 for b0, b1 in zip(breakpoints, breakpoints[1:], strict=False)
+        ):
+            raise ValueError("breakpoints must increase strictly, with one segment more")
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self._bp = [float(b) for b in breakpoints]
+        self._segments = [tuple(float(v) for v in seg) for seg in segments]
+        # x0, f0, w, k as arrays for the batch path
+        self._columns = tuple(np.array(col) for col in zip(*self._segments, strict=True))
+
+    def score(self, x: float) -> float:
+        """Score one value."""
+        x = float(x)
+        x0, f0, w, k = self._segments[bisect_right(self._bp, x)]
+        v = f0 - (x - x0) / w * k
+        return v if v > 0.0 else 0.0
+
+    def scores(self, x: np.ndarray) -> np.ndarray:
+        """Score an array of values."""
+        x0, f0, w, k = self._columns
+        j = np.searchsorted(self.breakpoints, x, side="right")
+        out = np.asarray(x, dtype=float) - x0.take(j)
+        out /= w.take(j)
+        out *= k.take(j)
+        np.subtract(f0.take(j), out, out=out)
+        return np.maximum(out, 0.0, out=out)
+
+
+@dataclass(frozen=True)
+class ScoreTables:
+    vibration: PiecewiseLinear
+    thermal: PiecewiseLinear
+    pressure: PiecewiseLinear
+    power: PiecewiseLinear
+
+
+def _build(thr: EquipmentThresholds) -> ScoreTables:
+    za, zb, zc = thr.vibration.zone_a, thr.vibration.zone_b, thr.vibration.zone_c
+
+    warn = thr.bearing_temp_c["warning"]
+    alert = thr.bearing_temp_c["alert"]
+    crit = thr.bearing_temp_c["critical"]
+    baseline = 20.0  # °C
+
+    p_min = thr.hydraulic_pressure_bar["min"]
+    p_max = thr.hydraulic_pressure_bar["max"]
+    p_crit_high = thr.hydraulic_pressure_bar["critical_high"]
+    p_mid = (p_min + p_max) / 2.0
+
+    pw_min = thr.power_kw["min"]
+    pw_nom = thr.power_kw["nominal"] * 1.05
+    pw_max = thr.power_kw["max"]
+
+    return ScoreTables(
+        vibration=PiecewiseLinear(
+            [za, zb, zc],
+            [
+                (0.0, 100.0, za, 15.0),
+                (za, 85.0, zb - za, 20.0),
+                (zb, 65.0, zc - zb, 35.0),
+                (zc, 30.0, zc, 30.0),
+            ],
+        ),
+        thermal=PiecewiseLinear(
+            [baseline, warn, alert, crit],
+            [
+                _flat(100.0),
+                (baseline, 100.0, warn - baseline, 15.0),
+                (warn, 85.0, alert - warn, 35.0),
+                (alert, 50.0, crit - alert, 40.0),
+                (crit, 10.0, 1.0, 2.0),
+            ],
+        ),
+        pressure=PiecewiseLinear(
+            [p_min, p_mid, p_max, p_crit_high, math.nextafter(p_crit_high, math.inf)],
+            [
+                (p_min, 90.0, -p_min, 150.0),
+                (p_mid, 100.0, -(p_max - p_min), 20.0),
+                (p_mid, 100.0, p_max - p_min, 20.0),
+                (p_max, 90.0, p_crit_high - p_max, 60.0),
+                _flat(30.0),
+                _flat(0.0),
+            ],
+        ),
+        power=PiecewiseLinear(
+            [pw_min, pw_nom, pw_max],
+            [
+                (pw_min, 80.0, -pw_min, 120.0),
+                _flat(100.0),
+                (pw_nom, 100.0, pw_max - pw_nom, 25.0),
+                (pw_max, 75.0, pw_max, 150.0),
+            ],
+        ),
+    )
+
+
+# EquipmentThresholds holds dicts, so it is not hashable: cache by identity
+_compiled: dict[int, tuple[EquipmentThresholds, ScoreTables]] = {}
+
+
+def compile_thresholds(thr: EquipmentThresholds) -> ScoreTables:
+    """Scoring tables for `thr`, built on first use and then shared."""
+    entry = _compiled.get(id(thr))
+    if entry is None or entry[0] is not thr:
+        entry = _compiled[id(thr)] = (thr, _build(thr))
+    return entry[1]
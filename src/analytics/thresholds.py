@@ -12,6 +12,7 @@ Provides:
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 import pandas as pd
 
@@ -27,10 +28,23 @@ class ThresholdBand:
     lower_bound: float | None = None  # e.g., minimum pressure
 
 
+# Variables with static limits in config.equipment
+STATIC_THRESHOLD_VARIABLES = (
+    "vibration_mms",
+    "bearing_temp_c",
+    "hydraulic_pressure_bar",
+    "power_kw",
+    "load_pct",
+)
+
+
+@lru_cache(maxsize=64)
 def get_static_thresholds(equipment_id: str, variable: str) -> ThresholdBand:
     """
     Return static threshold band for a given equipment variable.
     Based on ISO 10816 (vibration) and equipment engineering limits.
+    Bands are immutable, so each one is built once per process (or once before
+    fork when the app is preloaded).
     """
     thr: EquipmentThresholds = SAG_THRESHOLDS if equipment_id == "SAG-01" else BALL_THRESHOLDS
 
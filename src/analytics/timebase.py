@@ -0,0 +1,140 @@
+"""
+src/analytics/timebase.py
+─────────────────────────
+Sample period and time-unit windows.
+
+Readings arrive every settings.SAMPLE_PERIOD_S seconds (one hour by default,
+1 s / 1 min / 10 min for denser feeds). Analytics windows are spans of time
+("24h", timedelta(days=2)) and window_rows() turns them into the number of
+samples they hold at that period, so a 24 h anomaly window is 24 rows of
+hourly data and 1 440 rows of minute data. A plain int still means rows.
+
+Real feeds are not that regular. find_gaps() and mark_gaps() locate the
+intervals where readings are missing, and regularize() resamples a frame
+onto the period grid (duplicates averaged, missing slots as NaN rows),
+all vectorised. For windows on the timestamps themselves see rolling.py.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings
+
+Span = int | str | timedelta
+
+_HOUR = timedelta(hours=1)
+
+
+def sample_period() -> timedelta:
+    """The configured interval between two readings of one equipment."""
+    return timedelta(seconds=settings.SAMPLE_PERIOD_S)
+
+
+def to_timedelta(span: str | timedelta) -> timedelta:
+    """timedelta from a timedelta or a pandas offset string ("24h", "10min")."""
+    td = pd.Timedelta(span).to_pytimedelta()
+    if td <= timedelta(0):
+        raise ValueError(f"window must be positive, got {span!r}")
+    return td
+
+
+def window_rows(span: Span, period: timedelta | None = None) -> int:
+    """Samples in `span` at `period` (default sample_period()); ints pass through."""
+    if isinstance(span, int):
+        return span
+    return max(1, round(to_timedelta(span) / (period or sample_period())))
+
+
+def period_hours(period: timedelta | None = None) -> float:
+    """`period` (default sample_period()) in hours."""
+    return (period or sample_period()) / _HOUR
+
+
+def _epoch_ns(times: pd.Series | pd.DatetimeIndex | np.ndarray) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(times, utc=True)).as_unit("ns").asi8
+
+
+def find_gaps(
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    period: timedelta | None = None,
+    tolerance: float = 1.5,
+) -> pd.DataFrame:
+    """
+    Intervals with no readings: consecutive timestamps more than `tolerance`
+    × `period` (default sample_period()) apart. Duplicates are harmless.
+
+    Returns:
+        DataFrame with `start` (last reading before the gap), `end` (first
+        reading after it) and `missing` (whole periods absent)
+    """
+    step = pd.Timedelta(period or sample_period()).value
+    t = _epoch_ns(times)
+    d = np.diff(t)
+    if (d < 0).any():
+        t = np.sort(t)
+        d = np.diff(t)
+    at = np.flatnonzero(d > tolerance * step)
+    return pd.DataFrame(
+        {
+            "start": pd.DatetimeIndex(t[at].view("M8[ns]")).tz_localize("UTC"),
+            "end": pd.DatetimeIndex(t[at + 1].view("M8[ns]")).tz_localize("UTC"),
+            "missing": np.maximum(np.rint(d[at] / step).astype(np.int64) - 1, 1),
+        }
+    )
+
+
+def mark_gaps(
+    times: pd.Series | pd.DatetimeIndex | np.ndarray,
+    period: timedelta | None = None,
+    tolerance: float = 1.5,
+) -> np.ndarray:
+    """Boolean per reading: True for the first reading after a gap (see find_gaps())."""
+    t = _epoch_ns(times)
+    order = np.argsort(t, kind="stable")
+    step = pd.Timedelta(period or sample_period()).value
+    after_gap = np.zeros(t.size, dtype=bool)
+    after_gap[order[1:]] = np.diff(t[order]) > tolerance * step
+    return after_gap
+
+
+def regularize(
+    df: pd.DataFrame,
+    period: timedelta | None = None,
+    timestamp_col: str = "timestamp",
+    interpolate_limit: int = 0,
+) -> pd.DataFrame:
+    """
+    Resample `df` onto the `period` grid (default sample_period()), aligned to
+    the epoch so every equipment shares it.
+
+    Readings in one slot are averaged (non-numeric columns keep the last);
+    slots with none become NaN rows flagged in a `missing` column. Runs of at
+    most `interpolate_limit` missing slots are filled by time interpolation.
+    """
+    if df.empty:
+        return df.assign(missing=pd.Series(dtype=bool))
+    frame = df.set_index(pd.DatetimeIndex(pd.to_datetime(df[timestamp_col], utc=True)))
+    frame = frame.drop(columns=timestamp_col).sort_index(kind="stable")
+    numeric = frame.select_dtypes("number").columns
+    others = frame.columns.difference(numeric, sort=False)
+
+    rule = pd.Timedelta(period or sample_period())
+    bins = frame.resample(rule, origin="epoch")
+    out = bins[list(numeric)].mean()
+    if len(others):
+        out = out.join(bins[list(others)].last())
+    out["missing"] = bins.size().to_numpy() == 0
+    if interpolate_limit > 0 and len(numeric):
+        filled = out[numeric].interpolate("time", limit_area="inside")
+        # Only runs of at most interpolate_limit slots, never part of a longer gap
+        run = out["missing"].ne(out["missing"].shift()).cumsum()
+        short = out["missing"] & (
+            out.groupby(run)["missing"].transform("size") <= interpolate_limit
+        )
+        out.loc[short, numeric] = filled.loc[short]
+    out = out.rename_axis(timestamp_col).reset_index()
+    return out[[timestamp_col, *(c for c in df.columns if c != timestamp_col), "missing"]]
@@ -0,0 +1,111 @@
+"""
+src/analytics/trend_tracker.py
+──────────────────────────────
+Online health-index trend tracker (local linear trend Kalman filter).
+
+compute_rul() refits a line to the last 48 HI points on every refresh. The
+tracker instead keeps a [level, slope] state per machine and folds in each
+new reading in O(1):
+
+  predict   level += slope·dt          P = F·P·Fᵀ + Q·dt
+  update    gain K = P·Hᵀ / (P00 + R)  state += K·(hi − level)
+
+Q (process noise) sets how fast level and slope may drift, R is the HI
+measurement noise. With the defaults the slope reacts over roughly two days,
+like the 48 h window, but without its jumps when an outlier enters or leaves
+the window. RUL is read straight from the state with the same conventions as
+compute_rul().
+
+The state is a handful of floats, so the store persists it next to the
+readings (store.get_trend_tracker) and it survives restarts.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from src.analytics.health_index import _RUL_CRITICAL_HI, _RUL_SLOPE_EPS
+
+R_HI = 1.0  # HI measurement noise variance
+Q_LEVEL = 1e-2  # level drift variance per hour
+Q_SLOPE = 1e-5  # slope drift variance per hour
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _epoch_us(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // timedelta(microseconds=1)
+
+
+@dataclass
+class TrendTracker:
+    level: float
+    slope: float = 0.0  # HI per hour
+    p00: float = R_HI
+    p01: float = 0.0
+    p11: float = 1e-2
+    timestamp: datetime | None = None
+    n: int = 1
+
+    @classmethod
+    def start(cls, health_index: float, timestamp: datetime | None = None) -> TrendTracker:
+        return cls(level=float(health_index), timestamp=timestamp)
+
+    def update(self, health_index: float, timestamp: datetime) -> None:
+        """Fold in one reading. Readings not newer than the state are ignored."""
+        if self.timestamp is not None:
+            dt = (timestamp - self.timestamp).total_seconds() / 3600.0
+            if dt <= 0:
+                return
+        else:
+            dt = 1.0
+        self._step(float(health_index), dt)
+        self.timestamp = timestamp
+
+    def update_many(self, health_index: Iterable[float], epoch_us: Iterable[int]) -> None:
+        """
+        Fold in readings given as parallel sequences: HI and UTC timestamps in
+        integer epoch microseconds, in time order. Same result as calling
+        update() for each, without building a datetime per reading.
+        """
+        last = None if self.timestamp is None else _epoch_us(self.timestamp)
+        for hi, t in zip(health_index, epoch_us, strict=True):
+            if last is None:
+                dt = 1.0
+            else:
+                # int µs / 1e6 rounds like timedelta.total_seconds()
+                dt = (t - last) / 1e6 / 3600.0
+                if dt <= 0:
+                    continue
+            self._step(float(hi), dt)
+            last = t
+        if last is not None:
+            self.timestamp = _EPOCH + timedelta(microseconds=last)
+
+    def _step(self, health_index: float, dt: float) -> None:
+        # Predict
+        self.level += self.slope * dt
+        self.p00 += dt * (2 * self.p01 + dt * self.p11) + Q_LEVEL * dt
+        self.p01 += dt * self.p11
+        self.p11 += Q_SLOPE * dt
+
+        # Update
+        s = self.p00 + R_HI
+        k0, k1 = self.p00 / s, self.p01 / s
+        innov = health_index - self.level
+        self.level += k0 * innov
+        self.slope += k1 * innov
+        self.p11 -= k1 * self.p01
+        self.p00 *= 1 - k0
+        self.p01 *= 1 - k0
+        self.n += 1
+
+    def rul_days(self) -> float | None:
+        """Days until HI = 20 at the tracked slope; None if stable or improving."""
+        if self.n < 4 or self.slope >= -_RUL_SLOPE_EPS:
+            return None
+        if self.level <= _RUL_CRITICAL_HI:
+            return 0.0
+        return round((self.level - _RUL_CRITICAL_HI) / abs(self.slope) / 24.0, 1)
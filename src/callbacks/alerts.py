@@ -2,22 +2,35 @@
 src/callbacks/alerts.py
 ────────────────────────
 Alert management page callbacks.
+
+The server renders every alert of the retention window once (and again only
+when alerts are written or acknowledged). Filtering by severity / equipment /
+status happens in the browser: a clientside callback sets filter classes on
+the table container and the rules in assets/styles.css hide the
+non-matching rows (one equipment rule per EQUIPMENT_CONFIG entry). At most
+_ROWS_PER_GROUP rows per equipment and severity are rendered.
 """
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import dash_bootstrap_components as dbc
-import pandas as pd
-from dash import ALL, Input, Output, State, ctx, html
+from dash import ALL, Input, Output, State, ctx, html, no_update
 
 from config.alerts import SEVERITY_COLORS, SEVERITY_LABELS_ES
-from src.data import store
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 CARD_BG = "#161b22"
 BORDER = "#30363d"
 MUTED = "#8b949e"
 
 _SEVERITY_ORDER = {"critical": 4, "alert": 3, "warning": 2, "info": 1}
+# Newest alerts kept per (equipment, severity): every filter still has rows
+# to show while the table stays small (2 equipment × 4 severities → 200 rows)
+_ROWS_PER_GROUP = 25
 
 
 def _severity_badge(severity: str) -> html.Span:
@@ -37,6 +50,8 @@ def _severity_badge(severity: str) -> html.Span:
 
 
 def _build_table(df: pd.DataFrame, acked_ids: list[str]) -> html.Div:
+    import pandas as pd
+
     if df.empty:
         return html.Div(
             "Sin alertas para los filtros seleccionados.",
@@ -46,6 +61,11 @@ def _build_table(df: pd.DataFrame, acked_ids: list[str]) -> html.Div:
     rows = []
     for _, row in df.iterrows():
         is_acked = row["id"] in acked_ids or bool(row.get("acknowledged", False))
+        # Classes matched by the clientside filter rules in assets/styles.css
+        row_classes = (
+            f"alert-row sev-{row['severity']} eq-{row['equipment_id']} "
+            f"st-{'acked' if is_acked else 'unacked'}"
+        )
         rows.append(
             html.Tr(
                 [
@@ -95,6 +115,7 @@ def _build_table(df: pd.DataFrame, acked_ids: list[str]) -> html.Div:
                         )
                     ),
                 ],
+                className=row_classes,
                 style={"borderBottom": f"1px solid {BORDER}"},
             )
         )
@@ -129,26 +150,38 @@ def _build_table(df: pd.DataFrame, acked_ids: list[str]) -> html.Div:
 
 
 def register(app) -> None:
+    # ── Filters (clientside: rows are already in the page) ────────────────────
+    app.clientside_callback(
+        """
+        function(severity, equipment, status) {
+            return ["f-sev-" + severity, "f-eq-" + equipment, "f-st-" + status].join(" ");
+        }
+        """,
+        Output("alerts-table", "className"),
+        Input("alerts-filter-severity", "value"),
+        Input("alerts-filter-equipment", "value"),
+        Input("alerts-filter-status", "value"),
+    )
+
     @app.callback(
         [
             Output("alerts-table", "children"),
             Output("alerts-summary-badges", "children"),
+            Output("alerts-rendered-version", "data"),
         ],
         [
             Input("interval-live", "n_intervals"),
-            Input("alerts-filter-severity", "value"),
-            Input("alerts-filter-equipment", "value"),
-            Input("alerts-filter-status", "value"),
             Input("store-ack-alerts", "data"),
         ],
+        State("alerts-rendered-version", "data"),
     )
-    def update_alerts_table(
-        n_intervals: int,
-        severity_filter: str,
-        equipment_filter: str,
-        status_filter: str,
-        acked_ids: list[str],
-    ):
+    def update_alerts_table(n_intervals: int, acked_ids: list[str], rendered_version: int | None):
+        from src.data import store
+
+        version = store.get_data_version("alerts")
+        if rendered_version == version:
+            return no_update, no_update, no_update
+
         df = store.get_alerts(days=30, limit=500)
 
         if df.empty:
@@ -157,25 +190,14 @@ def register(app) -> None:
                 style={"color": MUTED, "padding": "20px", "textAlign": "center"},
             )
             badges = html.Div()
-            return table, badges
-
-        # Apply filters
-        if severity_filter != "all":
-            df = df[df["severity"] == severity_filter]
-        if equipment_filter != "all":
-            df = df[df["equipment_id"] == equipment_filter]
-        if status_filter == "unacked":
-            df = df[(df["acknowledged"] == 0) & (~df["id"].isin(acked_ids))]
-        elif status_filter == "acked":
-            df = df[(df["acknowledged"] == 1) | (df["id"].isin(acked_ids))]
+            return table, badges, version
 
         # Sort by severity then timestamp
         df["_sev_order"] = df["severity"].map(_SEVERITY_ORDER).fillna(0)
-        df = df.sort_values(["_sev_order", "timestamp"], ascending=[False, False]).head(100)
+        df = df.sort_values(["_sev_order", "timestamp"], ascending=[False, False])
 
         # Summary badges
-        full_df = store.get_alerts(days=30, limit=500)
-        counts = full_df.groupby("severity").size()
+        counts = df.groupby("severity").size()
         badges = dbc.Row(
             [
                 dbc.Col(
@@ -213,7 +235,8 @@ def register(app) -> None:
             className="g-2",
         )
 
-        return _build_table(df, acked_ids or []), badges
+        shown = df.groupby(["equipment_id", "severity"], sort=False).head(_ROWS_PER_GROUP)
+        return _build_table(shown, acked_ids or []), badges, version
 
     @app.callback(
         Output("store-ack-alerts", "data"),
@@ -227,6 +250,8 @@ def register(app) -> None:
         alert_id = ctx.triggered_id["index"]
         acked = list(acked_ids or [])
         if alert_id not in acked:
+            from src.data import store
+
             acked.append(alert_id)
             store.acknowledge_alert(alert_id)
         return acked
@@ -3,23 +3,27 @@ src/callbacks/equipment.py
 ───────────────────────────
 Equipment detail page callbacks.
 Updates charts and KPIs based on selected equipment and live interval.
+
+Plotting, analytics and store modules are imported inside the functions that
+use them to keep worker boot fast (see `make import-time`).
 """
 
 from __future__ import annotations
 
-from datetime import UTC
+from datetime import UTC, timedelta
+from typing import TYPE_CHECKING
 
 import dash_bootstrap_components as dbc
-import plotly.graph_objects as go
-from dash import Input, Output, html
+from dash import Input, Output, State, html
 
 from config.equipment import EQUIPMENT_CONFIG
-from src.analytics.health_index import compute_health_summary, compute_rul
-from src.analytics.thresholds import get_static_thresholds, get_value_color
-from src.data import store
-from src.layout.components.health_gauge import health_gauge
 from src.layout.components.kpi_card import mini_kpi
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+    from src.analytics.prognostics import RULForecast
+
 CARD_BG = "#161b22"
 GRID_CLR = "#30363d"
 MUTED = "#8b949e"
@@ -32,6 +36,13 @@ _DEGRAD_COLORS = {
     "hydraulic": "#58a6ff",
     "misalignment": "#da3633",
 }
+_TREND_HOURS = 72
+_TREND_CHARTS = {
+    "vibration": "vibration_mms",
+    "temperature": "bearing_temp_c",
+    "pressure": "hydraulic_pressure_bar",
+    "power": "power_kw",
+}
 _DEGRAD_LABELS = {
     "normal": "Normal",
     "bearing": "Rodamiento",
@@ -41,6 +52,13 @@ _DEGRAD_LABELS = {
 }
 
 
+def _last_hours(df, hours: int = _TREND_HOURS):
+    """Rows in the `hours` before the newest reading (by timestamp, not row count)."""
+    if df.empty:
+        return df
+    return df[df["timestamp"] > df["timestamp"].iloc[-1] - timedelta(hours=hours)]
+
+
 def _base_layout(title: str = "") -> dict:
     return {
         "template": PLOTLY_TMPL,
@@ -56,11 +74,15 @@ def _base_layout(title: str = "") -> dict:
     }
 
 
-def _trend_fig(df, col: str, equipment_id: str, last_hours: int = 72) -> go.Figure:
+def _trend_fig(df, col: str, equipment_id: str, last_hours: int = _TREND_HOURS) -> go.Figure:
     """Build a single-variable trend chart with threshold lines."""
+    import plotly.graph_objects as go
+
+    from src.analytics.thresholds import get_static_thresholds
+
     eq = EQUIPMENT_CONFIG[equipment_id]
     color = eq["color"]
-    df_recent = df.tail(last_hours)
+    df_recent = _last_hours(df, last_hours)
 
     fig = go.Figure()
     fig.add_scatter(
@@ -108,14 +130,89 @@ def _trend_fig(df, col: str, equipment_id: str, last_hours: int = 72) -> go.Figu
     return fig
 
 
+def _forecast_traces(df, forecast: RULForecast | None) -> dict[int, tuple[list, list]]:
+    """x/y of the HI fan traces (1: P90, 2: P10 filled up to P90, 3: P50)."""
+    import pandas as pd
+
+    if forecast is None:
+        return {1: ([], []), 2: ([], []), 3: ([], [])}
+    last_ts = df["timestamp"].iloc[-1]
+    xs = [(last_ts + pd.Timedelta(hours=float(h))).isoformat() for h in forecast.band_hours]
+    return {
+        1: (xs, forecast.band_p90.round(2).tolist()),
+        2: (xs, forecast.band_p10.round(2).tolist()),
+        3: (xs, forecast.band_p50.round(2).tolist()),
+    }
+
+
+def _health_fig(df, equipment_id: str, forecast: RULForecast | None = None) -> go.Figure:
+    """
+    Build the health index area chart with the alert/critical reference lines
+    and the Monte-Carlo P10–P90 forecast band ahead of the last reading.
+    """
+    import plotly.graph_objects as go
+
+    eq = EQUIPMENT_CONFIG[equipment_id]
+    fan = _forecast_traces(df, forecast)
+    fig = go.Figure()
+    fig.add_scatter(
+        x=df["timestamp"],
+        y=df["health_index"],
+        line={"color": eq["color"], "width": 1.8},
+        fill="tozeroy",
+        fillcolor=eq["color_rgba"],
+        name="Health Index",
+        hovertemplate="%{x|%d/%m %H:%M}<br>HI: %{y:.1f}%<extra></extra>",
+    )
+    fig.add_scatter(x=fan[1][0], y=fan[1][1], line={"width": 0}, showlegend=False, hoverinfo="skip")
+    fig.add_scatter(
+        x=fan[2][0],
+        y=fan[2][1],
+        line={"width": 0},
+        fill="tonexty",
+        fillcolor="rgba(139,148,158,0.25)",
+        name="Pronóstico P10–P90",
+        hoverinfo="skip",
+    )
+    fig.add_scatter(
+        x=fan[3][0],
+        y=fan[3][1],
+        line={"color": MUTED, "width": 1.2, "dash": "dash"},
+        name="Pronóstico P50",
+        hovertemplate="%{x|%d/%m %H:%M}<br>HI P50: %{y:.1f}%<extra></extra>",
+    )
+    fig.add_hline(
+        y=20,
+        line_dash="solid",
+        line_color="#da3633",
+        line_width=1,
+        annotation_text="Crítico (20%)",
+        annotation_font_color="#da3633",
+        annotation_font_size=9,
+    )
+    fig.add_hline(
+        y=60,
+        line_dash="dot",
+        line_color="#e8a020",
+        line_width=1,
+        annotation_text="Alerta (60%)",
+        annotation_font_color="#e8a020",
+        annotation_font_size=9,
+    )
+    fig.update_layout(
+        **{**_base_layout(), "height": 180, "yaxis": {"range": [0, 105], "gridcolor": GRID_CLR}}
+    )
+    return fig
+
+
 def register(app) -> None:
-    @app.callback(
+    # Pure state copy: run it in the browser
+    app.clientside_callback(
+        'function(value) { return value || "SAG-01"; }',
         Output("store-equipment", "data"),
         Input("equipment-selector", "value"),
         prevent_initial_call=True,
     )
-    def update_selected_equipment(value: str) -> str:
-        return value or "SAG-01"
 
     @app.callback(
         [
@@ -128,17 +225,31 @@ def register(app) -> None:
             Output("eq-chart-pressure", "figure"),
             Output("eq-chart-power", "figure"),
             Output("eq-chart-health", "figure"),
+            Output("eq-fig-state", "data"),
         ],
         [
             Input("interval-live", "n_intervals"),
             Input("store-equipment", "data"),
         ],
+        State("eq-fig-state", "data"),
     )
-    def update_equipment_panel(n_intervals: int, equipment_id: str):
+    def update_equipment_panel(n_intervals: int, equipment_id: str, prev_state: dict):
+        import plotly.graph_objects as go
+
+        from src.analytics.health_index import compute_health_summary, compute_rul
+        from src.analytics.prognostics import forecast_rul
+        from src.analytics.thresholds import get_static_thresholds, get_value_color
+        from src.callbacks.figure_cache import chart_key, figure_update
+        from src.data import store
+        from src.layout.components.health_gauge import health_gauge
+
         if not equipment_id:
             equipment_id = "SAG-01"
 
-        df = store.get_readings(equipment_id, hours=72)
+        version = store.get_data_version(equipment_id=equipment_id, hours=_TREND_HOURS)
+        # Late or corrected rows change points already drawn: no patching then
+        rewrites = store.get_data_version("rewrites", equipment_id=equipment_id)
+        df = store.get_readings(equipment_id, hours=_TREND_HOURS)
         if df.empty:
             empty_fig = go.Figure()
             empty_fig.update_layout(**_base_layout("Sin datos"))
@@ -153,40 +264,37 @@ def register(app) -> None:
                 empty_fig,
                 empty_fig,
                 empty_fig,
+                {},
             )
 
         latest = df.iloc[-1]
         eq = EQUIPMENT_CONFIG[equipment_id]
 
-        # Build a SensorReading from the latest row for health computation
+        # Lightweight record from the latest (already validated) row for scoring
         from datetime import datetime
 
-        from src.data.models import DegradationMode, SensorReading
-
-        reading = SensorReading(
-            timestamp=datetime.now(tz=UTC),
-            equipment_id=equipment_id,
-            vibration_mms=float(latest["vibration_mms"]),
-            bearing_temp_c=float(latest["bearing_temp_c"]),
-            hydraulic_pressure_bar=float(latest["hydraulic_pressure_bar"]),
-            power_kw=float(latest["power_kw"]),
-            load_pct=float(latest["load_pct"]),
-            liner_wear_pct=float(latest["liner_wear_pct"])
-            if latest.get("liner_wear_pct")
-            else None,
-            seal_condition_pct=float(latest["seal_condition_pct"])
-            if latest.get("seal_condition_pct")
-            else None,
-            throughput_tph=float(latest["throughput_tph"]),
-            degradation_mode=DegradationMode(latest.get("degradation_mode", "normal")),
-            health_index=float(latest.get("health_index", 100.0)),
-        )
+        from src.data.models import ReadingRecord
+
+        reading = ReadingRecord.from_row(latest, equipment_id, datetime.now(tz=UTC))
 
         summary = compute_health_summary(reading)
         hi = summary.health_index
 
-        # RUL
-        rul = compute_rul(df["health_index"])
+        # RUL: Monte-Carlo forecast from the current degradation mode's curve,
+        # computed once per data version for all workers
+        forecast = store.get_result_cache().get_or_compute(
+            f"rul-forecast|{equipment_id}|{latest['timestamp'].isoformat()}",
+            version,
+            lambda: forecast_rul(df["health_index"], latest.get("degradation_mode", "normal")),
+        )
+        # Online Kalman trend: O(1) state kept by the store at ingest
+        tracker = store.get_trend_tracker(equipment_id)
+        if forecast is not None:
+            rul = forecast.p50_days
+        elif tracker is not None:
+            rul = tracker.rul_days()
+        else:
+            rul = compute_rul(df["health_index"])
 
         # ── Health gauge ──────────────────────────────────────────────────────
         gauge = health_gauge(hi, eq["name"], height=180)
@@ -270,58 +378,75 @@ def register(app) -> None:
         )
 
         # ── RUL ───────────────────────────────────────────────────────────────
+        p10 = forecast.p10_days if forecast is not None else None
         if rul is not None:
-            rul_color = "#da3633" if rul < 7 else "#e8a020" if rul < 30 else "#2ea44f"
+            # Colour by the pessimistic end of the band
+            worst = p10 if p10 is not None else rul
+            rul_color = "#da3633" if worst < 7 else "#e8a020" if worst < 30 else "#2ea44f"
+            rul_children = [
+                html.Span(
+                    f"{rul:.1f}",
+                    style={"fontSize": "1.4rem", "fontWeight": "700", "color": rul_color},
+                ),
+                html.Span(" días", style={"fontSize": ".8rem", "color": MUTED}),
+            ]
+            if forecast is not None:
+                p90 = f"{forecast.p90_days:.1f}" if forecast.p90_days is not None else "—"
+                rul_children.append(
+                    html.Div(
+                        f"P10–P90: {p10:.1f} – {p90} días",
+                        style={"fontSize": ".7rem", "color": MUTED},
+                    )
+                )
+            rul_display = html.Div(rul_children)
+        elif p10 is not None:
             rul_display = html.Div(
                 [
-                    html.Span(
-                        f"{rul:.1f}",
-                        style={"fontSize": "1.4rem", "fontWeight": "700", "color": rul_color},
-                    ),
-                    html.Span(" días", style={"fontSize": ".8rem", "color": MUTED}),
+                    html.Span("Estable", style={"color": "#2ea44f", "fontSize": ".85rem"}),
+                    html.Div(f"P10: {p10:.1f} días", style={"fontSize": ".7rem", "color": MUTED}),
                 ]
             )
         else:
             rul_display = html.Span("Estable", style={"color": "#2ea44f", "fontSize": ".85rem"})
+        if tracker is not None:
+            rul_display = html.Div(
+                [
+                    rul_display,
+                    html.Div(
+                        f"Tendencia: {tracker.slope * 24:+.1f} HI/día",
+                        style={"fontSize": ".7rem", "color": MUTED},
+                    ),
+                ]
+            )
 
         # ── Trend charts ──────────────────────────────────────────────────────
-        fig_vib = _trend_fig(df, "vibration_mms", equipment_id)
-        fig_temp = _trend_fig(df, "bearing_temp_c", equipment_id)
-        fig_pres = _trend_fig(df, "hydraulic_pressure_bar", equipment_id)
-        fig_pwr = _trend_fig(df, "power_kw", equipment_id)
-
-        # Health index chart (longer window)
-        df_full = store.get_readings(equipment_id, hours=72)
-        fig_health = go.Figure()
-        fig_health.add_scatter(
-            x=df_full["timestamp"],
-            y=df_full["health_index"],
-            line={"color": eq["color"], "width": 1.8},
-            fill="tozeroy",
-            fillcolor=eq["color_rgba"],
-            name="Health Index",
-            hovertemplate="%{x|%d/%m %H:%M}<br>HI: %{y:.1f}%<extra></extra>",
-        )
-        fig_health.add_hline(
-            y=20,
-            line_dash="solid",
-            line_color="#da3633",
-            line_width=1,
-            annotation_text="Crítico (20%)",
-            annotation_font_color="#da3633",
-            annotation_font_size=9,
-        )
-        fig_health.add_hline(
-            y=60,
-            line_dash="dot",
-            line_color="#e8a020",
-            line_width=1,
-            annotation_text="Alerta (60%)",
-            annotation_font_color="#e8a020",
-            annotation_font_size=9,
-        )
-        fig_health.update_layout(
-            **{**_base_layout(), "height": 180, "yaxis": {"range": [0, 105], "gridcolor": GRID_CLR}}
+        # Cached per data version; patched with the new points when possible
+        fig_state: dict = {}
+        df_recent = _last_hours(df)
+        figs = []
+        for slot, col in _TREND_CHARTS.items():
+            fig, fig_state[slot] = figure_update(
+                prev_state,
+                slot,
+                chart_key(equipment_id, col, _TREND_HOURS, rewrites),
+                df_recent,
+                version,
+                lambda col=col: _trend_fig(df, col, equipment_id),
+                traces={0: df_recent[col]},
+            )
+            figs.append(fig)
+        fig_vib, fig_temp, fig_pres, fig_pwr = figs
+
+        # Health index chart (same 72 h window) with the forecast band
+        fig_health, fig_state["health"] = figure_update(
+            prev_state,
+            "health",
+            chart_key(equipment_id, "health_index", _TREND_HOURS, rewrites),
+            df,
+            version,
+            lambda: _health_fig(df, equipment_id, forecast),
+            traces={0: df["health_index"]},
+            replace=_forecast_traces(df, forecast),
         )
 
         return (
@@ -334,4 +459,5 @@ def register(app) -> None:
             fig_pres,
             fig_pwr,
             fig_health,
+            fig_state,
         )
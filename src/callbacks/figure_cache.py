@@ -0,0 +1,189 @@
+"""
+src/callbacks/figure_cache.py
+──────────────────────────────
+Version-keyed Plotly figure cache and incremental trace patching.
+
+Every chart callback used to rebuild its figure (threshold lines included)
+on each 30 s tick. Now:
+  - Built figures are cached by (slot, chart key, data version, window
+    bounds), where the chart key encodes equipment / variable / window /
+    options and the data version is store.get_data_version() for that
+    equipment and window. Clients asking for the same chart at the same
+    version share one build. The equipment's "rewrites" version goes into
+    the chart key, so late or corrected rows rebuild the figure instead of
+    being patched onto its end.
+  - Each page keeps a small record of what its client has rendered in a
+    dcc.Store (chart key, last timestamp, point count). If nothing changed the
+    callback returns no_update; if only a few rows arrived it returns a
+    dash.Patch that appends them (and drops the ones that slid out of the
+    window) instead of the whole figure.
+  - Behind the per-process LRU, figure JSON is shared with the other workers
+    through store.get_result_cache(), so each figure is built once per data
+    version for the whole server, not once per worker. Figures that come
+    from there are plain plotly JSON dicts, which Dash accepts as is.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Patch, no_update
+
+from src.data import store
+from src.data.result_cache import ResultCache
+
+MAX_CACHED_FIGURES = 64
+MAX_PATCH_POINTS = 48  # beyond this a full figure is cheaper than a patch
+
+
+class FigureCache:
+    """Small thread-safe LRU of built figures, optionally backed by a shared ResultCache."""
+
+    def __init__(
+        self, max_entries: int = MAX_CACHED_FIGURES, shared: ResultCache | None = None
+    ) -> None:
+        self._max = max_entries
+        self._shared = shared
+        self._entries: OrderedDict[Hashable, go.Figure | dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure | dict:
+        with self._lock:
+            fig = self._entries.get(key)
+            if fig is not None:
+                self._entries.move_to_end(key)
+                return fig
+        if self._shared is not None and self._shared.enabled:
+            # The key already carries the data version
+            fig = self._shared.get_or_compute(repr(key), 0, lambda: build().to_plotly_json())
+        else:
+            fig = build()
+        with self._lock:
+            self._entries[key] = fig
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+        return fig
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+figure_cache = FigureCache(shared=store.get_result_cache())
+
+
+def chart_key(*parts) -> str:
+    """Join the chart identity (equipment, variable, window, options…) into one key."""
+    return "|".join(
+        ",".join(sorted(map(str, p))) if isinstance(p, list | tuple | set) else str(p)
+        for p in parts
+    )
+
+
+def _render_state(key: str, df: pd.DataFrame) -> dict:
+    return {
+        "key": key,
+        "last_ts": df["timestamp"].iloc[-1].isoformat() if not df.empty else None,
+        "n": len(df),
+    }
+
+
+def _incremental_rows(prev: dict | None, key: str, df: pd.DataFrame):
+    """
+    Compare the client's rendered state with `df`.
+
+    Returns (new_rows, n_drop) when the client figure can be brought up to date
+    by appending `new_rows` and removing `n_drop` points from the front, or None
+    when a full figure is needed.
+    """
+    if not prev or prev.get("key") != key or df.empty or prev.get("last_ts") is None:
+        return None
+    new_rows = df[df["timestamp"] > pd.Timestamp(prev["last_ts"])]
+    n_drop = int(prev["n"]) + len(new_rows) - len(df)
+    if n_drop < 0 or len(new_rows) > MAX_PATCH_POINTS or n_drop > MAX_PATCH_POINTS:
+        return None
+    return new_rows, n_drop
+
+
+def trace_patch(
+    traces: dict[int, tuple[list, list]],
+    n_drop: int,
+    replace: dict[int, tuple[list, list]] | None = None,
+) -> Patch:
+    """
+    Build a Patch that drops `n_drop` leading points and appends new x/y per
+    trace, and overwrites x/y of the `replace` traces (e.g. a forecast band).
+    """
+    patch = Patch()
+    for idx, (xs, ys) in traces.items():
+        for _ in range(n_drop):
+            del patch["data"][idx]["x"][0]
+            del patch["data"][idx]["y"][0]
+        if len(xs):
+            patch["data"][idx]["x"].extend(xs)
+            patch["data"][idx]["y"].extend(ys)
+    for idx, (xs, ys) in (replace or {}).items():
+        patch["data"][idx]["x"] = xs
+        patch["data"][idx]["y"] = ys
+    return patch
+
+
+def figure_update(
+    state: dict | None,
+    slot: str,
+    key: str,
+    df: pd.DataFrame,
+    version: int,
+    build: Callable[[], go.Figure],
+    traces: dict[int, pd.Series] | None = None,
+    replace: dict[int, tuple[list, list]] | None = None,
+):
+    """
+    Decide what to send for one dcc.Graph figure output.
+
+    Args:
+        state: The page's rendered-figure record (dcc.Store data)
+        slot: Name of this figure inside `state`
+        key: chart_key() of the figure as it should be displayed now
+        df: Rows plotted by the figure (ascending timestamp)
+        version: store.get_data_version() for the cache key
+        build: Builds the full figure on a cache miss
+        traces: trace index → y values aligned with df, for traces that may be
+                extended point by point; None if the figure must be rebuilt
+                whenever its data changes
+        replace: trace index → (x, y) for traces that are redrawn whole on
+                 every patch (forecasts derived from the latest rows)
+
+    Returns:
+        (figure | Patch | no_update, new state record for `slot`)
+    """
+    new_state = _render_state(key, df)
+    prev = (state or {}).get(slot)
+
+    if prev == new_state:
+        return no_update, new_state
+
+    plan = _incremental_rows(prev, key, df) if traces is not None else None
+    if plan is None:
+        # Time-based windows can slide without a write, so the window bounds
+        # are part of the cache key alongside the data version. Graphs of one
+        # page may share a chart key, so the slot is part of it too.
+        first_ts = df["timestamp"].iloc[0].isoformat() if not df.empty else None
+        cache_key = (slot, key, version, first_ts, new_state["last_ts"], len(df))
+        return figure_cache.get_or_build(cache_key, build), new_state
+
+    new_rows, n_drop = plan
+    xs = [ts.isoformat() for ts in new_rows["timestamp"]]
+    patch_traces = {
+        idx: (xs, [None if pd.isna(v) else float(v) for v in y.loc[new_rows.index]])
+        for idx, y in traces.items()
+    }
+    return trace_patch(patch_traces, n_drop, replace), new_state
@@ -1,20 +1,20 @@
 """
 src/callbacks/navigation.py — Overview page dynamic content callback.
+
+Heavy modules (store → pandas/numpy, models → pydantic, plotly figures) and
+the page layouts are imported on first use, so registering these callbacks
+does not slow down worker boot.
 """
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import importlib
 
 import dash_bootstrap_components as dbc
 from dash import Input, Output, html
 
 from config.alerts import SEVERITY_COLORS, SEVERITY_LABELS_ES
 from config.equipment import EQUIPMENT_CONFIG
-from src.analytics.health_index import compute_health_summary
-from src.data import store
-from src.data.models import DegradationMode, SensorReading
-from src.layout.components.health_gauge import health_gauge
 from src.layout.components.kpi_card import kpi_card
 
 CARD_BG = "#161b22"
@@ -22,67 +22,61 @@ BORDER = "#30363d"
 MUTED = "#8b949e"
 
 
-def _latest_to_reading(latest: dict, equipment_id: str) -> SensorReading:
-    return SensorReading(
-        timestamp=datetime.now(tz=UTC),
-        equipment_id=equipment_id,
-        vibration_mms=float(latest["vibration_mms"]),
-        bearing_temp_c=float(latest["bearing_temp_c"]),
-        hydraulic_pressure_bar=float(latest["hydraulic_pressure_bar"]),
-        power_kw=float(latest["power_kw"]),
-        load_pct=float(latest["load_pct"]),
-        liner_wear_pct=float(latest["liner_wear_pct"]) if latest.get("liner_wear_pct") else None,
-        seal_condition_pct=float(latest["seal_condition_pct"])
-        if latest.get("seal_condition_pct")
-        else None,
-        throughput_tph=float(latest["throughput_tph"]),
-        degradation_mode=DegradationMode(latest.get("degradation_mode", "normal")),
-        health_index=float(latest.get("health_index", 100.0)),
-    )
+# pathname → module in src.pages, imported when the page is first visited
+_ROUTES = {
+    "/": "overview",
+    "/equipment": "equipment",
+    "/alerts": "alerts",
+    "/trends": "trends",
+}
+
+
+def _page_layout(name: str) -> html.Div:
+    return importlib.import_module(f"src.pages.{name}").layout()
 
 
 def register(app) -> None:
     """Register navigation + overview page callbacks."""
 
     # ── Page routing ──────────────────────────────────────────────────────────
-    from src.pages import alerts, equipment, overview, trends
-
     @app.callback(
         Output("page-content", "children"),
+        Output("interval-warmup", "disabled"),
         Input("url", "pathname"),
+        Input("interval-warmup", "n_intervals"),
     )
-    def display_page(pathname: str):
-        routes = {
-            "/": overview.layout,
-            "/equipment": equipment.layout,
-            "/alerts": alerts.layout,
-            "/trends": trends.layout,
-        }
-        return routes.get(pathname, overview.layout)()
+    def display_page(pathname: str, n_warmup: int):
+        from src.data import store
+
+        if not store.is_ready():
+            return _page_layout("warmup"), False
+        return _page_layout(_ROUTES.get(pathname, "overview")), True
 
-    # ── Navbar collapse ───────────────────────────────────────────────────────
+    # ── Navbar collapse (clientside: no server round trip) ──────────────────
     from dash import State
 
-    @app.callback(
+    app.clientside_callback(
+        "function(n_clicks, is_open) { return !is_open; }",
         Output("navbar-collapse", "is_open"),
         Input("navbar-toggler", "n_clicks"),
         State("navbar-collapse", "is_open"),
         prevent_initial_call=True,
     )
-    def toggle_navbar(n_clicks: int, is_open: bool) -> bool:
-        return not is_open
 
-    # ── Language toggle ───────────────────────────────────────────────────────
-    @app.callback(
+    # ── Language toggle (clientside) ──────────────────────────────────────────
+    app.clientside_callback(
+        """
+        function(n_es, n_en) {
+            const triggered = dash_clientside.callback_context.triggered;
+            const id = triggered.length ? triggered[0].prop_id.split(".")[0] : "";
+            return id === "lang-en-btn" ? "en" : "es";
+        }
+        """,
         Output("store-lang", "data"),
         Input("lang-es-btn", "n_clicks"),
         Input("lang-en-btn", "n_clicks"),
         prevent_initial_call=True,
     )
-    def update_lang(n_es: int, n_en: int) -> str:
-        from dash import ctx
-
-        return "en" if ctx.triggered_id == "lang-en-btn" else "es"
 
     # ── Overview: KPI banner ──────────────────────────────────────────────────
     @app.callback(
@@ -96,18 +90,32 @@ def register(app) -> None:
         Input("interval-live", "n_intervals"),
     )
     def update_overview(n_intervals: int):
-        summaries = []
+        from src.analytics.health_index import compute_health_frame
+        from src.data import store
+        from src.layout.components.health_gauge import health_gauge
+
         status_cards = []
 
+        # One query for the whole fleet instead of one per machine, scored as
+        # whole columns with the active weight profiles
+        latest_df = store.get_latest_many(list(EQUIPMENT_CONFIG))
+        latest_df["health_index"] = compute_health_frame(latest_df)
+        fleet = latest_df.set_index("equipment_id")
+        latest_by_id = dict(
+            zip(
+                fleet.index,
+                fleet[["health_index", "degradation_mode", "throughput_tph"]].itertuples(
+                    index=False
+                ),
+                strict=True,
+            )
+        )
+
         for eq_id, eq in EQUIPMENT_CONFIG.items():
-            latest = store.get_latest(eq_id)
+            latest = latest_by_id.get(eq_id)
             if latest is None:
                 continue
-            reading = _latest_to_reading(latest, eq_id)
-            summary = compute_health_summary(reading)
-            summaries.append(summary)
-
-            hi = summary.health_index
+            hi = latest.health_index
             hi_color = (
                 "#2ea44f"
                 if hi >= 80
@@ -117,7 +125,7 @@ def register(app) -> None:
                 if hi >= 40
                 else "#da3633"
             )
-            mode = latest.get("degradation_mode", "normal")
+            mode = latest.degradation_mode
             mode_labels = {
                 "normal": "Normal",
                 "bearing": "Rodamiento",
@@ -211,7 +219,7 @@ def register(app) -> None:
                                                 style={"fontSize": ".65rem", "color": MUTED},
                                             ),
                                             html.Div(
-                                                f"{latest['throughput_tph']:.0f} t/h",
+                                                f"{latest.throughput_tph:.0f} t/h",
                                                 style={
                                                     "fontSize": ".82rem",
                                                     "fontWeight": "600",
@@ -240,8 +248,8 @@ def register(app) -> None:
             )
 
         # Fleet metrics
-        if summaries:
-            fleet_hi = min(s.health_index for s in summaries)
+        if latest_by_id:
+            fleet_hi = float(latest_df["health_index"].min())
             fleet_color = (
                 "#2ea44f"
                 if fleet_hi >= 80
@@ -299,11 +307,11 @@ def register(app) -> None:
         )
 
         # Health gauges
-        sag_latest = store.get_latest("SAG-01")
-        ball_latest = store.get_latest("BALL-01")
+        sag_latest = latest_by_id.get("SAG-01")
+        ball_latest = latest_by_id.get("BALL-01")
 
-        sag_hi = float(sag_latest.get("health_index", 0)) if sag_latest else 0.0
-        ball_hi = float(ball_latest.get("health_index", 0)) if ball_latest else 0.0
+        sag_hi = sag_latest.health_index if sag_latest else 0.0
+        ball_hi = ball_latest.health_index if ball_latest else 0.0
 
         sag_gauge = health_gauge(sag_hi, "SAG-01", height=180)
         ball_gauge = health_gauge(ball_hi, "BALL-01", height=180)
@@ -2,18 +2,22 @@
 src/callbacks/trends.py
 ────────────────────────
 Historical trends page callbacks.
+
+Plotting, analytics and store modules are imported on first use to keep worker
+boot fast (see `make import-time`).
 """
 
 from __future__ import annotations
 
-import pandas as pd
-import plotly.graph_objects as go
-from dash import Input, Output, html
+from typing import TYPE_CHECKING
+
+from dash import Input, Output, State, html, no_update
 
 from config.equipment import EQUIPMENT_CONFIG
-from src.analytics.anomaly import detect_anomalies, get_anomaly_periods
-from src.analytics.thresholds import get_static_thresholds
-from src.data import store
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
 
 CARD_BG = "#161b22"
 GRID_CLR = "#30363d"
@@ -46,6 +50,196 @@ def _layout(height: int = 300) -> dict:
     }
 
 
+def _rolling_mean(df: pd.DataFrame, variable: str) -> pd.Series:
+    from src.analytics.rolling import rolling_mean_std
+
+    return rolling_mean_std(df[variable], df["timestamp"], "24h", min_periods=2)[0]
+
+
+def _main_fig(df: pd.DataFrame, equipment_id: str, variable: str, options: list) -> go.Figure:
+    """Build the main trend chart: raw series plus the optional overlays."""
+    import plotly.graph_objects as go
+
+    from src.analytics.anomaly import detect_anomalies
+    from src.analytics.thresholds import get_static_thresholds
+
+    eq = EQUIPMENT_CONFIG.get(equipment_id, EQUIPMENT_CONFIG["SAG-01"])
+    color = eq["color"]
+    var_label = _VARIABLE_LABELS.get(variable, variable)
+
+    fig = go.Figure()
+
+    # Raw data trace
+    fig.add_scatter(
+        x=df["timestamp"],
+        y=df[variable],
+        mode="lines",
+        line={"color": color, "width": 1.3},
+        name=var_label,
+        hovertemplate="%{x|%d/%m %H:%M}<br>%{y:.3f}<extra></extra>",
+    )
+
+    # Rolling mean (24h)
+    if "rolling" in options:
+        roll_mean = _rolling_mean(df, variable)
+        fig.add_scatter(
+            x=df["timestamp"],
+            y=roll_mean,
+            mode="lines",
+            line={"color": "#c9d1d9", "width": 1, "dash": "dash"},
+            name="Media 24h",
+            opacity=0.7,
+        )
+
+    # Threshold bands
+    if "thresholds" in options:
+        band = get_static_thresholds(equipment_id, variable)
+        if band.warning:
+            fig.add_hline(
+                y=band.warning,
+                line_dash="dot",
+                line_color="#e8a020",
+                line_width=1,
+                annotation_text="Warn",
+                annotation_font_color="#e8a020",
+                annotation_font_size=9,
+            )
+        if band.alert:
+            fig.add_hline(
+                y=band.alert,
+                line_dash="dash",
+                line_color="#f0883e",
+                line_width=1,
+                annotation_text="Alert",
+                annotation_font_color="#f0883e",
+                annotation_font_size=9,
+            )
+        if band.critical:
+            fig.add_hline(
+                y=band.critical,
+                line_dash="solid",
+                line_color="#da3633",
+                line_width=1,
+                annotation_text="Crit",
+                annotation_font_color="#da3633",
+                annotation_font_size=9,
+            )
+        if band.lower_bound:
+            fig.add_hline(
+                y=band.lower_bound,
+                line_dash="dot",
+                line_color="#e8a020",
+                line_width=1,
+                annotation_text="Min",
+                annotation_font_color="#e8a020",
+                annotation_font_size=9,
+            )
+
+    # Anomaly markers
+    if "anomalies" in options:
+        zscores, mask = detect_anomalies(df[variable], times=df["timestamp"])
+        anomaly_df = df[mask]
+        if not anomaly_df.empty:
+            fig.add_scatter(
+                x=anomaly_df["timestamp"],
+                y=anomaly_df[variable],
+                mode="markers",
+                marker={"color": "#da3633", "size": 6, "symbol": "x"},
+                name="Anomalía",
+            )
+
+    fig.update_layout(**_layout(300))
+    return fig
+
+
+def _mahalanobis(df: pd.DataFrame) -> pd.Series:
+    from src.analytics.multivariate import mahalanobis_frame
+
+    return mahalanobis_frame(df)
+
+
+def _zscore_fig(df: pd.DataFrame, variable: str, options: list) -> go.Figure:
+    """
+    Build the rolling z-score chart with the ±2.5σ anomaly bands, plus the
+    Mahalanobis distance of all HI sensors together and its alert level.
+    """
+    import math
+
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from src.analytics.anomaly import detect_anomalies
+    from src.analytics.multivariate import ALERT_D2
+
+    zscores, mask = detect_anomalies(df[variable], times=df["timestamp"])
+    z_df = pd.DataFrame({"timestamp": df["timestamp"], "zscore": zscores, "anomaly": mask})
+
+    z_fig = go.Figure()
+    z_fig.add_scatter(
+        x=z_df["timestamp"],
+        y=z_df["zscore"],
+        mode="lines",
+        line={"color": "#58a6ff", "width": 1.2},
+        name="Z-score",
+        hovertemplate="%{x|%d/%m %H:%M}<br>z=%{y:.2f}<extra></extra>",
+    )
+
+    # Threshold lines at ±2.5
+    z_fig.add_hline(
+        y=2.5,
+        line_dash="dash",
+        line_color="#da3633",
+        line_width=1,
+        annotation_text="+2.5σ",
+        annotation_font_color="#da3633",
+        annotation_font_size=9,
+    )
+    z_fig.add_hline(
+        y=-2.5,
+        line_dash="dash",
+        line_color="#da3633",
+        line_width=1,
+        annotation_text="-2.5σ",
+        annotation_font_color="#da3633",
+        annotation_font_size=9,
+    )
+    z_fig.add_hline(y=0, line_dash="dot", line_color="#8b949e", line_width=0.8)
+
+    # Shade anomaly regions
+    anomaly_scatter_x = z_df.loc[z_df["anomaly"], "timestamp"]
+    anomaly_scatter_y = z_df.loc[z_df["anomaly"], "zscore"]
+    if not anomaly_scatter_x.empty:
+        z_fig.add_scatter(
+            x=anomaly_scatter_x,
+            y=anomaly_scatter_y,
+            mode="markers",
+            marker={"color": "#da3633", "size": 5, "symbol": "circle"},
+            name="Anomalía",
+        )
+
+    if "mahalanobis" in options:
+        z_fig.add_scatter(
+            x=df["timestamp"],
+            y=_mahalanobis(df),
+            mode="lines",
+            line={"color": "#bc8cff", "width": 1.2},
+            name="Mahalanobis D",
+            hovertemplate="%{x|%d/%m %H:%M}<br>D=%{y:.2f}<extra></extra>",
+        )
+        z_fig.add_hline(
+            y=math.sqrt(ALERT_D2),
+            line_dash="dash",
+            line_color="#bc8cff",
+            line_width=1,
+            annotation_text="D alerta",
+            annotation_font_color="#bc8cff",
+            annotation_font_size=9,
+        )
+
+    z_fig.update_layout(**_layout(200))
+    return z_fig
+
+
 def register(app) -> None:
     @app.callback(
         [
@@ -53,6 +247,7 @@ def register(app) -> None:
             Output("trends-zscore-chart", "figure"),
             Output("trends-anomaly-summary", "children"),
             Output("trends-chart-title", "children"),
+            Output("trends-fig-state", "data"),
         ],
         [
             Input("trends-equipment", "value"),
@@ -61,158 +256,72 @@ def register(app) -> None:
             Input("trends-options", "value"),
             Input("interval-live", "n_intervals"),
         ],
+        State("trends-fig-state", "data"),
     )
     def update_trends(
-        equipment_id: str, variable: str, window_hours: int, options: list, n_intervals: int
+        equipment_id: str,
+        variable: str,
+        window_hours: int,
+        options: list,
+        n_intervals: int,
+        prev_state: dict,
     ):
+        import pandas as pd
+        import plotly.graph_objects as go
+
+        from src.analytics.anomaly import detect_anomalies, get_anomaly_periods
+        from src.callbacks.figure_cache import chart_key, figure_update
+        from src.data import store
+
         options = options or []
+        version = store.get_data_version(equipment_id=equipment_id, hours=int(window_hours))
+        # Late or corrected rows change points already drawn: no patching then
+        rewrites = store.get_data_version("rewrites", equipment_id=equipment_id)
         df = store.get_readings(equipment_id, hours=int(window_hours))
 
         eq = EQUIPMENT_CONFIG.get(equipment_id, EQUIPMENT_CONFIG["SAG-01"])
-        color = eq["color"]
-        eq["color_rgba"]
         var_label = _VARIABLE_LABELS.get(variable, variable)
         chart_title = f"{eq['name']} — {var_label}"
 
         if df.empty or variable not in df.columns:
             empty = go.Figure()
             empty.update_layout(**_layout())
-            return empty, empty, html.Div("Sin datos", style={"color": MUTED}), chart_title
+            return empty, empty, html.Div("Sin datos", style={"color": MUTED}), chart_title, {}
 
         # ── Main trend chart ──────────────────────────────────────────────────
-        fig = go.Figure()
-
-        # Raw data trace
-        fig.add_scatter(
-            x=df["timestamp"],
-            y=df[variable],
-            mode="lines",
-            line={"color": color, "width": 1.3},
-            name=var_label,
-            hovertemplate="%{x|%d/%m %H:%M}<br>%{y:.3f}<extra></extra>",
+        # Raw and rolling-mean traces can be extended point by point; anomaly
+        # markers depend on the whole window, so that variant is rebuilt.
+        fig_state: dict = {}
+        main_traces = None
+        if "anomalies" not in options:
+            main_traces = {0: df[variable]}
+            if "rolling" in options:
+                main_traces[1] = _rolling_mean(df, variable)
+        fig, fig_state["main"] = figure_update(
+            prev_state,
+            "main",
+            chart_key(equipment_id, variable, window_hours, options, rewrites),
+            df,
+            version,
+            lambda: _main_fig(df, equipment_id, variable, options),
+            traces=main_traces,
         )
 
-        # Rolling mean (24h)
-        if "rolling" in options:
-            roll_mean = df[variable].rolling(24, min_periods=2).mean()
-            fig.add_scatter(
-                x=df["timestamp"],
-                y=roll_mean,
-                mode="lines",
-                line={"color": "#c9d1d9", "width": 1, "dash": "dash"},
-                name="Media 24h",
-                opacity=0.7,
-            )
-
-        # Threshold bands
-        if "thresholds" in options:
-            band = get_static_thresholds(equipment_id, variable)
-            if band.warning:
-                fig.add_hline(
-                    y=band.warning,
-                    line_dash="dot",
-                    line_color="#e8a020",
-                    line_width=1,
-                    annotation_text="Warn",
-                    annotation_font_color="#e8a020",
-                    annotation_font_size=9,
-                )
-            if band.alert:
-                fig.add_hline(
-                    y=band.alert,
-                    line_dash="dash",
-                    line_color="#f0883e",
-                    line_width=1,
-                    annotation_text="Alert",
-                    annotation_font_color="#f0883e",
-                    annotation_font_size=9,
-                )
-            if band.critical:
-                fig.add_hline(
-                    y=band.critical,
-                    line_dash="solid",
-                    line_color="#da3633",
-                    line_width=1,
-                    annotation_text="Crit",
-                    annotation_font_color="#da3633",
-                    annotation_font_size=9,
-                )
-            if band.lower_bound:
-                fig.add_hline(
-                    y=band.lower_bound,
-                    line_dash="dot",
-                    line_color="#e8a020",
-                    line_width=1,
-                    annotation_text="Min",
-                    annotation_font_color="#e8a020",
-                    annotation_font_size=9,
-                )
-
-        # Anomaly markers
-        anomaly_periods = []
-        if "anomalies" in options:
-            zscores, mask = detect_anomalies(df[variable])
-            anomaly_df = df[mask]
-            if not anomaly_df.empty:
-                fig.add_scatter(
-                    x=anomaly_df["timestamp"],
-                    y=anomaly_df[variable],
-                    mode="markers",
-                    marker={"color": "#da3633", "size": 6, "symbol": "x"},
-                    name="Anomalía",
-                )
-            anomaly_periods = get_anomaly_periods(df, variable)
-
-        fig.update_layout(**_layout(300))
-
         # ── Z-score chart ─────────────────────────────────────────────────────
-        zscores, mask = detect_anomalies(df[variable])
-        z_df = pd.DataFrame({"timestamp": df["timestamp"], "zscore": zscores, "anomaly": mask})
-
-        z_fig = go.Figure()
-        z_fig.add_scatter(
-            x=z_df["timestamp"],
-            y=z_df["zscore"],
-            mode="lines",
-            line={"color": "#58a6ff", "width": 1.2},
-            name="Z-score",
-            hovertemplate="%{x|%d/%m %H:%M}<br>z=%{y:.2f}<extra></extra>",
+        z_fig, fig_state["zscore"] = figure_update(
+            prev_state,
+            "zscore",
+            chart_key(equipment_id, variable, window_hours, options, rewrites),
+            df,
+            version,
+            lambda: _zscore_fig(df, variable, options),
         )
+        if z_fig is no_update:
+            # Same data as last tick: the summary below would not change either
+            return fig, z_fig, no_update, chart_title, fig_state
 
-        # Threshold lines at ±2.5
-        z_fig.add_hline(
-            y=2.5,
-            line_dash="dash",
-            line_color="#da3633",
-            line_width=1,
-            annotation_text="+2.5σ",
-            annotation_font_color="#da3633",
-            annotation_font_size=9,
-        )
-        z_fig.add_hline(
-            y=-2.5,
-            line_dash="dash",
-            line_color="#da3633",
-            line_width=1,
-            annotation_text="-2.5σ",
-            annotation_font_color="#da3633",
-            annotation_font_size=9,
-        )
-        z_fig.add_hline(y=0, line_dash="dot", line_color="#8b949e", line_width=0.8)
-
-        # Shade anomaly regions
-        anomaly_scatter_x = z_df.loc[z_df["anomaly"], "timestamp"]
-        anomaly_scatter_y = z_df.loc[z_df["anomaly"], "zscore"]
-        if not anomaly_scatter_x.empty:
-            z_fig.add_scatter(
-                x=anomaly_scatter_x,
-                y=anomaly_scatter_y,
-                mode="markers",
-                marker={"color": "#da3633", "size": 5, "symbol": "circle"},
-                name="Anomalía",
-            )
-
-        z_fig.update_layout(**_layout(200))
+        zscores, mask = detect_anomalies(df[variable], times=df["timestamp"])
+        anomaly_periods = get_anomaly_periods(df, variable) if "anomalies" in options else []
 
         # ── Anomaly summary ───────────────────────────────────────────────────
         n_anomaly_pts = int(mask.sum())
@@ -255,6 +364,24 @@ def register(app) -> None:
                 style={"marginBottom": "14px"},
             ),
         ]
+        if "mahalanobis" in options:
+            from src.analytics.multivariate import ALERT_D2
+
+            n_joint = int((_mahalanobis(df) ** 2 > ALERT_D2).sum())
+            summary_items.append(
+                html.Div(
+                    [
+                        html.Div(
+                            f"{n_joint}",
+                            style={"fontSize": "1.2rem", "fontWeight": "700", "color": "#bc8cff"},
+                        ),
+                        html.Div(
+                            "Puntos sobre D de alerta", style={"fontSize": ".7rem", "color": MUTED}
+                        ),
+                    ],
+                    style={"marginBottom": "14px"},
+                )
+            )
 
         if anomaly_periods:
             summary_items.append(
@@ -277,4 +404,4 @@ def register(app) -> None:
                     )
                 )
 
-        return fig, z_fig, html.Div(summary_items), chart_title
+        return fig, z_fig, html.Div(summary_items), chart_title, fig_state
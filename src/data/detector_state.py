@@ -0,0 +1,214 @@
+"""
+src/data/detector_state.py
+──────────────────────────
+Persisted alerting detectors of each equipment, kept in step with its readings.
+
+store.py owns the mahalanobis_state and drift_state tables and calls in here
+through one hook, update_detectors(), inside its write transaction:
+  - a batch newer than the stored state is folded into the Mahalanobis
+    tracker and the EWMA / CUSUM drift detectors, and their alerts (one per
+    multivariate onset or drift event) are returned for the caller to insert
+  - without a batch (late, out-of-order or corrected rows, schema upgrades)
+    both are rebuilt from the equipment's stored history instead, silently:
+    a replay raises no alerts
+
+load_mahalanobis_tracker() and load_drift_detectors() back the store's
+read-only getters.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.drift import DETECTORS, DRIFT_CONFIG, drift_alerts
+from src.analytics.multivariate import (
+    VARIABLES,
+    MahalanobisTracker,
+    alert_onsets,
+    onset_alerts,
+)
+
+if TYPE_CHECKING:
+    from src.data.models import Alert
+    from src.data.store import _Batch
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_FETCH_CHUNK = 4_096  # stored rows replayed per fetch
+_DRIFT_COLUMN = {variable: j for j, variable in enumerate(DRIFT_CONFIG)}  # in _Batch.drift
+
+
+def update_detectors(
+    conn: sqlite3.Connection, equipment_id: str, batch: _Batch | None = None
+) -> list[Alert]:
+    """
+    Bring an equipment's detectors up to date, inside the caller's transaction:
+    fold in `batch` (rows already written, newer than the stored state) or,
+    without one, replay its stored history. Returns the alerts raised (none on
+    a replay) for the caller to insert.
+    """
+    if batch is None:
+        _rebuild_mahalanobis_tracker(conn, equipment_id)
+        _rebuild_drift_detectors(conn, equipment_id)
+        return []
+    order = np.argsort(batch.epoch_us, kind="stable")
+    stamps = batch.epoch_us[order]
+    return _advance_mahalanobis_tracker(
+        conn, equipment_id, batch.sensors[order], stamps
+    ) + _advance_drift_detectors(conn, equipment_id, batch.drift[order], stamps)
+
+
+def load_mahalanobis_tracker(
+    conn: sqlite3.Connection, equipment_id: str
+) -> MahalanobisTracker | None:
+    row = conn.execute(
+        "SELECT timestamp, mean, scatter, precision, weight, n, in_alert FROM mahalanobis_state"
+        " WHERE equipment_id = ?",
+        (equipment_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    ts, mean, scatter, precision, weight, n, in_alert = tuple(row)
+    k = len(VARIABLES)
+
+    def matrix(blob: bytes) -> np.ndarray:
+        return np.frombuffer(blob, dtype=np.float64).reshape(k, k).copy()
+
+    return MahalanobisTracker(
+        np.frombuffer(mean, dtype=np.float64).copy(),
+        matrix(scatter),
+        weight,
+        n,
+        datetime.fromisoformat(ts),
+        in_alert=bool(in_alert),
+        precision=None if precision is None else matrix(precision),
+    )
+
+
+def _advance_mahalanobis_tracker(
+    conn: sqlite3.Connection, equipment_id: str, sensors: np.ndarray, stamps: np.ndarray
+) -> list[Alert]:
+    """Fold time-ordered readings newer than the stored state into it; one alert per onset."""
+    tracker = load_mahalanobis_tracker(conn, equipment_id)
+    if tracker is None:
+        tracker = MahalanobisTracker.start(
+            sensors[0], _EPOCH + timedelta(microseconds=int(stamps[0]))
+        )
+        sensors, stamps = sensors[1:], stamps[1:]
+    scores = tracker.update_many(sensors, stamps)
+    onsets, tracker.in_alert = alert_onsets(scores.d2, tracker.in_alert)
+    _save_mahalanobis_tracker(conn, equipment_id, tracker)
+    return onset_alerts(equipment_id, stamps, scores, onsets)
+
+
+def _save_mahalanobis_tracker(
+    conn: sqlite3.Connection, equipment_id: str, tracker: MahalanobisTracker
+) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO mahalanobis_state VALUES (?,?,?,?,?,?,?,?)",
+        (
+            equipment_id,
+            tracker.timestamp.isoformat(),
+            tracker.mean.astype(np.float64).tobytes(),
+            tracker.scatter.astype(np.float64).tobytes(),
+            None if tracker.precision is None else tracker.precision.astype(np.float64).tobytes(),
+            tracker.weight,
+            tracker.n,
+            int(tracker.in_alert),
+        ),
+    )
+
+
+def _rebuild_mahalanobis_tracker(conn: sqlite3.Connection, equipment_id: str) -> None:
+    """Replay an equipment's stored sensor history into a fresh Mahalanobis state, silently."""
+    conn.execute("DELETE FROM mahalanobis_state WHERE equipment_id = ?", (equipment_id,))
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(
+        f"SELECT timestamp, {', '.join(VARIABLES)} FROM readings"
+        " WHERE equipment_id = ? ORDER BY timestamp",
+        (equipment_id,),
+    )
+    tracker: MahalanobisTracker | None = None
+    while rows := cur.fetchmany(_FETCH_CHUNK):
+        stamps = pd.DatetimeIndex(pd.to_datetime([r[0] for r in rows], utc=True))
+        epoch_us = stamps.as_unit("us").asi8
+        sensors = np.array([r[1:] for r in rows], dtype=np.float64)
+        if tracker is None:
+            tracker = MahalanobisTracker.start(sensors[0], stamps[0].to_pydatetime())
+            epoch_us, sensors = epoch_us[1:], sensors[1:]
+        _, tracker.in_alert = alert_onsets(
+            tracker.update_many(sensors, epoch_us).d2, tracker.in_alert
+        )
+    if tracker is not None:
+        _save_mahalanobis_tracker(conn, equipment_id, tracker)
+
+
+def load_drift_detectors(conn: sqlite3.Connection, equipment_id: str) -> dict:
+    """{(variable, detector): detector} of DRIFT_CONFIG, fresh where nothing is stored."""
+    stored = {
+        (variable, detector): state
+        for variable, detector, state in conn.execute(
+            "SELECT variable, detector, state FROM drift_state WHERE equipment_id = ?",
+            (equipment_id,),
+        )
+    }
+    detectors = {}
+    for variable, config in DRIFT_CONFIG.items():
+        for name, cls in DETECTORS.items():
+            state = stored.get((variable, name))
+            detectors[variable, name] = (
+                cls(config) if state is None else cls.from_state(json.loads(state), config)
+            )
+    return detectors
+
+
+def _advance_drift_detectors(
+    conn: sqlite3.Connection, equipment_id: str, values: np.ndarray, stamps: np.ndarray
+) -> list[Alert]:
+    """Fold time-ordered readings newer than the stored detectors into them; one alert per event."""
+    detectors = load_drift_detectors(conn, equipment_id)
+    alerts: list[Alert] = []
+    for (variable, _), detector in detectors.items():
+        column = values[:, _DRIFT_COLUMN[variable]]
+        events = detector.update_many(column, stamps).events
+        alerts += drift_alerts(equipment_id, variable, events)
+    _save_drift_detectors(conn, equipment_id, detectors)
+    return alerts
+
+
+def _save_drift_detectors(conn: sqlite3.Connection, equipment_id: str, detectors: dict) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO drift_state VALUES (?,?,?,?)",
+        [
+            (equipment_id, variable, name, json.dumps(detector.state()))
+            for (variable, name), detector in detectors.items()
+        ],
+    )
+
+
+def _rebuild_drift_detectors(conn: sqlite3.Connection, equipment_id: str) -> None:
+    """Replay an equipment's stored history into fresh drift detectors, silently."""
+    conn.execute("DELETE FROM drift_state WHERE equipment_id = ?", (equipment_id,))
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(
+        f"SELECT timestamp, {', '.join(DRIFT_CONFIG)} FROM readings"
+        " WHERE equipment_id = ? ORDER BY timestamp",
+        (equipment_id,),
+    )
+    detectors = None
+    while rows := cur.fetchmany(_FETCH_CHUNK):
+        detectors = detectors or load_drift_detectors(conn, equipment_id)
+        stamps = pd.DatetimeIndex(pd.to_datetime([r[0] for r in rows], utc=True))
+        epoch_us = stamps.as_unit("us").asi8
+        values = np.array([r[1:] for r in rows], dtype=np.float64)
+        for (variable, _), detector in detectors.items():
+            detector.update_many(values[:, _DRIFT_COLUMN[variable]], epoch_us)
+    if detectors is not None:
+        _save_drift_detectors(conn, equipment_id, detectors)
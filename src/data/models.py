@@ -2,12 +2,20 @@
 src/data/models.py
 ──────────────────
 Pydantic v2 data models for sensor readings, alerts, and health summaries.
+
+SensorReading validates every field and is meant for data entering from
+outside; validate_readings() does the same for a whole batch in one call.
+ReadingRecord carries the same fields without validation, for readings the
+app builds itself (simulator, seeding, rows already in the store).
 """
 
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class DegradationMode(str, Enum):
@@ -33,6 +41,61 @@ class SensorReading(BaseModel):
     health_index: float = Field(default=100.0, ge=0.0, le=100.0)
 
 
+@dataclass(slots=True)
+class ReadingRecord:
+    """Unvalidated SensorReading (same fields), ~3.5× cheaper to build."""
+
+    timestamp: datetime
+    equipment_id: str
+    vibration_mms: float
+    bearing_temp_c: float
+    hydraulic_pressure_bar: float
+    power_kw: float
+    load_pct: float
+    liner_wear_pct: float | None = None
+    seal_condition_pct: float | None = None
+    throughput_tph: float = 0.0
+    degradation_mode: DegradationMode = DegradationMode.NORMAL
+    health_index: float = 100.0
+
+    @classmethod
+    def from_row(
+        cls, row: Mapping[str, Any], equipment_id: str, timestamp: datetime
+    ) -> "ReadingRecord":
+        """Record from a stored readings row (dict or pandas Series; NaN → None)."""
+
+        def optional(name: str) -> float | None:
+            value = row.get(name)
+            return None if value is None or value != value else float(value)
+
+        return cls(
+            timestamp=timestamp,
+            equipment_id=equipment_id,
+            vibration_mms=float(row["vibration_mms"]),
+            bearing_temp_c=float(row["bearing_temp_c"]),
+            hydraulic_pressure_bar=float(row["hydraulic_pressure_bar"]),
+            power_kw=float(row["power_kw"]),
+            load_pct=float(row["load_pct"]),
+            liner_wear_pct=optional("liner_wear_pct"),
+            seal_condition_pct=optional("seal_condition_pct"),
+            throughput_tph=float(row["throughput_tph"]),
+            degradation_mode=DegradationMode(row.get("degradation_mode", "normal")),
+            health_index=float(row.get("health_index", 100.0)),
+        )
+
+    def to_model(self) -> SensorReading:
+        """Validated SensorReading with the same values."""
+        return SensorReading.model_validate(self, from_attributes=True)
+
+
+_READING_LIST = TypeAdapter(list[SensorReading])
+
+
+def validate_readings(items: Iterable[Mapping[str, Any] | ReadingRecord]) -> list[SensorReading]:
+    """Validate a batch of dicts or records into SensorReadings in one pydantic call."""
+    return _READING_LIST.validate_python(list(items), from_attributes=True)
+
+
 class Alert(BaseModel):
     id: str
     timestamp: datetime
@@ -57,3 +120,7 @@ class HealthSummary(BaseModel):
     predicted_rul_days: float | None = None
     active_alerts: int = 0
     degradation_mode: DegradationMode = DegradationMode.NORMAL
+    # Vibration spectrum diagnosis, when a waveform was analysed (spectral.summarize)
+    spectral_mode: DegradationMode | None = None
+    order_2x_ratio: float | None = None
+    bearing_envelope_ratio: float | None = None
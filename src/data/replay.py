@@ -0,0 +1,135 @@
+"""
+src/data/replay.py
+──────────────────
+Accelerated replay of a reading stream through the ingest path.
+
+A ReplayClock maps wall time onto scenario time at `speed`× (1000× plays a
+90-day history in a little over two hours). replay() walks a time-ordered
+stream such as simulator.iter_history(), and hands each tick's readings to the
+ingest function (store.insert_readings by default) once the clock has reached
+the end of that tick, as a live feed would deliver them. When ingest cannot
+keep up, the clock is not slowed down: the stream falls behind and the lag is
+reported, which is what a load test needs to see.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from src.data.models import ReadingRecord, SensorReading
+
+
+class ReplayClock:
+    """Scenario time that starts at `start` and runs `speed` times faster than the wall."""
+
+    def __init__(
+        self,
+        start: datetime,
+        speed: float = 1000.0,
+        *,
+        monotonic: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed}")
+        self.start = start
+        self.speed = speed
+        self._monotonic = monotonic
+        self._sleep = sleep
+        self._t0 = monotonic()
+
+    def elapsed(self) -> float:
+        """Wall seconds since the clock started."""
+        return self._monotonic() - self._t0
+
+    def now(self) -> datetime:
+        """Current scenario time."""
+        return self.start + timedelta(seconds=self.elapsed() * self.speed)
+
+    def sleep_until(self, ts: datetime) -> float:
+        """Block until scenario time reaches `ts`; returns how many wall seconds late it was."""
+        wait = (ts - self.start).total_seconds() / self.speed - self.elapsed()
+        if wait > 0:
+            self._sleep(wait)
+            return 0.0
+        return -wait
+
+
+class ReplayStats(NamedTuple):
+    readings: int
+    batches: int
+    wall_s: float
+    scenario_s: float
+    max_lag_s: float
+
+    @property
+    def rate(self) -> float:
+        """Readings ingested per wall second."""
+        return self.readings / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Scenario seconds played per wall second (the achieved speed)."""
+        return self.scenario_s / self.wall_s if self.wall_s > 0 else 0.0
+
+
+def replay(
+    readings: Iterable[ReadingRecord | SensorReading],
+    speed: float = 1000.0,
+    *,
+    tick_s: float = 0.1,
+    ingest: Callable[[list], object] | None = None,
+    clock: ReplayClock | None = None,
+    progress: Callable[[int, datetime], None] | None = None,
+) -> ReplayStats:
+    """
+    Feed time-ordered `readings` to `ingest` at `speed`× real time.
+
+    Args:
+        readings: Readings in timestamp order (any mix of equipment)
+        speed: Scenario seconds per wall second; ignored when `clock` is given
+        tick_s: Wall seconds per batch, so each ingest call carries
+                tick_s × speed seconds of data
+        ingest: Called with each batch (default store.insert_readings)
+        clock: Clock to pace against (default one starting at the first reading)
+        progress: Called after each batch with (readings so far, scenario time)
+    """
+    if ingest is None:
+        from src.data.store import insert_readings as ingest
+
+    it = iter(readings)
+    first = next(it, None)
+    if first is None:
+        return ReplayStats(0, 0, 0.0, 0.0, 0.0)
+    clock = clock or ReplayClock(first.timestamp, speed)
+    step = timedelta(seconds=tick_s * clock.speed)
+
+    due = clock.start + step
+    while first.timestamp >= due:
+        due += step
+    batch: list = [first]
+    done = batches = 0
+    max_lag = 0.0
+
+    def flush() -> None:
+        nonlocal done, batches, max_lag
+        max_lag = max(max_lag, clock.sleep_until(due))
+        ingest(batch)
+        done += len(batch)
+        batches += 1
+        if progress is not None:
+            progress(done, due)
+
+    for reading in it:
+        if reading.timestamp >= due:
+            flush()
+            batch = []
+            due += step * ((reading.timestamp - due) // step + 1)
+        batch.append(reading)
+    flush()
+
+    wall = clock.elapsed()
+    return ReplayStats(done, batches, wall, (due - clock.start).total_seconds(), max_lag)
@@ -0,0 +1,128 @@
+"""
+src/data/result_cache.py
+────────────────────────
+Query-result cache shared by every process that uses the same database.
+
+Each gunicorn worker used to keep (or rebuild) its own copy of the same
+readings frames and figures, so with N workers a hot chart was computed N
+times per data change. Results now live in a side SQLite file next to the
+database (`<DATABASE_URL>.cache`) that all workers read and write:
+
+  - Entries are pickled values keyed by a string, stored with the data
+    version (store.get_data_version()) they were computed at. An entry whose
+    version differs from the current one is a miss, so every ingest commit
+    invalidates the results that depend on it without any messaging.
+  - The file is disposable: it runs with synchronous=OFF, a short busy
+    timeout, and any SQLite error is treated as a miss. The cache never fails
+    a request.
+  - The oldest entries are pruned beyond `max_entries`.
+
+With an in-memory database (tests, single-process dev) the cache is disabled
+and get_or_compute() simply calls through.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+MAX_ENTRIES = 512
+_MISSING = object()  # a miss, told apart from a cached None
+_PRUNE_EVERY = 32  # puts between two prune passes in one process
+
+_CREATE = """
+CREATE TABLE IF NOT EXISTS results (
+    key     TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    stored  REAL NOT NULL,
+    value   BLOB NOT NULL
+)
+"""
+
+
+class ResultCache:
+    """Versioned key → pickled value cache in a SQLite file shared across processes."""
+
+    def __init__(self, path: str | None, max_entries: int = MAX_ENTRIES) -> None:
+        self._path = path
+        self._max = max_entries
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._path is not None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        # Connections must not cross fork(): reopen in each new process
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=0.5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(_CREATE)
+            self._conn, self._pid, self._lock = conn, os.getpid(), threading.Lock()
+        return self._conn
+
+    def get(self, key: str, version: int, default: Any = None) -> Any:
+        """Return the value stored for `key` at `version`, or `default`."""
+        if not self.enabled:
+            return default
+        try:
+            conn = self._get_conn()
+            with self._lock:
+                row = conn.execute(
+                    "SELECT value FROM results WHERE key = ? AND version = ?", (key, version)
+                ).fetchone()
+        except sqlite3.Error:
+            return default
+        return pickle.loads(row[0]) if row else default
+
+    def put(self, key: str, version: int, value: Any) -> None:
+        if not self.enabled:
+            return
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            conn = self._get_conn()
+            with self._lock, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, version, stored, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, version, time.time(), blob),
+                )
+                self._puts += 1
+                if self._puts % _PRUNE_EVERY == 0:
+                    conn.execute(
+                        """DELETE FROM results WHERE key IN (
+                               SELECT key FROM results ORDER BY stored DESC
+                               LIMIT -1 OFFSET ?)""",
+                        (self._max,),
+                    )
+        except sqlite3.Error:
+            pass
+
+    def get_or_compute(self, key: str, version: int, compute: Callable[[], T]) -> T:
+        """Return the cached value for (`key`, `version`), computing and storing it on a miss."""
+        value = self.get(key, version, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, version, value)
+        return value
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            conn = self._get_conn()
+            with self._lock, conn:
+                conn.execute("DELETE FROM results")
+        except sqlite3.Error:
+            pass
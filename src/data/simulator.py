@@ -4,36 +4,49 @@ src/data/simulator.py
 Synthetic sensor data generator for SAG and Ball mills.
 
 Generates:
-  - 90 days of historical hourly readings per equipment
+  - 90 days of historical readings per equipment, one per sample period
+    (settings.SAMPLE_PERIOD_S, hourly by default)
   - Embedded degradation events (1–3 per equipment over the period)
   - Derived alerts from threshold crossings
   - New "real-time" readings on each call to generate_realtime_reading()
+  - A lazy, time-ordered stream of the same scenario (iter_history()) for
+    sub-hourly periods, where a 90-day history no longer fits in lists
+  - to_dataframe(), kept for existing callers; the columnar converters live
+    in frames.py
 
 Design:
   - Reproducible with SIMULATION_SEED for consistent demos
   - Degradation events have random start/duration within the history window
   - Each event can be bearing, liner, hydraulic (SAG) or bearing, misalignment (Ball)
+  - History is built as ReadingRecords: values are already clipped to the
+    SensorReading bounds, so validating each of them would be wasted work
 """
 
 from __future__ import annotations
 
 import uuid
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
 
 from config.alerts import AlertSeverity
 from config.equipment import BALL_THRESHOLDS, EQUIPMENT_CONFIG, SAG_THRESHOLDS
 from config.settings import settings
+from src.analytics import timebase
+from src.data import frames
 from src.data.degradation import (
     bearing_degradation,
     hydraulic_degradation,
     liner_degradation,
     misalignment_degradation,
 )
-from src.data.models import Alert, DegradationMode, SensorReading
+from src.data.models import Alert, DegradationMode, ReadingRecord, SensorReading
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # ── Baseline operating points ─────────────────────────────────────────────────
 
@@ -116,7 +129,7 @@ def _plan_events(
     return events
 
 
-def _degradation_progress(hour: int, event: DegradationEvent) -> float | None:
+def _degradation_progress(hour: float, event: DegradationEvent) -> float | None:
     """
     Returns normalized progress t ∈ [0, 1] if the hour falls within the event,
     else None.
@@ -127,12 +140,17 @@ def _degradation_progress(hour: int, event: DegradationEvent) -> float | None:
     return None
 
 
+def _clip(value: float, lo: float, hi: float) -> float:
+    """float(np.clip(value, lo, hi)) for one value, without the NumPy call overhead."""
+    return float(min(max(value, lo), hi))
+
+
 def _generate_sag_reading(
-    hour: int,
+    hour: float,
     ts: datetime,
     events: list[DegradationEvent],
     rng: np.random.Generator,
-) -> SensorReading:
+) -> ReadingRecord:
     base = BASELINES["SAG-01"]
     noise = NOISE["SAG-01"]
 
@@ -165,27 +183,27 @@ def _generate_sag_reading(
             pres = hydraulic_degradation(t, base["hydraulic_pressure_bar"], rng)
         break  # only one active event at a time
 
-    return SensorReading(
+    return ReadingRecord(
         timestamp=ts,
         equipment_id="SAG-01",
-        vibration_mms=round(float(np.clip(vib, 0.0, 49.0)), 3),
-        bearing_temp_c=round(float(np.clip(temp, 20.0, 199.0)), 2),
-        hydraulic_pressure_bar=round(float(np.clip(pres, 0.0, 299.0)), 2),
-        power_kw=round(float(np.clip(pwr, 0.0, 24_999.0)), 1),
-        load_pct=round(float(np.clip(load, 0.0, 99.9)), 2),
-        liner_wear_pct=round(float(np.clip(liner_wear, 0.0, 99.9)), 2),
-        seal_condition_pct=round(float(np.clip(seal, 0.0, 100.0)), 2),
-        throughput_tph=round(float(np.clip(tph, 0.0, 5_999.0)), 1),
+        vibration_mms=round(_clip(vib, 0.0, 49.0), 3),
+        bearing_temp_c=round(_clip(temp, 20.0, 199.0), 2),
+        hydraulic_pressure_bar=round(_clip(pres, 0.0, 299.0), 2),
+        power_kw=round(_clip(pwr, 0.0, 24_999.0), 1),
+        load_pct=round(_clip(load, 0.0, 99.9), 2),
+        liner_wear_pct=round(_clip(liner_wear, 0.0, 99.9), 2),
+        seal_condition_pct=round(_clip(seal, 0.0, 100.0), 2),
+        throughput_tph=round(_clip(tph, 0.0, 5_999.0), 1),
         degradation_mode=mode,
     )
 
 
 def _generate_ball_reading(
-    hour: int,
+    hour: float,
     ts: datetime,
     events: list[DegradationEvent],
     rng: np.random.Generator,
-) -> SensorReading:
+) -> ReadingRecord:
     base = BASELINES["BALL-01"]
     noise = NOISE["BALL-01"]
 
@@ -209,15 +227,15 @@ def _generate_ball_reading(
             vib = misalignment_degradation(t, base["vibration_mms"], rng)
         break
 
-    return SensorReading(
+    return ReadingRecord(
         timestamp=ts,
         equipment_id="BALL-01",
-        vibration_mms=round(float(np.clip(vib, 0.0, 49.0)), 3),
-        bearing_temp_c=round(float(np.clip(temp, 20.0, 199.0)), 2),
-        hydraulic_pressure_bar=round(float(np.clip(pres, 0.0, 299.0)), 2),
-        power_kw=round(float(np.clip(pwr, 0.0, 24_999.0)), 1),
-        load_pct=round(float(np.clip(load, 0.0, 99.9)), 2),
-        throughput_tph=round(float(np.clip(tph, 0.0, 5_999.0)), 1),
+        vibration_mms=round(_clip(vib, 0.0, 49.0), 3),
+        bearing_temp_c=round(_clip(temp, 20.0, 199.0), 2),
+        hydraulic_pressure_bar=round(_clip(pres, 0.0, 299.0), 2),
+        power_kw=round(_clip(pwr, 0.0, 24_999.0), 1),
+        load_pct=round(_clip(load, 0.0, 99.9), 2),
+        throughput_tph=round(_clip(tph, 0.0, 5_999.0), 1),
         degradation_mode=mode,
     )
 
@@ -225,48 +243,140 @@ def _generate_ball_reading(
 # ── Public API ────────────────────────────────────────────────────────────────
 
 
+def _timeline(days: int, period: timedelta) -> tuple[datetime, int]:
+    """First timestamp and step count of a `days`-long history ending at the current period."""
+    now = datetime.now(tz=UTC)
+    end_ts = now - (now - datetime(1970, 1, 1, tzinfo=UTC)) % period
+    steps = int(timedelta(days=days) / period)
+    return end_ts - (steps - 1) * period, steps
+
+
 def generate_history(
-    seed: int = settings.SIMULATION_SEED, days: int = settings.HISTORY_DAYS
-) -> dict[str, list[SensorReading]]:
+    seed: int = settings.SIMULATION_SEED,
+    days: int = settings.HISTORY_DAYS,
+    sample_period: timedelta | None = None,
+) -> dict[str, list[ReadingRecord]]:
     """
-    Generate `days` × 24 hourly readings for each equipment.
-    Returns dict keyed by equipment_id.
+    Generate `days` of readings, one every `sample_period` (default the configured
+    period), for each equipment. Returns dict keyed by equipment_id.
+
+    Events are planned in hours, so a seed gives the same degradation scenario
+    at any period; hourly output is unchanged from the original generator.
     """
+    period = sample_period or timebase.sample_period()
+    step_h = timebase.period_hours(period)
     rng = np.random.default_rng(seed)
     total_hours = days * 24
-    end_ts = datetime.now(tz=UTC).replace(minute=0, second=0, microsecond=0)
-    start_ts = end_ts - timedelta(hours=total_hours - 1)
+    start_ts, steps = _timeline(days, period)
 
-    timestamps = [start_ts + timedelta(hours=h) for h in range(total_hours)]
+    timestamps = [start_ts + i * period for i in range(steps)]
 
     sag_events = _plan_events("SAG-01", total_hours, rng)
     ball_events = _plan_events("BALL-01", total_hours, rng)
 
     sag_readings = [
-        _generate_sag_reading(h, timestamps[h], sag_events, rng) for h in range(total_hours)
+        _generate_sag_reading(i * step_h, timestamps[i], sag_events, rng) for i in range(steps)
     ]
     ball_readings = [
-        _generate_ball_reading(h, timestamps[h], ball_events, rng) for h in range(total_hours)
+        _generate_ball_reading(i * step_h, timestamps[i], ball_events, rng) for i in range(steps)
     ]
 
     return {"SAG-01": sag_readings, "BALL-01": ball_readings}
 
 
+def iter_history(
+    seed: int = settings.SIMULATION_SEED,
+    days: int = settings.HISTORY_DAYS,
+    sample_period: timedelta | None = None,
+) -> Iterator[ReadingRecord]:
+    """
+    Stream the generate_history() scenario in timestamp order, SAG-01 then BALL-01
+    at each step, without holding it in memory (90 days at 1 s is 15.5 M readings).
+
+    Events match generate_history() for the same seed; the noise does not, since
+    each equipment draws from its own child generator to allow interleaving.
+    """
+    period = sample_period or timebase.sample_period()
+    step_h = timebase.period_hours(period)
+    rng = np.random.default_rng(seed)
+    total_hours = days * 24
+    start_ts, steps = _timeline(days, period)
+
+    sag_events = _plan_events("SAG-01", total_hours, rng)
+    ball_events = _plan_events("BALL-01", total_hours, rng)
+    sag_rng, ball_rng = rng.spawn(2)
+
+    for i in range(steps):
+        ts = start_ts + i * period
+        yield _generate_sag_reading(i * step_h, ts, sag_events, sag_rng)
+        yield _generate_ball_reading(i * step_h, ts, ball_events, ball_rng)
+
+
 def generate_realtime_reading(equipment_id: str) -> SensorReading:
     """
     Generate a single fresh reading that simulates a real-time sensor update.
-    Uses a random seed based on current time for slight variation.
+    Uses a random seed based on current time for slight variation. It stands in
+    for an external sensor feed, so it is returned validated.
     """
     seed = int(datetime.now(tz=UTC).timestamp()) % 10_000
     rng = np.random.default_rng(seed)
     ts = datetime.now(tz=UTC).replace(second=0, microsecond=0)
 
     if equipment_id == "SAG-01":
-        return _generate_sag_reading(0, ts, [], rng)
-    return _generate_ball_reading(0, ts, [], rng)
-
-
-def derive_alerts(readings: list[SensorReading], equipment_id: str) -> list[Alert]:
+        return _generate_sag_reading(0, ts, [], rng).to_model()
+    return _generate_ball_reading(0, ts, [], rng).to_model()
+
+
+def generate_waveform(
+    equipment_id: str,
+    seconds: float,
+    *,
+    sample_rate_hz: float = 10_000.0,
+    mode: DegradationMode = DegradationMode.NORMAL,
+    progress: float = 0.0,
+    rms_mms: float | None = None,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Synthetic drive-end vibration velocity waveform (mm/s), float32.
+
+    1X and a small 2X line plus broadband noise. Misalignment grows the 2X
+    line past 1X as `progress` → 1; a bearing defect adds impacts at the
+    outer-race pass frequency, each ringing a structural resonance at a
+    quarter of the sampling rate. The result is scaled to `rms_mms`
+    (default: the equipment's baseline vibration_mms), so it can stand for
+    the waveform behind an hourly reading.
+    """
+    rng = rng or np.random.default_rng()
+    drive = EQUIPMENT_CONFIG[equipment_id]["drive"]
+    n = int(round(seconds * sample_rate_hz))
+    t = np.arange(n) / sample_rate_hz
+    shaft = 2 * np.pi * drive.shaft_hz * t
+
+    ratio_2x = 0.3 + (1.7 * progress if mode == DegradationMode.MISALIGNMENT else 0.0)
+    x = np.sin(shaft + rng.uniform(0, 2 * np.pi))
+    x += ratio_2x * np.sin(2 * shaft + rng.uniform(0, 2 * np.pi))
+    x += rng.normal(0.0, 0.15, n)
+
+    if mode == DegradationMode.BEARING and progress > 0:
+        period = 1.0 / (drive.bearing.bpfo * drive.shaft_hz)
+        hits = np.arange(rng.uniform(0, period), seconds, period)
+        hits += rng.normal(0.0, 0.01 * period, len(hits))  # roller slip
+        impulses = np.zeros(n)
+        idx = np.round(hits * sample_rate_hz).astype(int)
+        impulses[idx[(idx >= 0) & (idx < n)]] = 1.0
+        ring = np.arange(int(0.004 * sample_rate_hz)) / sample_rate_hz
+        kernel = np.exp(-ring / 0.0008) * np.sin(2 * np.pi * 0.25 * sample_rate_hz * ring)
+        x += 4.0 * progress * np.convolve(impulses, kernel)[:n]
+
+    target = rms_mms if rms_mms is not None else BASELINES[equipment_id]["vibration_mms"]
+    x *= target / np.sqrt(np.mean(x * x))
+    return x.astype(np.float32)
+
+
+def derive_alerts(
+    readings: list[SensorReading] | list[ReadingRecord], equipment_id: str
+) -> list[Alert]:
     """
     Scan a list of readings and emit alerts for threshold crossings.
     Returns a deduplicated list (one alert per crossing per variable).
@@ -331,6 +441,6 @@ def derive_alerts(readings: list[SensorReading], equipment_id: str) -> list[Aler
     return alerts
 
 
-def to_dataframe(readings: list[SensorReading]) -> pd.DataFrame:
-    """Convert a list of SensorReadings to a pandas DataFrame."""
-    return pd.DataFrame([r.model_dump() for r in readings])
+def to_dataframe(readings: list[SensorReading] | list[ReadingRecord]) -> pd.DataFrame:
+    """Convert readings to a DataFrame with plain columns (frames.to_dataframe())."""
+    return frames.to_dataframe(readings, categorical=False)
@@ -0,0 +1,91 @@
+"""
+src/data/startup.py
+───────────────────
+Import-light entry points used while the app boots.
+
+Importing src.data.store pulls in numpy, pandas and pydantic (~0.4 s). The
+background seeding path therefore imports it inside the seeding thread, so the
+worker can start serving the warming-up page before those modules are loaded.
+"""
+
+from __future__ import annotations
+
+import threading
+
+# Set by the gunicorn config when the app is preloaded. A thread started in the
+# master does not survive fork() and locks it holds at that moment (imports,
+# stdout, SQLite) would never be released in the workers, so the master does
+# not seed in the background; each worker starts the thread in after_fork().
+_seed_in_workers = False
+
+
+def seed_in_workers() -> None:
+    global _seed_in_workers
+    _seed_in_workers = True
+
+
+def _seed() -> None:
+    from src.data.store import initialize_db
+
+    initialize_db()
+
+
+def start_background_seeding() -> threading.Thread | None:
+    """
+    Seed (or attach to) the database in a daemon thread so the server can
+    answer requests immediately; pages show a warming-up state until
+    store.is_ready(). Returns None in a preloading master (see above).
+    """
+    if _seed_in_workers:
+        return None
+    thread = threading.Thread(target=_seed, name="db-seed", daemon=True)
+    thread.start()
+    return thread
+
+
+def preload_shared_state() -> None:
+    """
+    Import the lazily loaded modules and build the read-only lookup tables
+    (static threshold bands, locale dicts) in the gunicorn master, before any
+    worker is forked, so all workers share those pages copy-on-write instead
+    of each building its own copy on first request.
+    """
+    import importlib
+
+    from config.equipment import EQUIPMENT_CONFIG
+    from src.analytics.thresholds import STATIC_THRESHOLD_VARIABLES, get_static_thresholds
+    from src.i18n.translator import _load_locale
+
+    for name in (
+        "src.data.store",
+        "src.analytics.health_index",
+        "src.analytics.anomaly",
+        "src.callbacks.figure_cache",
+        "src.layout.components.health_gauge",
+        "src.pages.overview",
+        "src.pages.equipment",
+        "src.pages.alerts",
+        "src.pages.trends",
+        "src.pages.warmup",
+    ):
+        importlib.import_module(name)
+
+    for equipment_id in EQUIPMENT_CONFIG:
+        for variable in STATIC_THRESHOLD_VARIABLES:
+            get_static_thresholds(equipment_id, variable)
+    for lang in ("es", "en"):
+        _load_locale(lang)
+
+
+def after_fork() -> None:
+    """
+    Per-worker setup for a preloaded app: fresh DB connection and locks, and
+    seeding resumed in this worker if the master had not finished it yet.
+    """
+    global _seed_in_workers
+    from src.data import store
+
+    _seed_in_workers = False
+    store.reset_after_fork()
+    if not store.is_ready():
+        start_background_seeding()
@@ -5,29 +5,97 @@ SQLite data store abstraction.
 
 Provides:
   - initialize_db()    : Create tables + seed with historical data on first run
-  - insert_readings()  : Bulk insert SensorReading rows
+  - create_schema()    : Create tables only (replay / load-test tools)
+  - is_ready()         : True once this process has a fully seeded DB
+  - insert_readings()  : Bulk insert SensorReading/ReadingRecord rows, scored
+                         (HI + sub-scores) from their sensor values
+  - insert_readings_frame() / insert_readings_arrays()
+                       : Bulk insert straight from columnar data (DataFrame or
+                         NumPy arrays), scored in one vectorised pass
+  - rescore_health()   : Recompute stored HI + sub-scores with the active weight
+                         profiles (chunked, vectorised; runs at startup)
   - get_readings()     : Fetch readings for an equipment over a time range
+                         (typed columnar reader, no per-row pandas decoding)
   - insert_alerts()    : Bulk insert Alert rows
   - get_alerts()       : Fetch recent alerts
   - get_latest()       : Fetch the most recent reading per equipment
+  - get_latest_many()  : Latest reading for several equipment in one query
+  - get_data_version() : Monotonic counter bumped by every readings/alerts write
+  - get_trend_tracker(): Persisted online HI trend (Kalman) state per equipment,
+                         advanced by insert_readings()
+  - get_mahalanobis_tracker()
+                       : Persisted multivariate (Mahalanobis) state per
+                         equipment; insert_readings() advances it and raises
+                         its alerts (through src.data.detector_state)
+  - get_drift_detectors()
+                       : Persisted EWMA / CUSUM drift detectors per equipment
+                         and variable, advanced the same way
+  - get_result_cache() : Cross-process result cache keyed on get_data_version()
 
 Thread safety: uses check_same_thread=False + a module-level lock.
+Process safety: seeding runs under an exclusive file lock next to the DB file,
+so several gunicorn workers starting together seed it exactly once. Workers
+forked from a preloaded app call reset_after_fork() before touching the DB.
 """
 
 from __future__ import annotations
 
 import sqlite3
 import threading
+import time
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
+from itertools import compress, repeat
+from typing import NamedTuple
 
+import numpy as np
 import pandas as pd
 
 from config.settings import settings
-from src.data.models import Alert, SensorReading
+from src.analytics.drift import DRIFT_CONFIG
+from src.analytics.health_index import (
+    SUBSCORE_COLUMNS,
+    compute_health_batch,
+    weight_profile,
+)
+from src.analytics.multivariate import VARIABLES, MahalanobisTracker
+from src.analytics.trend_tracker import TrendTracker
+from src.data.detector_state import (
+    load_drift_detectors,
+    load_mahalanobis_tracker,
+    update_detectors,
+)
+from src.data.models import (
+    Alert,
+    DegradationMode,
+    ReadingRecord,
+    SensorReading,
+)
+from src.data.result_cache import ResultCache
+
+try:  # POSIX only; without it seeding is still serialised within the process
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
 
 _lock = threading.RLock()
 _DB: sqlite3.Connection | None = None
 
+_seed_lock = threading.Lock()
+_ready = threading.Event()
+
+# Connections inherited across fork(); kept referenced, never used or closed
+_inherited: list[sqlite3.Connection] = []
+
+_results: ResultCache | None = None
+# Time windows ("last N hours") start on a multiple of this many seconds, so
+# identical requests within it share one cached result
+_WINDOW_STEP_S = 60
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
 
 # ── Connection ────────────────────────────────────────────────────────────────
 
@@ -37,9 +105,63 @@ def _get_conn() -> sqlite3.Connection:
     if _DB is None:
         _DB = sqlite3.connect(settings.DATABASE_URL, check_same_thread=False)
         _DB.row_factory = sqlite3.Row
+        if settings.DATABASE_URL != ":memory:":
+            # Readers in other workers keep going while one of them writes
+            _DB.execute("PRAGMA journal_mode=WAL")
     return _DB
 
 
+def get_result_cache() -> ResultCache:
+    """The result cache shared by all processes using this database."""
+    global _results
+    if _results is None:
+        shared = settings.RESULT_CACHE and settings.DATABASE_URL != ":memory:"
+        _results = ResultCache(f"{settings.DATABASE_URL}.cache" if shared else None)
+    return _results
+
+
+def _window_start(span: timedelta) -> str:
+    """ISO start of the window `span` long ending now, floored to _WINDOW_STEP_S."""
+    now = time.time() // _WINDOW_STEP_S * _WINDOW_STEP_S
+    return (datetime.fromtimestamp(now, tz=UTC) - span).isoformat()
+
+
+def reset_after_fork() -> None:
+    """
+    Give a freshly forked worker its own connection and locks.
+
+    SQLite connections must not be used across fork(), so a file-backed
+    connection opened by the parent (gunicorn preload_app) is dropped and the
+    next _get_conn() opens a new one. It is not closed either: its finalizer
+    could release file locks that belong to the parent. An in-memory DB is kept,
+    the child owns its private copy. Locks are recreated because one held by a
+    parent thread at fork time would never be released in the child.
+    """
+    global _DB, _lock, _seed_lock, _ready
+    if _DB is not None and settings.DATABASE_URL != ":memory:":
+        _inherited.append(_DB)
+        _DB = None
+    _lock = threading.RLock()
+    _seed_lock = threading.Lock()
+    ready, _ready = _ready.is_set(), threading.Event()
+    if ready:
+        _ready.set()
+
+
+@contextmanager
+def _seed_file_lock() -> Iterator[None]:
+    """Exclusive cross-process lock held while checking / seeding the DB file."""
+    if settings.DATABASE_URL == ":memory:" or fcntl is None:
+        yield
+        return
+    with open(f"{settings.DATABASE_URL}.seed.lock", "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
 # ── Schema ────────────────────────────────────────────────────────────────────
 
 _CREATE_READINGS = """
@@ -56,7 +178,12 @@ CREATE TABLE IF NOT EXISTS readings (
     seal_condition_pct    REAL,
     throughput_tph        REAL NOT NULL,
     degradation_mode      TEXT NOT NULL DEFAULT 'normal',
-    health_index          REAL NOT NULL DEFAULT 100.0
+    health_index          REAL NOT NULL DEFAULT 100.0,
+    vibration_score       REAL,
+    thermal_score         REAL,
+    pressure_score        REAL,
+    power_score           REAL,
+    weights_version       INTEGER
 );
 """
 
@@ -75,15 +202,295 @@ CREATE TABLE IF NOT EXISTS alerts (
 );
 """
 
+_CREATE_META = """
+CREATE TABLE IF NOT EXISTS store_meta (
+    key            TEXT PRIMARY KEY,
+    value          INTEGER NOT NULL
+);
+"""
+
+_CREATE_TREND = """
+CREATE TABLE IF NOT EXISTS trend_state (
+    equipment_id   TEXT PRIMARY KEY,
+    timestamp      TEXT NOT NULL,
+    level          REAL NOT NULL,
+    slope          REAL NOT NULL,
+    p00            REAL NOT NULL,
+    p01            REAL NOT NULL,
+    p11            REAL NOT NULL,
+    n              INTEGER NOT NULL
+);
+"""
+
+# Streaming Mahalanobis detector (src/analytics/multivariate.py); arrays are
+# float64 bytes, precision (M⁻¹) NULL until the live path has inverted M
+_CREATE_MAHALANOBIS = """
+CREATE TABLE IF NOT EXISTS mahalanobis_state (
+    equipment_id   TEXT PRIMARY KEY,
+    timestamp      TEXT NOT NULL,
+    mean           BLOB NOT NULL,
+    scatter        BLOB NOT NULL,
+    precision      BLOB,
+    weight         REAL NOT NULL,
+    n              INTEGER NOT NULL,
+    in_alert       INTEGER NOT NULL
+);
+"""
+
+# EWMA / CUSUM drift detectors (src/analytics/drift.py), one row per
+# equipment, variable and detector; state is the detector's state() as JSON
+_CREATE_DRIFT = """
+CREATE TABLE IF NOT EXISTS drift_state (
+    equipment_id   TEXT NOT NULL,
+    variable       TEXT NOT NULL,
+    detector       TEXT NOT NULL,
+    state          TEXT NOT NULL,
+    PRIMARY KEY (equipment_id, variable, detector)
+) WITHOUT ROWID;
+"""
+
+# Data version of each (equipment, UTC hour) bucket: the readings version of
+# the last write that changed a row in it (see get_data_version)
+_CREATE_BUCKETS = """
+CREATE TABLE IF NOT EXISTS bucket_versions (
+    equipment_id   TEXT NOT NULL,
+    bucket         TEXT NOT NULL,
+    version        INTEGER NOT NULL,
+    PRIMARY KEY (equipment_id, bucket)
+) WITHOUT ROWID;
+"""
+_BUCKET_CHARS = 13  # "YYYY-MM-DDTHH": ISO timestamp prefix naming its hour
+
+# One row per (equipment_id, timestamp): ingest upserts on this key
 _CREATE_IDX = """
-CREATE INDEX IF NOT EXISTS idx_readings_eq_ts ON readings (equipment_id, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_readings_eq_ts ON readings (equipment_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_alerts_eq_ts   ON alerts   (equipment_id, timestamp);
 """
 
+_DROP_IDX = """
+DROP INDEX IF EXISTS ux_readings_eq_ts;
+DROP INDEX IF EXISTS idx_alerts_eq_ts;
+"""
+
 
 def _create_tables(conn: sqlite3.Connection) -> None:
     with conn:
-        conn.executescript(_CREATE_READINGS + _CREATE_ALERTS + _CREATE_IDX)
+        conn.executescript(
+            _CREATE_READINGS
+            + _CREATE_ALERTS
+            + _CREATE_META
+            + _CREATE_TREND
+            + _CREATE_MAHALANOBIS
+            + _CREATE_DRIFT
+            + _CREATE_BUCKETS
+        )
+        # Files created before these columns: add them (NULL until rescored)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(readings)")}
+        added = dict.fromkeys(SUBSCORE_COLUMNS, "REAL") | {"weights_version": "INTEGER"}
+        for col, sql_type in added.items():
+            if col not in existing:
+                conn.execute(f"ALTER TABLE readings ADD COLUMN {col} {sql_type}")
+        # Files from before bucket versions: stamp their buckets once
+        if conn.execute("SELECT 1 FROM bucket_versions LIMIT 1").fetchone() is None:
+            _mark_buckets(conn, _current_version(conn, "readings"))
+        # Files from before the Mahalanobis or drift detectors: build their state once
+        if (
+            conn.execute("SELECT 1 FROM mahalanobis_state LIMIT 1").fetchone() is None
+            or conn.execute("SELECT 1 FROM drift_state LIMIT 1").fetchone() is None
+        ):
+            for (equipment_id,) in conn.execute(
+                "SELECT DISTINCT equipment_id FROM readings"
+            ).fetchall():
+                update_detectors(conn, equipment_id)
+    _create_indexes(conn)
+
+
+def _create_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Create the indexes. Readings written without the unique key (files from
+    before it, or plain INSERTs while a bulk load deferred it) may repeat an
+    (equipment_id, timestamp): those collapse to the last row written first.
+    """
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_readings_eq_ts'"
+    ).fetchone():
+        with conn:
+            removed = conn.execute(
+                """DELETE FROM readings WHERE id NOT IN
+                   (SELECT MAX(id) FROM readings GROUP BY equipment_id, timestamp)"""
+            ).rowcount
+            conn.execute("DROP INDEX IF EXISTS idx_readings_eq_ts")  # pre-unique index
+            if removed:
+                for (equipment_id,) in conn.execute(
+                    "SELECT DISTINCT equipment_id FROM readings"
+                ).fetchall():
+                    _rebuild_trend_tracker(conn, equipment_id)
+                    update_detectors(conn, equipment_id)
+                _mark_buckets(conn, _bump_version(conn, "readings"))
+    conn.executescript(_CREATE_IDX)
+
+
+@contextmanager
+def _bulk_load(conn: sqlite3.Connection, defer_indexes: bool = False) -> Iterator[None]:
+    """
+    Run a bulk write with PRAGMA synchronous=NORMAL: in WAL mode commits then
+    skip the fsync and the DB stays consistent (a power cut can only lose the
+    last commits, which a bulk load can redo). With `defer_indexes` the
+    (equipment_id, timestamp) indexes are dropped first and built once at the
+    end, instead of being updated row by row; meanwhile readings go in with
+    plain INSERTs (no key to upsert on) and _create_indexes() resolves any
+    repeated key the way an upsert would.
+    """
+    global _deferring_indexes
+    with _lock:
+        (previous,) = conn.execute("PRAGMA synchronous").fetchone()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if defer_indexes:
+            conn.executescript(_DROP_IDX)
+            _deferring_indexes = True
+    try:
+        yield
+    finally:
+        with _lock:
+            if defer_indexes:
+                _deferring_indexes = False
+                _create_indexes(conn)
+            conn.execute(f"PRAGMA synchronous={int(previous)}")
+
+
+_deferring_indexes = False  # inside _bulk_load(defer_indexes=True)
+
+
+def _bump_version(conn: sqlite3.Connection, kind: str) -> int:
+    """Increment the `kind` data version; call inside the writing transaction."""
+    conn.execute(
+        """INSERT INTO store_meta (key, value) VALUES (?, 1)
+           ON CONFLICT(key) DO UPDATE SET value = value + 1""",
+        (f"{kind}_version",),
+    )
+    return _current_version(conn, kind)
+
+
+def _current_version(conn: sqlite3.Connection, kind: str) -> int:
+    row = conn.execute(
+        "SELECT value FROM store_meta WHERE key = ?", (f"{kind}_version",)
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _mark_buckets(
+    conn: sqlite3.Connection,
+    version: int,
+    equipment_id: str | None = None,
+    buckets: Iterable[str] | None = None,
+) -> None:
+    """
+    Stamp hour buckets with readings `version`: the given `buckets` of
+    `equipment_id`, or every bucket holding readings (of `equipment_id`, or
+    of all equipment when it is None).
+    """
+    upsert = "ON CONFLICT(equipment_id, bucket) DO UPDATE SET version = excluded.version"
+    if buckets is not None:
+        conn.executemany(
+            f"INSERT INTO bucket_versions VALUES (?, ?, ?) {upsert}",
+            [(equipment_id, bucket, version) for bucket in buckets],
+        )
+        return
+    where, params = ("equipment_id = ?", (equipment_id,)) if equipment_id else ("1", ())
+    conn.execute(
+        f"""INSERT INTO bucket_versions
+            SELECT DISTINCT equipment_id, substr(timestamp, 1, {_BUCKET_CHARS}), ?
+            FROM readings WHERE {where} {upsert}""",
+        (version, *params),
+    )
+
+
+# ── Typed columnar reader ─────────────────────────────────────────────────────
+#
+# pd.read_sql_query materialises every row as Python objects, infers dtypes and
+# then pd.to_datetime re-parses each ISO timestamp string. The reader below
+# instead lets SQLite convert timestamps to epoch milliseconds, streams rows in
+# fetchmany() chunks into typed array.array buffers and wraps those buffers as
+# NumPy arrays without copying.
+
+_FETCH_CHUNK = 4_096
+
+# ISO-8601 TEXT → integer epoch milliseconds, computed inside SQLite
+_TS_MS_SQL = "CAST(ROUND((julianday({col}) - 2440587.5) * 86400000.0) AS INTEGER)"
+
+# (column, kind) — "q": int64, "d": float64, "n": nullable float64 (NULL → NaN),
+# "t": epoch-ms timestamp, None: TEXT (kept as an object column)
+_READINGS_COLUMNS: tuple[tuple[str, str | None], ...] = (
+    ("id", "q"),
+    ("timestamp", "t"),
+    ("equipment_id", None),
+    ("vibration_mms", "d"),
+    ("bearing_temp_c", "d"),
+    ("hydraulic_pressure_bar", "d"),
+    ("power_kw", "d"),
+    ("load_pct", "d"),
+    ("liner_wear_pct", "n"),
+    ("seal_condition_pct", "n"),
+    ("throughput_tph", "d"),
+    ("degradation_mode", None),
+    ("health_index", "d"),
+    # Sub-indices of health_index; NaN only on rows not yet backfilled
+    ("vibration_score", "n"),
+    ("thermal_score", "n"),
+    ("pressure_score", "n"),
+    ("power_score", "n"),
+)
+
+_BUFFER_TYPECODES = {"q": "q", "d": "d", "n": "d", "t": "q"}
+_BUFFER_DTYPES = {"q": np.int64, "d": np.float64, "n": np.float64, "t": np.int64}
+
+
+def _select_list(columns: tuple[tuple[str, str | None], ...]) -> str:
+    return ", ".join(
+        f"{_TS_MS_SQL.format(col=name)} AS {name}" if code == "t" else name
+        for name, code in columns
+    )
+
+
+def _read_columns(
+    sql: str,
+    params: tuple | list,
+    columns: tuple[tuple[str, str | None], ...],
+) -> pd.DataFrame:
+    """
+    Execute `sql` and decode its result set column-wise into a DataFrame.
+
+    The SELECT list of `sql` must match `columns` in order (see _select_list).
+    Numeric columns end up as NumPy views over array.array buffers, so the
+    DataFrame is built without a further copy.
+    """
+    buffers: list[array | list] = [
+        array(_BUFFER_TYPECODES[code]) if code else [] for _, code in columns
+    ]
+    nan = float("nan")
+
+    conn = _get_conn()
+    with _lock:
+        cur = conn.cursor()
+        cur.row_factory = None  # plain tuples; sqlite3.Row is slower to build
+        cur.execute(sql, params)
+        while rows := cur.fetchmany(_FETCH_CHUNK):
+            chunk = zip(*rows, strict=True)
+            for (_, code), buf, values in zip(columns, buffers, chunk, strict=True):
+                if code == "n":
+                    buf.extend(nan if v is None else v for v in values)
+                else:
+                    buf.extend(values)
+        cur.close()
+
+    data: dict[str, object] = {}
+    for (name, code), buf in zip(columns, buffers, strict=True):
+        if code is None:
+            data[name] = np.array(buf, dtype=object)
+            continue
+        values = np.frombuffer(buf, dtype=_BUFFER_DTYPES[code])
+        data[name] = pd.to_datetime(values, unit="ms", utc=True) if code == "t" else values
+    return pd.DataFrame(data, copy=False)
 
 
 # ── Public API ────────────────────────────────────────────────────────────────
@@ -91,72 +498,538 @@ def _create_tables(conn: sqlite3.Connection) -> None:
 
 def initialize_db(force_reseed: bool = False) -> None:
     """
-    Create tables and populate with simulated history if the DB is empty.
-    Safe to call multiple times (idempotent).
+    Create tables and populate with simulated history if the DB is not seeded.
+    Safe to call multiple times (idempotent), from several threads or processes:
+    the first caller seeds, the others wait on the seed lock and then attach.
     """
     # Import here to avoid circular deps
-    from src.analytics.health_index import compute_health_summary
+    from src.data.frames import to_dataframe
     from src.data.simulator import derive_alerts, generate_history
 
     conn = _get_conn()
-    _create_tables(conn)
-
-    with _lock:
-        count = conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
-        if count > 0 and not force_reseed:
+    with _seed_lock, _seed_file_lock():
+        _create_tables(conn)
+        if _is_seeded(conn) and not force_reseed:
+            rescore_health()
+            _ready.set()
             return  # Already seeded
 
-        conn.execute("DELETE FROM readings")
-        conn.execute("DELETE FROM alerts")
+        _ready.clear()
+        # A fresh DB file restarts the version counters: drop old results
+        get_result_cache().clear()
+        with _lock, conn:
+            conn.execute("DELETE FROM store_meta WHERE key = 'seeded'")
+            conn.execute("DELETE FROM readings")
+            conn.execute("DELETE FROM alerts")
+            conn.execute("DELETE FROM trend_state")
+            conn.execute("DELETE FROM mahalanobis_state")
+            conn.execute("DELETE FROM drift_state")
+            conn.execute("DELETE FROM bucket_versions")
 
+        # Simulation runs without holding the connection lock. The history is
+        # written column-wise and scored in one vectorised pass (the simulated
+        # health_index is a placeholder); indexes are built once at the end.
         history = generate_history()
-        for equipment_id, reading_list in history.items():
-            # Compute health index for each reading
-            for reading in reading_list:
-                summary = compute_health_summary(reading)
-                reading.health_index = summary.health_index
+        with _bulk_load(conn, defer_indexes=True):
+            readings = [r for reading_list in history.values() for r in reading_list]
+            insert_readings_frame(to_dataframe(readings).drop(columns="health_index"))
+            for equipment_id, reading_list in history.items():
+                insert_alerts(derive_alerts(reading_list, equipment_id))
+
+        with _lock, conn:
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('seeded', 1)")
+        _ready.set()
+
+
+def create_schema() -> None:
+    """Create the tables and indexes without seeding (for tools that load their own data)."""
+    conn = _get_conn()
+    with _seed_lock, _seed_file_lock():
+        _create_tables(conn)
+
+
+def _is_seeded(conn: sqlite3.Connection) -> bool:
+    with _lock:
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'seeded'").fetchone()
+    return bool(row and row[0])
+
+
+def is_ready() -> bool:
+    """True once initialize_db() has finished in this process."""
+    return _ready.is_set()
 
-            insert_readings(reading_list)
-            alerts = derive_alerts(reading_list, equipment_id)
-            insert_alerts(alerts)
 
+_INSERT_READING = """INSERT INTO readings
+    (timestamp, equipment_id, vibration_mms, bearing_temp_c,
+     hydraulic_pressure_bar, power_kw, load_pct,
+     liner_wear_pct, seal_condition_pct, throughput_tph,
+     degradation_mode, health_index,
+     vibration_score, thermal_score, pressure_score, power_score,
+     weights_version)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"""
+
+# Replayed rows (same key, same values) change nothing, so they neither count
+# as writes nor invalidate anything; a row with new values replaces the old.
+_UPSERT_COLUMNS = (
+    "vibration_mms, bearing_temp_c, hydraulic_pressure_bar, power_kw, load_pct, "
+    "liner_wear_pct, seal_condition_pct, throughput_tph, degradation_mode, health_index, "
+    "vibration_score, thermal_score, pressure_score, power_score, weights_version"
+)
+_UPSERT_READING = f"""{_INSERT_READING}
+    ON CONFLICT(equipment_id, timestamp) DO UPDATE
+    SET ({_UPSERT_COLUMNS}) = ({", ".join(f"excluded.{c}" for c in _UPSERT_COLUMNS.split(", "))})
+    WHERE ({_UPSERT_COLUMNS}) IS NOT
+          ({", ".join(f"excluded.{c}" for c in _UPSERT_COLUMNS.split(", "))})"""
+
+
+def insert_readings(readings: list[SensorReading] | list[ReadingRecord]) -> int:
+    """
+    Upsert readings (any equipment), scored here: health_index and its
+    sub-scores come from the sensor values, since the models' own
+    health_index is only a default (100). Same semantics as
+    insert_readings_frame().
+    """
+    from src.data.frames import to_dataframe
 
-def insert_readings(readings: list[SensorReading]) -> None:
     if not readings:
-        return
-    rows = [
-        (
-            r.timestamp.isoformat(),
-            r.equipment_id,
-            r.vibration_mms,
-            r.bearing_temp_c,
-            r.hydraulic_pressure_bar,
-            r.power_kw,
-            r.load_pct,
-            r.liner_wear_pct,
-            r.seal_condition_pct,
-            r.throughput_tph,
-            r.degradation_mode.value,
-            r.health_index,
-        )
-        for r in readings
-    ]
+        return 0
+    return insert_readings_frame(
+        to_dataframe(readings, categorical=False).drop(columns="health_index")
+    )
+
+
+# Numeric columns of the array path and their SensorReading bounds (ge, le)
+_REQUIRED_ARRAYS = (
+    "vibration_mms",
+    "bearing_temp_c",
+    "hydraulic_pressure_bar",
+    "power_kw",
+    "load_pct",
+    "throughput_tph",
+)
+_OPTIONAL_ARRAYS = ("liner_wear_pct", "seal_condition_pct", "health_index")
+_BOUNDS = {
+    name: (
+        next(m.ge for m in SensorReading.model_fields[name].metadata if hasattr(m, "ge")),
+        next(m.le for m in SensorReading.model_fields[name].metadata if hasattr(m, "le")),
+    )
+    for name in _REQUIRED_ARRAYS + _OPTIONAL_ARRAYS
+}
+_MODE_VALUES = {mode: mode.value for mode in DegradationMode}  # str keys match too
+
+
+def _iso_utc(epoch_us: np.ndarray) -> list[str]:
+    """datetime.isoformat() of UTC epoch-microsecond timestamps, vectorised."""
+    t = epoch_us.astype("datetime64[us]")
+    text = np.datetime_as_string(t, unit="s")
+    fraction = epoch_us % 1_000_000 != 0
+    if fraction.any():
+        text = np.where(fraction, np.datetime_as_string(t, unit="us"), text)
+    return [s + "+00:00" for s in text.tolist()]
+
+
+class _Batch(NamedTuple):
+    """One equipment's validated rows, ready for _write_reading_rows()."""
+
+    equipment_id: str
+    rows: Iterator[tuple] | list[tuple]
+    health_index: np.ndarray
+    epoch_us: np.ndarray  # UTC timestamps, for the trend tracker
+    sensors: np.ndarray  # (n, len(VARIABLES)), for the Mahalanobis tracker
+    drift: np.ndarray  # (n, len(DRIFT_CONFIG)), for the drift detectors
+    buckets: list[str]  # hour buckets the rows fall in
+
+
+def _reading_rows(equipment_id: str, timestamp: object, columns: dict[str, object]) -> _Batch:
+    """Validate one equipment's columns and build its INSERT rows."""
+    stamps = pd.DatetimeIndex(timestamp)
+    if stamps.tz is None:
+        stamps = stamps.tz_localize(UTC)
+    epoch_us = stamps.as_unit("us").asi8
+    n = len(epoch_us)
+
+    values: dict[str, np.ndarray | None] = {}
+    for name in _REQUIRED_ARRAYS + _OPTIONAL_ARRAYS:
+        column = columns.get(name)
+        if column is None:
+            if name in _REQUIRED_ARRAYS:
+                raise ValueError(f"missing column {name!r}")
+            values[name] = None
+            continue
+        array_ = np.asarray(column, dtype=np.float64)
+        if array_.shape != (n,):
+            raise ValueError(f"{name}: expected {n} values, got shape {array_.shape}")
+        lo, hi = _BOUNDS[name]
+        ok = (array_ >= lo) & (array_ <= hi)
+        if name in ("liner_wear_pct", "seal_condition_pct"):
+            ok |= np.isnan(array_)  # NaN = sensor not fitted → NULL
+        if not ok.all():
+            bad = array_[~ok][0]
+            raise ValueError(f"{name}: {bad} outside [{lo}, {hi}]")
+        values[name] = array_
+
+    mode = columns.get("degradation_mode", DegradationMode.NORMAL)
+    try:
+        if isinstance(mode, str):
+            modes: Iterator | list = repeat(_MODE_VALUES[mode], n)
+        else:
+            modes = list(map(_MODE_VALUES.__getitem__, np.asarray(mode, dtype=object).tolist()))
+            if len(modes) != n:
+                raise ValueError(f"degradation_mode: expected {n} values, got {len(modes)}")
+    except KeyError as exc:
+        raise ValueError(f"unknown degradation_mode {exc.args[0]!r}") from None
+
+    hi, scores = compute_health_batch(
+        equipment_id,
+        values["vibration_mms"],
+        values["bearing_temp_c"],
+        values["hydraulic_pressure_bar"],
+        values["power_kw"],
+    )
+    # A caller-supplied HI that differs from the active profile's score is
+    # stored as given with a NULL weights_version, so rescore_health() fixes it
+    version = weight_profile(equipment_id).version
+    versions: Iterator | list = repeat(version, n)
+    given = values["health_index"]
+    if given is not None:
+        scored = given == hi
+        if not scored.all():
+            versions = np.where(scored, version, None).tolist()
+        hi = given
+
+    def nullable(name: str) -> Iterator | list:
+        array_ = values[name]
+        if array_ is None:
+            return repeat(None, n)
+        missing = np.isnan(array_)
+        return np.where(missing, None, array_).tolist() if missing.any() else array_.tolist()
+
+    rows = zip(
+        _iso_utc(epoch_us),
+        repeat(equipment_id, n),
+        values["vibration_mms"].tolist(),
+        values["bearing_temp_c"].tolist(),
+        values["hydraulic_pressure_bar"].tolist(),
+        values["power_kw"].tolist(),
+        values["load_pct"].tolist(),
+        nullable("liner_wear_pct"),
+        nullable("seal_condition_pct"),
+        values["throughput_tph"].tolist(),
+        modes,
+        hi.tolist(),
+        *scores.T.tolist(),
+        versions,
+        strict=True,
+    )
+    sensors = np.column_stack([values[name] for name in VARIABLES])
+    drift = np.column_stack(
+        [np.full(n, np.nan) if values[name] is None else values[name] for name in DRIFT_CONFIG]
+    )
+    return _Batch(equipment_id, rows, hi, epoch_us, sensors, drift, _hour_buckets(epoch_us))
+
+
+def _hour_buckets(epoch_us: np.ndarray) -> list[str]:
+    """Distinct hour buckets of `epoch_us`, as _mark_buckets() keys."""
+    # sort + diff is much cheaper than np.unique's hashing here
+    hours = np.sort(epoch_us // 3_600_000_000)
+    first = np.ones(len(hours), dtype=bool)
+    first[1:] = hours[1:] != hours[:-1]
+    return np.datetime_as_string(hours[first].astype("datetime64[h]")).tolist()
+
+
+def _split_late(batch: _Batch, last_us: int) -> tuple[list[tuple], _Batch]:
+    """Rows of `batch` at or before `last_us`, and a batch of the rest."""
+    rows = list(batch.rows)
+    late = batch.epoch_us <= last_us
+    keep = ~late
+    rest = _Batch(
+        batch.equipment_id,
+        list(compress(rows, keep.tolist())),
+        batch.health_index[keep],
+        batch.epoch_us[keep],
+        batch.sensors[keep],
+        batch.drift[keep],
+        _hour_buckets(batch.epoch_us[keep]),
+    )
+    return list(compress(rows, late.tolist())), rest
+
+
+def _write_reading_rows(batches: list[_Batch]) -> int:
+    """
+    Upsert the batches in one transaction. Returns rows inserted or changed.
+
+    Only rows that changed something advance their equipment's trend and
+    Mahalanobis trackers and drift detectors (the last two raising an alert
+    per new onset or drift episode) and stamp their hour buckets with the new
+    data version. Rows at or before the tracked timestamp that match the
+    stored ones (an at-least-once redelivery) are dropped by the upsert, and
+    the newer rows of their batch are folded in as usual. Rows there that are
+    new or differ (late, out-of-order or corrected data) make the trackers
+    replay that equipment's stored history instead, since they only fold
+    forward, and bump the equipment's "rewrites" version: charts can no
+    longer be brought up to date by appending points. A replay raises no
+    alerts.
+    """
     conn = _get_conn()
+    written = 0
+    alerted = False
     with _lock, conn:
-        conn.executemany(
-            """INSERT INTO readings
-               (timestamp, equipment_id, vibration_mms, bearing_temp_c,
-                hydraulic_pressure_bar, power_kw, load_pct,
-                liner_wear_pct, seal_condition_pct, throughput_tph,
-                degradation_mode, health_index)
-               VALUES (?,?,?,?,?,?,?,?,?,?,?,?)""",
-            rows,
-        )
+        sql = _INSERT_READING if _deferring_indexes else _UPSERT_READING
+        changed: list[tuple[str, list[str]]] = []
+        for batch in batches:
+            tracker = _load_trend_tracker(conn, batch.equipment_id)
+            rewritten = False
+            if tracker is not None:
+                last_us = (tracker.timestamp - _EPOCH) // timedelta(microseconds=1)
+                if batch.epoch_us.min(initial=last_us + 1) <= last_us:
+                    buckets = batch.buckets
+                    late, batch = _split_late(batch, last_us)
+                    before = conn.total_changes
+                    conn.executemany(sql, late)
+                    rewritten = conn.total_changes != before
+                    written += conn.total_changes - before
+                    if rewritten:
+                        changed.append((batch.equipment_id, buckets))
+            before = conn.total_changes
+            conn.executemany(sql, batch.rows)
+            if conn.total_changes == before and not rewritten:
+                continue
+            written += conn.total_changes - before
+            if not rewritten:
+                changed.append((batch.equipment_id, batch.buckets))
+            stamps = np.sort(batch.epoch_us)
+            if rewritten or (tracker is not None and (stamps[1:] == stamps[:-1]).any()):
+                _rebuild_trend_tracker(conn, batch.equipment_id)
+                update_detectors(conn, batch.equipment_id)
+                _bump_version(conn, f"rewrites:{batch.equipment_id}")
+            else:
+                _advance_trend_tracker(conn, batch, tracker)
+                alerts = update_detectors(conn, batch.equipment_id, batch)
+                _write_alert_rows(conn, alerts)
+                alerted |= bool(alerts)
+        if alerted:
+            _bump_version(conn, "alerts")
+        if changed:
+            version = _bump_version(conn, "readings")
+            for equipment_id, buckets in changed:
+                _mark_buckets(conn, version, equipment_id, buckets)
+    return written
 
 
-def insert_alerts(alerts: list[Alert]) -> None:
-    if not alerts:
-        return
+def insert_readings_arrays(
+    equipment_id: str,
+    timestamp: object,
+    *,
+    vibration_mms: object,
+    bearing_temp_c: object,
+    hydraulic_pressure_bar: object,
+    power_kw: object,
+    load_pct: object,
+    throughput_tph: object,
+    liner_wear_pct: object | None = None,
+    seal_condition_pct: object | None = None,
+    degradation_mode: object = DegradationMode.NORMAL,
+    health_index: object | None = None,
+) -> int:
+    """
+    Insert readings of one equipment from parallel columns (NumPy arrays,
+    Series or lists), without building a model per reading.
+
+    `timestamp` takes anything pd.DatetimeIndex accepts (naive = UTC).
+    Values are checked against the SensorReading bounds as whole arrays
+    (ValueError); NaN in liner_wear_pct / seal_condition_pct is stored as
+    NULL. Sub-scores, and health_index unless given, come from one
+    compute_health_batch() call; a given health_index that differs from it is
+    stored with a NULL weights_version, so rescore_health() replaces it. All rows go through
+    one prepared statement in a single transaction, at the connection's own
+    synchronous level (only the initial seed runs under _bulk_load()).
+
+    Rows upsert on (equipment_id, timestamp): replaying a batch is a no-op
+    and a row with new values replaces the stored one. Returns rows inserted
+    or changed.
+    """
+    columns = {
+        "vibration_mms": vibration_mms,
+        "bearing_temp_c": bearing_temp_c,
+        "hydraulic_pressure_bar": hydraulic_pressure_bar,
+        "power_kw": power_kw,
+        "load_pct": load_pct,
+        "throughput_tph": throughput_tph,
+        "liner_wear_pct": liner_wear_pct,
+        "seal_condition_pct": seal_condition_pct,
+        "degradation_mode": degradation_mode,
+        "health_index": health_index,
+    }
+    batch = _reading_rows(equipment_id, timestamp, columns)
+    return _write_reading_rows([batch]) if len(batch.epoch_us) else 0
+
+
+def insert_readings_frame(df: pd.DataFrame) -> int:
+    """
+    Insert the rows of a readings DataFrame (shaped like frames.to_dataframe()
+    or get_readings(); one or several equipment) in a single transaction.
+
+    Extra columns (id, sub-scores) are ignored; missing optional columns take
+    the SensorReading defaults, and health_index is computed when absent
+    (when present it is kept until rescore_health(), see insert_readings_arrays()).
+    Upserts like insert_readings_arrays(); returns rows inserted or changed.
+    """
+    if df.empty:
+        return 0
+    batches = []
+    for equipment_id, part in df.groupby("equipment_id", sort=False, observed=True):
+        columns = {name: part[name] for name in part.columns if name in _BOUNDS}
+        if "degradation_mode" in part:
+            columns["degradation_mode"] = part["degradation_mode"]
+        batches.append(_reading_rows(str(equipment_id), part["timestamp"], columns))
+    return _write_reading_rows(batches)
+
+
+_RESCORE_CHUNK = 50_000
+
+
+def rescore_health(
+    chunk_size: int = _RESCORE_CHUNK,
+    force: bool = False,
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    Recompute health_index and its sub-scores for readings not scored with
+    the active weight profile of their equipment type (older versions, or
+    rows from before the columns existed). `force` rescores every row.
+
+    Each chunk is scored with one vectorised compute_health_batch() call and
+    written in its own short transaction: WAL readers in other processes keep
+    reading, and readers in this one interleave between chunks. They see the
+    old or new HI per chunk until the final version bump invalidates cached
+    results. Trend trackers of rescored equipment are rebuilt from the new HI
+    and their "rewrites" version is bumped, like for late rows.
+    `progress(done, total)` is called after every chunk. Returns rows updated.
+    """
+    conn = _get_conn()
+    stale = "" if force else " AND weights_version IS NOT ?"
+    todo: list[tuple[str, int, int]] = []
+    with _lock:
+        equipment_ids = [
+            row[0] for row in conn.execute("SELECT DISTINCT equipment_id FROM readings")
+        ]
+        for equipment_id in equipment_ids:
+            version = weight_profile(equipment_id).version
+            params = (equipment_id,) if force else (equipment_id, version)
+            (count,) = conn.execute(
+                f"SELECT COUNT(*) FROM readings WHERE equipment_id = ?{stale}", params
+            ).fetchone()
+            if count:
+                todo.append((equipment_id, version, count))
+    total = sum(count for *_, count in todo)
+
+    done = 0
+    for equipment_id, version, _ in todo:
+        params = (equipment_id,) if force else (equipment_id, version)
+        last_id = 0
+        while True:
+            with _lock:
+                cur = conn.cursor()
+                cur.row_factory = None
+                rows = cur.execute(
+                    f"""SELECT id, vibration_mms, bearing_temp_c,
+                               hydraulic_pressure_bar, power_kw
+                        FROM readings WHERE equipment_id = ?{stale} AND id > ?
+                        ORDER BY id LIMIT ?""",
+                    (*params, last_id, chunk_size),
+                ).fetchall()
+            if not rows:
+                break
+            values = np.array(rows, dtype=float)
+            ids = values[:, 0].astype(np.int64).tolist()
+            hi, scores = compute_health_batch(equipment_id, *values[:, 1:].T)
+            updates = zip(hi.tolist(), *scores.T.tolist(), [version] * len(ids), ids, strict=True)
+            with _lock, conn:
+                conn.executemany(
+                    """UPDATE readings SET health_index = ?,
+                              vibration_score = ?, thermal_score = ?,
+                              pressure_score = ?, power_score = ?, weights_version = ?
+                       WHERE id = ?""",
+                    updates,
+                )
+            last_id = ids[-1]
+            done += len(ids)
+            if progress is not None:
+                progress(done, total)
+
+    if done:
+        with _lock, conn:
+            version = _bump_version(conn, "readings")
+            for equipment_id, *_ in todo:
+                _rebuild_trend_tracker(conn, equipment_id)
+                _mark_buckets(conn, version, equipment_id)
+                # Drawn HI history changed: charts must redraw, not patch
+                _bump_version(conn, f"rewrites:{equipment_id}")
+    return done
+
+
+def _load_trend_tracker(conn: sqlite3.Connection, equipment_id: str) -> TrendTracker | None:
+    row = conn.execute(
+        "SELECT timestamp, level, slope, p00, p01, p11, n FROM trend_state WHERE equipment_id = ?",
+        (equipment_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    ts, level, slope, p00, p01, p11, n = tuple(row)
+    return TrendTracker(level, slope, p00, p01, p11, datetime.fromisoformat(ts), n)
+
+
+def _advance_trend_tracker(
+    conn: sqlite3.Connection, batch: _Batch, tracker: TrendTracker | None
+) -> None:
+    """Fold a batch newer than `tracker` into the persisted trend state (same transaction)."""
+    order = np.argsort(batch.epoch_us, kind="stable")
+    hi, stamps = batch.health_index[order].tolist(), batch.epoch_us[order].tolist()
+    if tracker is None:
+        tracker = TrendTracker.start(hi[0], _EPOCH + timedelta(microseconds=stamps[0]))
+        hi, stamps = hi[1:], stamps[1:]
+    tracker.update_many(hi, stamps)
+    _save_trend_tracker(conn, batch.equipment_id, tracker)
+
+
+def _save_trend_tracker(conn: sqlite3.Connection, equipment_id: str, tracker: TrendTracker) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO trend_state VALUES (?,?,?,?,?,?,?,?)",
+        (
+            equipment_id,
+            tracker.timestamp.isoformat(),
+            tracker.level,
+            tracker.slope,
+            tracker.p00,
+            tracker.p01,
+            tracker.p11,
+            tracker.n,
+        ),
+    )
+
+
+def _rebuild_trend_tracker(conn: sqlite3.Connection, equipment_id: str) -> None:
+    """Replay an equipment's whole stored HI history into a fresh trend state."""
+    conn.execute("DELETE FROM trend_state WHERE equipment_id = ?", (equipment_id,))
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(
+        "SELECT timestamp, health_index FROM readings WHERE equipment_id = ? ORDER BY timestamp",
+        (equipment_id,),
+    )
+    tracker: TrendTracker | None = None
+    while rows := cur.fetchmany(_FETCH_CHUNK):
+        for ts, hi in rows:
+            if tracker is None:
+                tracker = TrendTracker.start(hi, datetime.fromisoformat(ts))
+            else:
+                tracker.update(hi, datetime.fromisoformat(ts))
+    if tracker is not None:
+        _save_trend_tracker(conn, equipment_id, tracker)
+
+
+def _write_alert_rows(conn: sqlite3.Connection, alerts: list[Alert]) -> None:
+    """INSERT OR IGNORE `alerts` inside the caller's transaction."""
     rows = [
         (
             a.id,
@@ -172,15 +1045,22 @@ def insert_alerts(alerts: list[Alert]) -> None:
         )
         for a in alerts
     ]
+    conn.executemany(
+        """INSERT OR IGNORE INTO alerts
+           (id, timestamp, equipment_id, severity, category,
+            variable, value, threshold, message, acknowledged)
+           VALUES (?,?,?,?,?,?,?,?,?,?)""",
+        rows,
+    )
+
+
+def insert_alerts(alerts: list[Alert]) -> None:
+    if not alerts:
+        return
     conn = _get_conn()
     with _lock, conn:
-        conn.executemany(
-            """INSERT OR IGNORE INTO alerts
-               (id, timestamp, equipment_id, severity, category,
-                variable, value, threshold, message, acknowledged)
-               VALUES (?,?,?,?,?,?,?,?,?,?)""",
-            rows,
-        )
+        _write_alert_rows(conn, alerts)
+        _bump_version(conn, "alerts")
 
 
 def get_readings(
@@ -188,21 +1068,33 @@ def get_readings(
     hours: int = 90 * 24,
     limit: int = 10_000,
 ) -> pd.DataFrame:
-    """Fetch readings for an equipment over the last `hours` hours."""
-    since = (datetime.now(tz=UTC) - timedelta(hours=hours)).isoformat()
-    conn = _get_conn()
+    """
+    Fetch readings for an equipment over the last `hours` hours, oldest
+    first. When the window holds more than `limit` rows the newest `limit`
+    are returned.
+
+    Nullable columns (liner_wear_pct, seal_condition_pct) come back as NaN
+    where the sensor is not fitted; timestamps are tz-aware UTC. Results are
+    shared across workers through get_result_cache() until a write changes
+    rows of this equipment inside the window.
+    """
+    since = _window_start(timedelta(hours=hours))
     with _lock:
-        df = pd.read_sql_query(
-            """SELECT * FROM readings
-               WHERE equipment_id = ? AND timestamp >= ?
-               ORDER BY timestamp ASC
-               LIMIT ?""",
-            conn,
-            params=(equipment_id, since, limit),
-        )
-    if not df.empty:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-    return df
+        version = _window_version(_get_conn(), equipment_id, since)
+    return get_result_cache().get_or_compute(
+        f"readings|{equipment_id}|{since}|{limit}",
+        version,
+        lambda: _read_columns(
+            f"""SELECT * FROM (
+                    SELECT {_select_list(_READINGS_COLUMNS)} FROM readings
+                    WHERE equipment_id = ? AND timestamp >= ?
+                    ORDER BY readings.timestamp DESC
+                    LIMIT ?
+                ) ORDER BY timestamp ASC""",
+            (equipment_id, since, limit),
+            _READINGS_COLUMNS,
+        ),
+    )
 
 
 def get_latest(equipment_id: str) -> dict | None:
@@ -216,14 +1108,49 @@ def get_latest(equipment_id: str) -> dict | None:
     return dict(row) if row else None
 
 
+def get_latest_many(equipment_ids: list[str]) -> pd.DataFrame:
+    """
+    Return the most recent row for each of `equipment_ids` in a single query.
+
+    The result is columnar (one row per equipment that has readings, in the
+    order requested) so it can be scored as whole arrays instead of row by row.
+    """
+    # One descending probe of ux_readings_eq_ts per equipment; a window or
+    # GROUP BY MAX() over the IN list walks every row of each equipment
+    values = ",".join(["(?, ?)"] * len(equipment_ids)) or "(NULL, NULL)"
+    return _read_columns(
+        f"""WITH ids(pos, eq) AS (VALUES {values})
+            SELECT {_select_list(_READINGS_COLUMNS)}
+            FROM ids JOIN readings ON readings.id = (
+                SELECT id FROM readings
+                WHERE equipment_id = ids.eq
+                ORDER BY timestamp DESC
+                LIMIT 1
+            )
+            ORDER BY ids.pos""",
+        [v for pos, eq_id in enumerate(equipment_ids) for v in (pos, eq_id)],
+        _READINGS_COLUMNS,
+    )
+
+
 def get_alerts(
     equipment_id: str | None = None,
     severity: str | None = None,
     days: int = 30,
     limit: int = 500,
 ) -> pd.DataFrame:
-    """Fetch alerts with optional filters."""
-    since = (datetime.now(tz=UTC) - timedelta(days=days)).isoformat()
+    """Fetch alerts with optional filters (cached like get_readings)."""
+    since = _window_start(timedelta(days=days))
+    return get_result_cache().get_or_compute(
+        f"alerts|{equipment_id}|{severity}|{since}|{limit}",
+        get_data_version("alerts"),
+        lambda: _query_alerts(since, equipment_id, severity, limit),
+    )
+
+
+def _query_alerts(
+    since: str, equipment_id: str | None, severity: str | None, limit: int
+) -> pd.DataFrame:
     where = ["timestamp >= ?"]
     params: list = [since]
 
@@ -234,7 +1161,7 @@ def get_alerts(
         where.append("severity = ?")
         params.append(severity)
 
-    sql = f"""SELECT * FROM alerts WHERE {' AND '.join(where)}
+    sql = f"""SELECT * FROM alerts WHERE {" AND ".join(where)}
               ORDER BY timestamp DESC LIMIT ?"""
     params.append(limit)
 
@@ -250,6 +1177,63 @@ def acknowledge_alert(alert_id: str) -> None:
     conn = _get_conn()
     with _lock, conn:
         conn.execute("UPDATE alerts SET acknowledged = 1 WHERE id = ?", (alert_id,))
+        _bump_version(conn, "alerts")
+
+
+def get_data_version(
+    kind: str = "readings", equipment_id: str | None = None, hours: int | None = None
+) -> int:
+    """
+    Return the write counter for `kind` ("readings", "alerts" or "rewrites").
+
+    The counter lives in the database, so every process sharing the file sees
+    the same value; caches key on it to know when their entries are stale.
+    For readings with `equipment_id` it is the version of the last write that
+    changed that equipment's readings, within the last `hours` if given (the
+    get_readings() window): writes to other equipment, or late rows older
+    than the window, leave it unchanged. "rewrites" counts, per equipment,
+    the writes that landed at or before its latest reading.
+    """
+    conn = _get_conn()
+    with _lock:
+        if equipment_id is None:
+            return _current_version(conn, kind)
+        if kind != "readings":
+            return _current_version(conn, f"{kind}:{equipment_id}")
+        since = _window_start(timedelta(hours=hours)) if hours is not None else ""
+        return _window_version(conn, equipment_id, since)
+
+
+def _window_version(conn: sqlite3.Connection, equipment_id: str, since: str) -> int:
+    (version,) = conn.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM bucket_versions WHERE equipment_id = ? AND bucket >= ?",
+        (equipment_id, since[:_BUCKET_CHARS]),
+    ).fetchone()
+    return version
+
+
+def get_trend_tracker(equipment_id: str) -> TrendTracker | None:
+    """Current online trend state for an equipment (None before its first reading)."""
+    conn = _get_conn()
+    with _lock:
+        return _load_trend_tracker(conn, equipment_id)
+
+
+def get_mahalanobis_tracker(equipment_id: str) -> MahalanobisTracker | None:
+    """Current multivariate detector state for an equipment (None before its first reading)."""
+    conn = _get_conn()
+    with _lock:
+        return load_mahalanobis_tracker(conn, equipment_id)
+
+
+def get_drift_detectors(equipment_id: str) -> dict:
+    """
+    Drift detectors of an equipment, {(variable, "cusum" | "ewma"): detector};
+    fresh (never updated) ones before its first reading.
+    """
+    conn = _get_conn()
+    with _lock:
+        return load_drift_detectors(conn, equipment_id)
 
 
 def get_active_alert_count(equipment_id: str | None = None) -> int:
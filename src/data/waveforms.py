@@ -0,0 +1,370 @@
+"""
+src/data/waveforms.py
+─────────────────────
+High-rate vibration waveform store on memory-mapped files.
+
+Readings carry one hourly RMS value per machine; telling a bearing defect
+from misalignment needs the raw accelerometer signal at kHz rates, which is
+far too much data to push through SQLite row by row. Waveforms live in flat
+binary files instead, and SQLite only indexes them:
+
+  - One segment file per equipment and UTC day
+    (`<root>/<equipment_id>/<YYYY-MM-DD>.f32`) holding float32 samples
+    row-major, one row per sample instant and one column per channel.
+    append() writes raw bytes to the end of the file; an append that
+    crosses midnight is split between two segments.
+  - The index (`<root>/index.db`) has one row per segment (channels, number
+    of samples) and one per block — a run of evenly spaced samples with its
+    start time, sample rate and offset in the file. An append that continues
+    the previous block (same rate, next sample instant) just extends it, so
+    a continuous capture keeps one block per day however many appends it
+    takes.
+  - read() returns the blocks overlapping [start, end) as np.memmap slices:
+    zero-copy views into the page cache, whatever the size of the window.
+
+Data is written and flushed before the index row that exposes it commits,
+so readers in other processes never see samples that are not in the file.
+Bytes past the indexed length (a write interrupted before its commit) are
+truncated before the next append to that segment. Each equipment must have a
+single writer; any number of processes may read.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+import numpy as np
+
+from config.settings import settings
+
+DTYPE = np.dtype("<f4")
+_SUFFIX = ".f32"
+_DAY_US = 86_400_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+_CREATE = """
+CREATE TABLE IF NOT EXISTS segments (
+    equipment_id TEXT    NOT NULL,
+    day          TEXT    NOT NULL,
+    channels     INTEGER NOT NULL,
+    n_samples    INTEGER NOT NULL,
+    PRIMARY KEY (equipment_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS blocks (
+    equipment_id   TEXT    NOT NULL,
+    start_us       INTEGER NOT NULL,
+    end_us         INTEGER NOT NULL,
+    sample_rate_hz REAL    NOT NULL,
+    day            TEXT    NOT NULL,
+    offset         INTEGER NOT NULL,
+    n_samples      INTEGER NOT NULL,
+    PRIMARY KEY (equipment_id, start_us)
+) WITHOUT ROWID;
+"""
+
+
+def _epoch_us(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // timedelta(microseconds=1)
+
+
+def _end_us(start_us: int, n_samples: int, sample_rate_hz: float) -> int:
+    """Instant of the sample after the last one (exclusive block end)."""
+    return start_us + round(n_samples * 1e6 / sample_rate_hz)
+
+
+class WaveformSlice(NamedTuple):
+    """Evenly spaced samples starting at `start_us` (µs since the epoch)."""
+
+    start_us: int
+    sample_rate_hz: float
+    data: np.ndarray  # (n_samples, channels), a view into the segment file
+
+    @property
+    def start(self) -> datetime:
+        return _EPOCH + timedelta(microseconds=self.start_us)
+
+    def times_us(self) -> np.ndarray:
+        """Epoch µs of every sample."""
+        step = 1e6 / self.sample_rate_hz
+        return self.start_us + np.rint(np.arange(len(self.data)) * step).astype(np.int64)
+
+
+class WaveformStore:
+    """Append-only per-equipment waveform segments with a SQLite offset index."""
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self._root = Path(root)
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+        self._lock = threading.RLock()
+        self._files: dict[tuple[str, str], BinaryIO] = {}
+        self._maps: dict[tuple[str, str], np.memmap] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _get_conn(self) -> sqlite3.Connection:
+        # Connections and open files must not cross fork(): reopen in each new process
+        if self._conn is None or self._pid != os.getpid():
+            self._root.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._root / "index.db", check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_CREATE)
+            self._conn, self._pid, self._lock = conn, os.getpid(), threading.RLock()
+            self._files, self._maps = {}, {}
+        return self._conn
+
+    def _path(self, equipment_id: str, day: str) -> Path:
+        return self._root / equipment_id / f"{day}{_SUFFIX}"
+
+    # ── Writing ───────────────────────────────────────────────────────────────
+
+    def append(
+        self,
+        equipment_id: str,
+        start: datetime,
+        samples: np.ndarray,
+        sample_rate_hz: float,
+    ) -> None:
+        """
+        Append evenly spaced samples captured from `start` on.
+
+        Args:
+            equipment_id: Machine the signal belongs to
+            start: Instant of the first sample (tz-aware)
+            samples: (n,) for one channel or (n, channels); converted to float32
+            sample_rate_hz: Sampling rate of `samples`
+
+        Raises:
+            ValueError: if the channel count differs from the segment's, the
+                rate is not positive, or `start` is earlier than the end of
+                the data already stored for that day
+        """
+        if not sample_rate_hz > 0:
+            raise ValueError(f"sample_rate_hz must be positive, got {sample_rate_hz}")
+        data = np.asarray(samples)
+        if data.ndim == 1:
+            data = data[:, None]
+        if data.ndim != 2:
+            raise ValueError(f"samples must be 1-D or 2-D, got shape {data.shape}")
+        data = np.ascontiguousarray(data, dtype=DTYPE)
+        start_us = _epoch_us(start)
+        step_us = 1e6 / sample_rate_hz
+
+        conn = self._get_conn()
+        with self._lock:
+            pos = 0
+            while pos < len(data):
+                day_end = (start_us // _DAY_US + 1) * _DAY_US
+                n = min(len(data) - pos, math.ceil((day_end - start_us) / step_us))
+                self._append_day(conn, equipment_id, start_us, data[pos : pos + n], sample_rate_hz)
+                pos += n
+                start_us = _end_us(start_us, n, sample_rate_hz)
+
+    def _append_day(
+        self,
+        conn: sqlite3.Connection,
+        equipment_id: str,
+        start_us: int,
+        data: np.ndarray,
+        sample_rate_hz: float,
+    ) -> None:
+        day = np.datetime64(start_us, "us").astype("datetime64[D]").item().isoformat()
+        channels = data.shape[1]
+        seg = conn.execute(
+            "SELECT channels, n_samples FROM segments WHERE equipment_id = ? AND day = ?",
+            (equipment_id, day),
+        ).fetchone()
+        offset = 0
+        if seg is not None:
+            if seg[0] != channels:
+                raise ValueError(f"{equipment_id} {day} holds {seg[0]} channels, got {channels}")
+            offset = seg[1]
+        last = conn.execute(
+            """SELECT start_us, end_us, sample_rate_hz, offset, n_samples FROM blocks
+               WHERE equipment_id = ? AND day = ? ORDER BY start_us DESC LIMIT 1""",
+            (equipment_id, day),
+        ).fetchone()
+        # Half a sample of slack absorbs the µs rounding of block boundaries
+        slack = 0.5e6 / sample_rate_hz
+        if last is not None and start_us < last[1] - slack:
+            raise ValueError(
+                f"{equipment_id}: waveform at {start_us} µs overlaps data up to {last[1]} µs"
+            )
+
+        fh = self._writer(equipment_id, day, offset * channels * DTYPE.itemsize)
+        fh.write(memoryview(data).cast("B"))
+        fh.flush()
+
+        n = len(data)
+        with conn:
+            conn.execute(
+                """INSERT INTO segments (equipment_id, day, channels, n_samples)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(equipment_id, day) DO UPDATE SET n_samples = excluded.n_samples""",
+                (equipment_id, day, channels, offset + n),
+            )
+            if (
+                last is not None
+                and last[2] == sample_rate_hz
+                and last[3] + last[4] == offset
+                and abs(start_us - last[1]) <= slack
+            ):
+                total = last[4] + n
+                conn.execute(
+                    """UPDATE blocks SET n_samples = ?, end_us = ?
+                       WHERE equipment_id = ? AND start_us = ?""",
+                    (total, _end_us(last[0], total, sample_rate_hz), equipment_id, last[0]),
+                )
+            else:
+                conn.execute(
+                    """INSERT INTO blocks (equipment_id, start_us, end_us, sample_rate_hz,
+                                           day, offset, n_samples)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        equipment_id,
+                        start_us,
+                        _end_us(start_us, n, sample_rate_hz),
+                        sample_rate_hz,
+                        day,
+                        offset,
+                        n,
+                    ),
+                )
+
+    def _writer(self, equipment_id: str, day: str, size: int) -> BinaryIO:
+        """Append handle of a segment whose indexed length is `size` bytes."""
+        key = (equipment_id, day)
+        fh = self._files.get(key)
+        if fh is None:
+            # Only one segment per equipment is being written at a time
+            for other in [k for k in self._files if k[0] == equipment_id]:
+                self._files.pop(other).close()
+            path = self._path(equipment_id, day)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fh = open(path, "ab")  # noqa: SIM115 — kept open across appends
+            self._files[key] = fh
+        if fh.tell() != size:
+            # Bytes of an append whose index commit never happened
+            fh.truncate(size)
+            fh.seek(size)
+        return fh
+
+    # ── Reading ───────────────────────────────────────────────────────────────
+
+    def read(self, equipment_id: str, start: datetime, end: datetime) -> list[WaveformSlice]:
+        """
+        Samples of `equipment_id` in [start, end), one slice per stored block.
+
+        Each slice's data is a read-only np.memmap view of the segment file,
+        so nothing is copied until it is used. Gaps in the capture separate
+        blocks; an uninterrupted capture comes back as one slice per day.
+        """
+        lo, hi = _epoch_us(start), _epoch_us(end)
+        conn = self._get_conn()
+        with self._lock:
+            blocks = conn.execute(
+                """SELECT b.start_us, b.sample_rate_hz, b.day, b.offset, b.n_samples,
+                          s.channels, s.n_samples
+                   FROM blocks b JOIN segments s USING (equipment_id, day)
+                   WHERE b.equipment_id = ? AND b.start_us < ? AND b.end_us > ?
+                   ORDER BY b.start_us""",
+                (equipment_id, hi, lo),
+            ).fetchall()
+            slices = []
+            for start_us, rate, day, offset, n, channels, seg_len in blocks:
+                step_us = 1e6 / rate
+                i0 = max(0, math.ceil((lo - start_us) / step_us))
+                i1 = min(n, math.ceil((hi - start_us) / step_us))
+                if i1 <= i0:
+                    continue
+                seg = self._segment(equipment_id, day, channels, seg_len)
+                slices.append(
+                    WaveformSlice(
+                        start_us + round(i0 * step_us), rate, seg[offset + i0 : offset + i1]
+                    )
+                )
+        return slices
+
+    def _segment(self, equipment_id: str, day: str, channels: int, n_samples: int) -> np.memmap:
+        """Read-only map of the first `n_samples` rows of a segment, remapped as it grows."""
+        key = (equipment_id, day)
+        seg = self._maps.get(key)
+        if seg is None or len(seg) < n_samples:
+            # Views handed out earlier keep the previous mapping alive
+            seg = np.memmap(self._path(equipment_id, day), DTYPE, "r", shape=(n_samples, channels))
+            self._maps[key] = seg
+        return seg
+
+    def days(self, equipment_id: str) -> list[str]:
+        """UTC days (YYYY-MM-DD) with stored waveforms, oldest first."""
+        conn = self._get_conn()
+        with self._lock:
+            rows = conn.execute(
+                "SELECT day FROM segments WHERE equipment_id = ? ORDER BY day", (equipment_id,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    # ── Housekeeping ──────────────────────────────────────────────────────────
+
+    def prune(self, before: datetime) -> int:
+        """Delete every segment of a day that ends before `before`; returns how many."""
+        cutoff = before.astimezone(UTC).date().isoformat()
+        conn = self._get_conn()
+        with self._lock:
+            rows = conn.execute(
+                "SELECT equipment_id, day FROM segments WHERE day < ?", (cutoff,)
+            ).fetchall()
+            with conn:
+                conn.execute("DELETE FROM blocks WHERE day < ?", (cutoff,))
+                conn.execute("DELETE FROM segments WHERE day < ?", (cutoff,))
+            for key in rows:
+                key = tuple(key)
+                if key in self._files:
+                    self._files.pop(key).close()
+                self._maps.pop(key, None)
+                # Mappings still referenced elsewhere stay valid after the unlink
+                self._path(*key).unlink(missing_ok=True)
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            for fh in self._files.values():
+                fh.close()
+            self._files.clear()
+            self._maps.clear()
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+_store: WaveformStore | None = None
+_tmp: tempfile.TemporaryDirectory | None = None
+
+
+def get_waveform_store() -> WaveformStore:
+    """
+    The process-wide waveform store.
+
+    It lives in settings.WAVEFORM_DIR, or `<DATABASE_URL>.waveforms` when
+    unset. With an in-memory database it uses a temporary directory that is
+    removed at exit.
+    """
+    global _store, _tmp
+    if _store is None:
+        root = settings.WAVEFORM_DIR
+        if not root and settings.DATABASE_URL == ":memory:":
+            _tmp = tempfile.TemporaryDirectory(prefix="waveforms-")
+            root = _tmp.name
+        _store = WaveformStore(root or f"{settings.DATABASE_URL}.waveforms")
+    return _store
@@ -7,6 +7,7 @@ Contains:
   - dcc.Location for routing
   - dcc.Store for shared client-side state
   - dcc.Interval for live updates
+  - dcc.Interval polling for DB readiness while the app is warming up
   - Navbar + page content container
 """
 
@@ -31,6 +32,8 @@ def create_layout() -> html.Div:
                 interval=30_000,  # 30 seconds
                 n_intervals=0,
             ),
+            # Re-runs page routing until the DB is seeded, then gets disabled
+            dcc.Interval(id="interval-warmup", interval=2_000, n_intervals=0),
             # ── Navigation bar ────────────────────────────────────────────────
             create_navbar(),
             # ── Page content ──────────────────────────────────────────────────
@@ -7,6 +7,8 @@ Alert management page with filters and acknowledgement.
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
+from config.equipment import EQUIPMENT_CONFIG
+
 CARD_BG = "#161b22"
 BORDER = "#30363d"
 MUTED = "#8b949e"
@@ -21,8 +23,10 @@ _SEVERITY_OPTIONS = [
 
 _EQUIPMENT_OPTIONS = [
     {"label": "Todos", "value": "all"},
-    {"label": "Molino SAG (SAG-01)", "value": "SAG-01"},
-    {"label": "Molino de Bolas (BALL-01)", "value": "BALL-01"},
+    *(
+        {"label": f"{eq['name']} ({eq_id})", "value": eq_id}
+        for eq_id, eq in EQUIPMENT_CONFIG.items()
+    ),
 ]
 
 
@@ -39,6 +43,8 @@ def layout() -> html.Div:
                 ],
                 className="page-header",
             ),
+            # Alerts data version currently rendered (skips unchanged refreshes)
+            dcc.Store(id="alerts-rendered-version"),
             # ── Summary badges ─────────────────────────────────────────────────
             html.Div(id="alerts-summary-badges", className="mb-3"),
             # ── Filter row ─────────────────────────────────────────────────────
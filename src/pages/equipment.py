@@ -29,6 +29,8 @@ def layout() -> html.Div:
                 ],
                 className="page-header",
             ),
+            # What the client has rendered per chart (see callbacks/figure_cache.py)
+            dcc.Store(id="eq-fig-state", data={}),
             dbc.Row(
                 [
                     # ── Sidebar ───────────────────────────────────────────────
@@ -42,6 +42,8 @@ def layout() -> html.Div:
                 ],
                 className="page-header",
             ),
+            # What the client has rendered per chart (see callbacks/figure_cache.py)
+            dcc.Store(id="trends-fig-state", data={}),
             # ── Controls ───────────────────────────────────────────────────────
             dbc.Row(
                 [
@@ -124,6 +126,7 @@ def layout() -> html.Div:
                                     {"label": " Anomalías", "value": "anomalies"},
                                     {"label": " Umbrales", "value": "thresholds"},
                                     {"label": " Media móvil", "value": "rolling"},
+                                    {"label": " Multivariable", "value": "mahalanobis"},
                                 ],
                                 value=["thresholds"],
                                 inline=True,
@@ -0,0 +1,27 @@
+"""
+src/pages/warmup.py
+────────────────────
+Placeholder page shown while the database is still being seeded.
+
+The router swaps in the requested page as soon as store.is_ready().
+"""
+
+import dash_bootstrap_components as dbc
+from dash import html
+
+MUTED = "#8b949e"
+
+
+def layout() -> html.Div:
+    return html.Div(
+        [
+            dbc.Spinner(color="info", size="md"),
+            html.H2("Preparando datos…", className="page-title", style={"marginTop": "1rem"}),
+            html.P(
+                "Generando el historial simulado de la flota. La página se actualizará sola.",
+                className="page-subtitle",
+                style={"color": MUTED},
+            ),
+        ],
+        style={"padding": "4rem 1.5rem", "textAlign": "center"},
+    )
@@ -0,0 +1,197 @@
+"""
+tests/test_anomaly.py
+─────────────────────
+Tests for rolling Z-score anomaly detection and time-unit windows.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.anomaly import (
+    StreamingDetector,
+    detect_anomalies,
+    get_anomaly_periods,
+    rolling_robust_zscore,
+    rolling_zscore,
+)
+from src.analytics.timebase import (
+    find_gaps,
+    mark_gaps,
+    period_hours,
+    regularize,
+    window_rows,
+)
+
+MINUTE = timedelta(minutes=1)
+
+
+class TestWindowRows:
+    def test_spans_become_rows_at_the_period(self):
+        assert window_rows("24h") == 24
+        assert window_rows(timedelta(hours=24), MINUTE) == 1_440
+        assert window_rows("10min", timedelta(seconds=1)) == 600
+        assert period_hours(timedelta(minutes=10)) == pytest.approx(1 / 6)
+
+    def test_ints_are_rows_and_short_spans_keep_one(self):
+        assert window_rows(7, MINUTE) == 7
+        assert window_rows("1s", MINUTE) == 1
+
+    def test_rejects_non_positive_span(self):
+        with pytest.raises(ValueError):
+            window_rows("0h")
+
+
+class TestGaps:
+    @pytest.fixture
+    def times(self):
+        t0 = pd.Timestamp("2024-06-01", tz="UTC")
+        offsets = [0, 10, 10, 20, 30, 70, 80, 140]  # minutes; a duplicate and two gaps
+        return pd.Series(t0 + pd.to_timedelta(offsets, unit="min"))
+
+    def test_find_gaps(self, times):
+        gaps = find_gaps(times, timedelta(minutes=10))
+        assert gaps["start"].tolist() == [times[4], times[6]]
+        assert gaps["end"].tolist() == [times[5], times[7]]
+        assert gaps["missing"].tolist() == [3, 5]
+        assert find_gaps(times[::-1].to_numpy(), timedelta(minutes=10)).equals(gaps)
+
+    def test_mark_gaps_flags_first_reading_after(self, times):
+        marks = mark_gaps(times, timedelta(minutes=10))
+        assert marks.tolist() == [False] * 5 + [True, False, True]
+        order = np.random.default_rng(0).permutation(len(times))
+        assert (mark_gaps(times[order], timedelta(minutes=10)) == marks[order]).all()
+
+    def test_regularize_averages_duplicates_and_flags_missing(self, times):
+        df = pd.DataFrame({"timestamp": times, "x": np.arange(8.0), "equipment_id": "SAG-01"})
+        out = regularize(df, timedelta(minutes=10))
+        assert len(out) == 15
+        assert list(out.columns) == ["timestamp", "x", "equipment_id", "missing"]
+        assert out["x"].iloc[1] == 1.5  # the two readings at 00:10
+        assert out["missing"].sum() == 8
+        assert out.loc[out["missing"], "x"].isna().all()
+
+    def test_regularize_interpolates_short_gaps_only(self, times):
+        df = pd.DataFrame({"timestamp": times, "x": np.arange(8.0)})
+        out = regularize(df, timedelta(minutes=10), interpolate_limit=3)
+        short = out["timestamp"].between(times[4], times[5], inclusive="neither")
+        np.testing.assert_allclose(out.loc[short, "x"], [4.25, 4.5, 4.75])
+        assert out.loc[out["missing"] & ~short, "x"].isna().all()
+
+
+class TestRollingZscore:
+    def test_default_window_is_24_hourly_rows(self, rng):
+        s = pd.Series(rng.normal(size=200))
+        pd.testing.assert_series_equal(rolling_zscore(s), rolling_zscore(s, 24))
+
+    def test_time_window_follows_sample_period(self, rng):
+        s = pd.Series(rng.normal(size=3_000))
+        pd.testing.assert_series_equal(
+            rolling_zscore(s, "24h", sample_period=MINUTE), rolling_zscore(s, 1_440)
+        )
+
+    def test_spike_is_detected(self, rng):
+        s = pd.Series(rng.normal(0, 0.1, 500))
+        s.iloc[400] = 5.0
+        z, mask = detect_anomalies(s, "2h", sample_period=MINUTE)
+        assert mask.iloc[400]
+        assert z.abs().idxmax() == 400
+
+    def test_time_window_ignores_readings_before_a_gap(self, rng):
+        """After a two-day outage the 24 h window restarts instead of reaching back."""
+        t0 = pd.Timestamp("2024-06-01", tz="UTC")
+        before = pd.date_range(t0, periods=48, freq="1h")
+        after = pd.date_range(t0 + pd.Timedelta(days=4), periods=48, freq="1h")
+        s = pd.Series(np.concatenate([rng.normal(10, 1, 48), rng.normal(30, 1, 48)]))
+        times = pd.Series(before.append(after))
+        by_time = rolling_zscore(s, "24h", times=times)
+        by_rows = rolling_zscore(s, "24h")
+        assert by_rows.iloc[48] > 2.5  # rows reach back across the outage
+        assert by_time.iloc[48:51].isna().all() and abs(by_time.iloc[51]) < 2.5
+
+    def test_datetime_index_is_used(self, rng):
+        times = pd.date_range("2024-06-01", periods=100, freq="37min", tz="UTC")
+        s = pd.Series(rng.normal(size=100))
+        pd.testing.assert_series_equal(
+            rolling_zscore(s.set_axis(times), "6h").reset_index(drop=True),
+            rolling_zscore(s, "6h", times=pd.Series(times)),
+        )
+
+
+class TestRobustZscore:
+    def test_spike_does_not_mask_a_nearby_anomaly(self, rng):
+        s = pd.Series(rng.normal(0, 1, 400))
+        s.iloc[300] = 60.0  # sensor glitch
+        s.iloc[306] = 7.0  # real excursion right after it
+        plain, plain_mask = detect_anomalies(s, 24)
+        robust, robust_mask = detect_anomalies(s, 24, method="mad")
+        assert plain_mask.iloc[300] and robust_mask.iloc[300]
+        assert not plain_mask.iloc[306]  # σ inflated by the glitch
+        assert robust_mask.iloc[306]
+
+    def test_normal_data_scores_like_a_zscore(self, rng):
+        s = pd.Series(rng.normal(0, 2, 5_000))
+        robust = rolling_robust_zscore(s, 200)
+        plain = rolling_zscore(s, 200)
+        assert robust.std() == pytest.approx(plain.std(), rel=0.1)
+
+    def test_scores_against_the_window_mad(self):
+        s = pd.Series([1.0, 2.0, 3.0, 4.0, 100.0])
+        z = rolling_robust_zscore(s, 5)
+        # window median 3; |x − 3| = 2, 1, 0, 1, 97 → MAD 1 (not a median of older residuals)
+        assert z.iloc[-1] == pytest.approx((100.0 - 3.0) / 1.4826)
+
+    def test_flat_window_is_nan_not_infinite(self):
+        z = rolling_robust_zscore(pd.Series([5.0] * 30 + [6.0]), 10)
+        assert z.isna().all()
+
+    def test_unknown_method(self, rng):
+        with pytest.raises(ValueError, match="unknown anomaly method"):
+            detect_anomalies(pd.Series(rng.normal(size=50)), method="iqr")
+
+    def test_anomaly_periods_by_method(self, rng):
+        times = pd.date_range("2024-06-01", periods=200, freq="1h", tz="UTC")
+        df = pd.DataFrame({"timestamp": times, "x": rng.normal(0, 1, 200)})
+        df.loc[150:152, "x"] = 12.0
+        (period, *_) = get_anomaly_periods(df, "x", method="mad", threshold=5.0)
+        assert period["start"] == times[150]
+
+
+class TestStreamingDetector:
+    @pytest.mark.parametrize("method", ["zscore", "mad"])
+    def test_matches_batch_on_irregular_data(self, rng, method):
+        steps = rng.exponential(30.0, 600)
+        steps[rng.random(600) < 0.1] = 0.0
+        steps[300] = 60 * 30.0
+        times = pd.Series(
+            pd.Timestamp("2024-06-01", tz="UTC") + pd.to_timedelta(np.cumsum(steps), unit="min")
+        )
+        s = pd.Series(np.round(rng.normal(10, 1, 600), 1))
+        s.iloc[[50, 400]] = [25.0, np.nan]
+        batch, mask = detect_anomalies(s, "12h", times=times, method=method)
+        detector = StreamingDetector("12h", method=method)
+        for i, (ts, x) in enumerate(zip(times, s, strict=True)):
+            z, flagged = detector.update(ts.to_pydatetime(), x)
+            assert z == pytest.approx(batch.iloc[i], rel=1e-6, nan_ok=True)
+            assert flagged == mask.iloc[i]
+
+
+class TestAnomalyPeriods:
+    def test_same_span_same_periods_at_any_rate(self, rng):
+        """A 24 h window flags the same step whether data is hourly or 10-minutely."""
+        hourly = np.concatenate([rng.normal(50, 1, 96), rng.normal(60, 1, 12)])
+        fine = np.repeat(hourly, 6) + rng.normal(0, 0.1, hourly.size * 6)
+        start = pd.Timestamp("2024-06-01", tz="UTC")
+        df_h = pd.DataFrame(
+            {"timestamp": pd.date_range(start, periods=hourly.size, freq="1h"), "x": hourly}
+        )
+        df_f = pd.DataFrame(
+            {"timestamp": pd.date_range(start, periods=fine.size, freq="10min"), "x": fine}
+        )
+        (first_h, *_) = get_anomaly_periods(df_h, "x", threshold=4.0)
+        (first_f, *_) = get_anomaly_periods(
+            df_f, "x", threshold=4.0, sample_period=timedelta(minutes=10)
+        )
+        assert first_h["start"] == first_f["start"] == start + pd.Timedelta(hours=96)
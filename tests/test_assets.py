@@ -0,0 +1,20 @@
+"""
+tests/test_assets.py
+────────────────────
+Tests for the static stylesheet the Dash app serves from assets/.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from config.equipment import EQUIPMENT_CONFIG
+
+STYLES = Path(__file__).resolve().parents[1] / "assets" / "styles.css"
+
+
+class TestAlertFilterRules:
+    @pytest.mark.parametrize("equipment_id", list(EQUIPMENT_CONFIG))
+    def test_every_equipment_has_a_filter_rule(self, equipment_id):
+        rule = f".f-eq-{equipment_id} .alert-row:not(.eq-{equipment_id})"
+        assert rule in STYLES.read_text(encoding="utf-8")
@@ -0,0 +1,180 @@
+"""
+tests/test_drift.py
+───────────────────
+Tests for the EWMA / CUSUM drift detectors.
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.drift import (
+    DETECTORS,
+    DRIFT_CONFIG,
+    CusumDetector,
+    DriftConfig,
+    EwmaDetector,
+    _Chart,
+    cusum,
+    drift_alerts,
+    ewma_chart,
+)
+
+T0 = datetime(2024, 6, 1, tzinfo=UTC)
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _times(hours: np.ndarray) -> tuple[list[datetime], np.ndarray]:
+    stamps = [T0 + timedelta(hours=float(h)) for h in hours]
+    return stamps, np.array([(s - _EPOCH) // timedelta(microseconds=1) for s in stamps])
+
+
+def _ramp(rng, n: int = 600, start: int = 400, rise: float = 1.0) -> np.ndarray:
+    """Noise around 2.0 (σ 0.15) with a quadratic rise of `rise` from `start` on."""
+    x = rng.normal(2.0, 0.15, n)
+    x[start:] += rise * np.linspace(0.0, 1.0, n - start) ** 2
+    return x
+
+
+def _assert_same_events(got, want) -> None:
+    assert len(got) == len(want)
+    for a, b in zip(got, want, strict=True):
+        assert a[:4] == b[:4]
+        assert a.magnitude == pytest.approx(b.magnitude, rel=1e-9)
+
+
+@pytest.mark.parametrize("cls", [CusumDetector, EwmaDetector])
+class TestStreamingBatch:
+    def test_batch_matches_streaming(self, cls, rng):
+        n = 2_000
+        hours = np.cumsum(rng.choice([0.5, 1.0, 2.0], size=n))
+        hours[1_200:] += 24 * 60.0  # an outage long enough to forget the reference
+        x = _ramp(rng, n, start=900)
+        x[[5, 700]] = np.nan
+        x[1_500:1_600] -= 0.6
+        stamps, epoch_us = _times(hours)
+
+        streamed, batched = cls(), cls()
+        events = [e for i in range(n) for e in streamed.update(stamps[i], x[i])]
+        scores = batched.update_many(x, epoch_us)
+
+        assert len(events) >= 2
+        _assert_same_events(scores.events, events)
+        got, want = batched.state(), streamed.state()
+        assert got["up"] == want["up"] and got["down"] == want["down"]
+        assert got["reference"] == pytest.approx(want["reference"], rel=1e-9)
+        # Not scored: NaN readings and the warm-up after the outage (the first
+        # reading after it is still scored against the old reference)
+        assert np.isnan(scores.z[[5, 700]]).all() and np.isnan(scores.z[1_201:1_220]).all()
+
+    def test_batches_compose(self, cls, rng):
+        x = _ramp(rng)
+        _, epoch_us = _times(np.arange(600.0))
+        whole = cls().update_many(x, epoch_us)
+        split = cls()
+        parts = [
+            split.update_many(x[a:b], epoch_us[a:b]) for a, b in ((0, 97), (97, 102), (102, 600))
+        ]
+        np.testing.assert_allclose(np.concatenate([p.upper for p in parts]), whole.upper, rtol=1e-9)
+        _assert_same_events([e for p in parts for e in p.events], whole.events)
+
+    def test_stale_readings_are_skipped(self, cls, rng):
+        detector = cls()
+        _, epoch_us = _times(np.array([0.0, 1.0, 1.0, 0.5, 2.0]))
+        detector.update_many(rng.normal(size=5), epoch_us)
+        assert detector.reference.weight < 3.0
+        assert detector.update(T0 + timedelta(hours=1), 5.0) == []
+        assert detector.timestamp == T0 + timedelta(hours=2)
+
+    def test_state_round_trip(self, cls, rng):
+        _, epoch_us = _times(np.arange(600.0))
+        detector = cls()
+        detector.update_many(_ramp(rng), epoch_us)
+        restored = cls.from_state(json.loads(json.dumps(detector.state())))
+        assert restored == detector
+
+
+class TestChartBase:
+    def test_missing_override_fails_at_instantiation(self):
+        class Partial(_Chart):
+            def _advance(self, z):
+                return z, -z, 1.0
+
+        with pytest.raises(TypeError, match="abstract"):
+            Partial()
+
+
+class TestCusum:
+    def test_closed_form_matches_recursion(self, rng):
+        x = rng.normal(0.0, 1.0, 1_000)
+        x[600:] += 0.8
+        scores = cusum(x, pd.date_range(T0, periods=1_000, freq="1h"))
+        rows = np.flatnonzero(~np.isnan(scores.z))
+        hi = lo = 0.0
+        for i in rows:
+            hi = max(0.0, hi + scores.z[i] - 0.5)
+            lo = max(0.0, lo - scores.z[i] - 0.5)
+            assert (scores.upper[i], scores.lower[i]) == pytest.approx((hi, lo), abs=1e-9)
+
+    def test_slow_rise_onset_and_magnitude(self, rng):
+        x = _ramp(rng, rise=0.6)
+        (event,) = cusum(x, pd.date_range(T0, periods=600, freq="1h")).events
+        assert event.direction == 1
+        # Found while the rise is still under 1σ, dated back into it
+        hours = (event.detected - T0) / timedelta(hours=1)
+        assert 0.6 * ((hours - 400) / 200) ** 2 < 0.15
+        assert T0 + timedelta(hours=390) <= event.onset < event.detected - timedelta(hours=12)
+        assert event.magnitude == pytest.approx(0.15, abs=0.1)
+
+    def test_step_down_is_signed(self, rng):
+        x = rng.normal(100.0, 2.0, 300)
+        x[200:] -= 6.0
+        (event,) = cusum(x, pd.date_range(T0, periods=300, freq="1h")).events
+        assert event.direction == -1 and event.onset >= T0 + timedelta(hours=195)
+        assert event.magnitude == pytest.approx(-6.0, rel=0.35)
+
+
+class TestEwma:
+    def test_limits_widen_to_asymptote(self, rng):
+        config = DriftConfig(lam=0.2, limit=3.0)
+        scores = ewma_chart(rng.normal(size=300), pd.date_range(T0, periods=300, freq="1h"), config)
+        limit = scores.threshold[~np.isnan(scores.threshold)]
+        assert limit[0] == pytest.approx(3.0 * 0.2)
+        assert limit[-1] == pytest.approx(3.0 * np.sqrt(0.2 / 1.8))
+        assert (np.diff(limit) >= 0).all()
+        np.testing.assert_allclose(scores.lower, -scores.upper)
+
+    def test_lambda_one_is_a_shewhart_chart(self, rng):
+        scores = ewma_chart(
+            rng.normal(size=100), pd.date_range(T0, periods=100, freq="1h"), DriftConfig(lam=1.0)
+        )
+        np.testing.assert_allclose(scores.upper, scores.z)
+
+    def test_slow_rise_is_flagged(self, rng):
+        (event,) = ewma_chart(
+            _ramp(rng, rise=0.6), pd.date_range(T0, periods=600, freq="1h")
+        ).events
+        assert event.direction == 1 and event.magnitude > 0
+        assert T0 + timedelta(hours=400) < event.detected < T0 + timedelta(hours=560)
+
+
+class TestFalseAlarms:
+    @pytest.mark.parametrize("name", list(DETECTORS))
+    def test_rare_on_noise(self, name, rng):
+        n = 24 * 365 * 5
+        times = pd.date_range(T0, periods=n, freq="1h")
+        chart = cusum if name == "cusum" else ewma_chart
+        assert len(chart(rng.normal(size=n), times).events) <= 15
+
+
+class TestAlerts:
+    def test_one_warning_per_event(self, rng):
+        events = cusum(_ramp(rng, rise=0.6), pd.date_range(T0, periods=600, freq="1h")).events
+        (alert,) = drift_alerts("BALL-01", "vibration_mms", events)
+        assert alert.category == "degradation" and alert.severity == "warning"
+        assert alert.timestamp == events[0].detected
+        assert alert.threshold == DRIFT_CONFIG["vibration_mms"].h
+        assert f"desde {events[0].onset:%d/%m %H:%M}" in alert.message and "CUSUM" in alert.message
@@ -0,0 +1,88 @@
+"""
+tests/test_figure_cache.py
+───────────────────────────
+Tests for the version-keyed figure cache and incremental patching.
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Patch, no_update
+
+from src.callbacks.figure_cache import FigureCache, chart_key, figure_update
+
+
+def _frame(n: int, start: str = "2024-06-01") -> pd.DataFrame:
+    ts = pd.date_range(start, periods=n, freq="h", tz="UTC")
+    return pd.DataFrame({"timestamp": ts, "value": [float(i) for i in range(n)]})
+
+
+def _build(df: pd.DataFrame):
+    def build() -> go.Figure:
+        build.calls += 1
+        return go.Figure(go.Scatter(x=df["timestamp"], y=df["value"]))
+
+    build.calls = 0
+    return build
+
+
+class TestFigureCache:
+    def test_reuses_entry(self):
+        cache = FigureCache()
+        build = _build(_frame(3))
+        first = cache.get_or_build(("k", 1), build)
+        assert cache.get_or_build(("k", 1), build) is first
+        assert build.calls == 1
+
+    def test_evicts_least_recent(self):
+        cache = FigureCache(max_entries=2)
+        for v in range(3):
+            cache.get_or_build(("k", v), _build(_frame(1)))
+        assert len(cache) == 2
+
+
+class TestFigureUpdate:
+    def test_first_render_is_full_figure(self):
+        df = _frame(10)
+        fig, state = figure_update({}, "main", "a|x", df, 1, _build(df), {0: df["value"]})
+        assert isinstance(fig, go.Figure)
+        assert state["n"] == 10
+
+    def test_unchanged_data_is_no_update(self):
+        df = _frame(10)
+        _, state = figure_update({}, "main", "a|x", df, 1, _build(df), {0: df["value"]})
+        fig, _ = figure_update({"main": state}, "main", "a|x", df, 1, _build(df), {0: df["value"]})
+        assert fig is no_update
+
+    def test_new_rows_produce_patch(self):
+        old = _frame(10)
+        _, state = figure_update({}, "main", "a|x", old, 1, _build(old), {0: old["value"]})
+        new = _frame(12).tail(10)  # two new points, two slid out of the window
+        patch, new_state = figure_update(
+            {"main": state}, "main", "a|x", new, 2, _build(new), {0: new["value"]}
+        )
+        assert isinstance(patch, Patch)
+        ops = patch.to_plotly_json()["operations"]
+        assert sum(op["operation"] == "Delete" for op in ops) == 4  # 2 x + 2 y
+        extend = [op for op in ops if op["operation"] == "Extend"]
+        assert extend[1]["params"]["value"] == [10.0, 11.0]
+        assert new_state["n"] == 10
+
+    def test_key_change_forces_full_figure(self):
+        df = _frame(10)
+        _, state = figure_update({}, "main", "a|x", df, 1, _build(df), {0: df["value"]})
+        fig, _ = figure_update({"main": state}, "main", "b|x", df, 1, _build(df), {0: df["value"]})
+        assert isinstance(fig, go.Figure)
+
+    def test_slots_sharing_a_key_keep_their_figures(self):
+        df = _frame(10)
+        key = chart_key("SAG-01", "vibration_mms", 24, ["zscore"], 0)
+        figs = {}
+        for slot, name in (("main", "Vibración (mm/s)"), ("zscore", "Z-score")):
+            figs[slot], _ = figure_update(
+                {}, slot, key, df, 7, lambda name=name: go.Figure(go.Scatter(name=name))
+            )
+        names = {slot: [t.name for t in fig.data] for slot, fig in figs.items()}
+        assert names == {"main": ["Vibración (mm/s)"], "zscore": ["Z-score"]}
+
+    def test_chart_key_sorts_options(self):
+        assert chart_key("SAG-01", ["b", "a"]) == chart_key("SAG-01", ["a", "b"])
@@ -0,0 +1,87 @@
+"""
+tests/test_frames.py
+────────────────────
+Tests for the columnar reading ↔ DataFrame converters.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from src.data.frames import from_dataframe, to_dataframe
+from src.data.models import DegradationMode, ReadingRecord, SensorReading
+from src.data.simulator import generate_history
+
+
+@pytest.fixture(scope="module")
+def history():
+    return generate_history(seed=42, days=2)
+
+
+class TestToDataframe:
+    def test_returns_dataframe(self, history):
+        df = to_dataframe(history["SAG-01"])
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 2 * 24
+        assert list(df.columns) == list(SensorReading.model_fields)
+
+    def test_columns_match_readings(self, history):
+        readings = history["SAG-01"] + history["BALL-01"]
+        df = to_dataframe(readings)
+        assert df["vibration_mms"].tolist() == [r.vibration_mms for r in readings]
+        assert df["timestamp"].dt.tz is not None
+        assert df["timestamp"].tolist() == [r.timestamp for r in readings]
+        assert df["equipment_id"].tolist() == [r.equipment_id for r in readings]
+        assert df["degradation_mode"].tolist() == [r.degradation_mode.value for r in readings]
+
+    def test_categorical_columns(self, history):
+        df = to_dataframe(history["BALL-01"])
+        assert isinstance(df["equipment_id"].dtype, pd.CategoricalDtype)
+        assert set(df["degradation_mode"].cat.categories) == {m.value for m in DegradationMode}
+        plain = to_dataframe(history["BALL-01"], categorical=False)
+        assert not isinstance(plain["equipment_id"].dtype, pd.CategoricalDtype)
+        assert plain["degradation_mode"].tolist() == df["degradation_mode"].tolist()
+
+    def test_nullable_columns_become_nan(self, history):
+        df = to_dataframe(history["BALL-01"])
+        assert df["liner_wear_pct"].isna().all()
+
+    def test_float32_storage(self, history):
+        df = to_dataframe(history["SAG-01"], float32=True)
+        assert df["power_kw"].dtype == np.float32
+        assert df["liner_wear_pct"].dtype == np.float32
+
+    def test_accepts_sensor_readings(self, sample_sag_reading):
+        df = to_dataframe([sample_sag_reading])
+        assert df.loc[0, "bearing_temp_c"] == sample_sag_reading.bearing_temp_c
+
+    def test_empty(self):
+        assert to_dataframe([]).empty
+
+
+class TestFromDataframe:
+    def test_round_trip(self, history):
+        readings = history["SAG-01"] + history["BALL-01"]
+        assert from_dataframe(to_dataframe(readings)) == readings
+        assert from_dataframe(to_dataframe(readings, categorical=False)) == readings
+
+    def test_store_shaped_frame(self, history):
+        df = to_dataframe(history["BALL-01"], categorical=False)
+        df.insert(0, "id", np.arange(len(df)))
+        df = df.drop(columns=["seal_condition_pct"])
+        records = from_dataframe(df)
+        assert isinstance(records[0], ReadingRecord)
+        assert records[0].seal_condition_pct is None
+        assert records[0].liner_wear_pct is None
+
+    def test_validate_returns_sensor_readings(self, history):
+        df = to_dataframe(history["SAG-01"][:5])
+        readings = from_dataframe(df, validate=True)
+        assert all(isinstance(r, SensorReading) for r in readings)
+
+    def test_validate_rejects_out_of_range(self, history):
+        df = to_dataframe(history["SAG-01"][:5])
+        df.loc[2, "vibration_mms"] = 99.0
+        with pytest.raises(ValidationError):
+            from_dataframe(df, validate=True)
@@ -4,18 +4,24 @@ tests/test_health_index.py
 Tests for the composite health index calculator.
 """
 
+from datetime import timedelta
+
 import numpy as np
 import pandas as pd
+import pytest
 
-from config.equipment import BALL_THRESHOLDS, SAG_THRESHOLDS
+from config.equipment import BALL_THRESHOLDS, SAG_THRESHOLDS, WeightProfile
 from src.analytics.health_index import (
     _power_score,
     _pressure_score,
     _thermal_score,
     _vibration_score,
     compute_fleet_health,
+    compute_health_batch,
+    compute_health_frame,
     compute_health_summary,
     compute_rul,
+    compute_rul_batch,
 )
 from src.data.models import HealthSummary
 
@@ -143,6 +149,65 @@ class TestComputeHealthSummary:
         assert s1.health_index > s2.health_index
 
 
+class TestComputeHealthBatch:
+    def test_matches_compute_health_summary(self, rng, sample_ball_reading):
+        # Ranges cover every zone, including Zone D and the above-critical tails;
+        # rounded inputs (like the simulator's) produce exact rounding ties
+        n = 2_000
+        vib = rng.uniform(0.0, 13.0, n).round(3)
+        temp = rng.uniform(10.0, 100.0, n).round(2)
+        pres = rng.uniform(0.0, 180.0, n).round(1)
+        power = rng.uniform(0.0, 9_000.0, n).round(0)
+        hi, scores = compute_health_batch("BALL-01", vib, temp, pres, power)
+        for i in range(n):
+            reading = sample_ball_reading.model_copy(
+                update={
+                    "vibration_mms": vib[i],
+                    "bearing_temp_c": temp[i],
+                    "hydraulic_pressure_bar": pres[i],
+                    "power_kw": power[i],
+                }
+            )
+            s = compute_health_summary(reading)
+            assert hi[i] == s.health_index
+            assert tuple(scores[i]) == (
+                s.vibration_score,
+                s.thermal_score,
+                s.pressure_score,
+                s.power_score,
+            )
+
+    def test_custom_profile(self):
+        only_vibration = WeightProfile(version=9, vibration=1.0, thermal=0, pressure=0, power=0)
+        hi, scores = compute_health_batch(
+            "SAG-01", [1.0, 8.0], [60.0, 60.0], [150.0, 150.0], [12_000.0, 12_000.0], only_vibration
+        )
+        np.testing.assert_array_equal(hi, scores[:, 0])
+
+    def test_frame_scores_each_equipment_with_its_tables(self):
+        df = pd.DataFrame(
+            {
+                "equipment_id": ["SAG-01", "BALL-01", "SAG-01"],
+                "vibration_mms": [6.0, 6.0, 1.0],
+                "bearing_temp_c": [70.0, 70.0, 55.0],
+                "hydraulic_pressure_bar": [150.0, 150.0, 150.0],
+                "power_kw": [12_000.0, 4_000.0, 12_000.0],
+            }
+        )
+        hi = compute_health_frame(df)
+        for eq_id in ("SAG-01", "BALL-01"):
+            rows = (df["equipment_id"] == eq_id).to_numpy()
+            part = df[rows]
+            expected, _ = compute_health_batch(eq_id, *(part[c].to_numpy() for c in df.columns[1:]))
+            np.testing.assert_array_equal(hi[rows], expected)
+        assert hi[0] != hi[1]
+        assert compute_health_frame(df.iloc[:0]).shape == (0,)
+
+    def test_profile_weights_must_add_up_to_one(self):
+        with pytest.raises(ValueError):
+            WeightProfile(version=2, vibration=0.5, thermal=0.5, pressure=0.5, power=0.0)
+
+
 class TestComputeRUL:
     def test_stable_trend_returns_none(self):
         hi_series = pd.Series([90.0] * 50)
@@ -171,6 +236,48 @@ class TestComputeRUL:
         rul = compute_rul(hi_series)
         assert rul is None
 
+    def test_window_and_slope_follow_sample_period(self):
+        """48 h of 10-minute readings gives the same RUL as 48 hourly readings."""
+        hourly = 80 - 0.8 * np.arange(48.0)
+        fine = 80 - 0.8 * (47 + (np.arange(288.0) - 287) / 6)
+        period = timedelta(minutes=10)
+        assert compute_rul(pd.Series(fine), sample_period=period) == pytest.approx(
+            compute_rul(pd.Series(hourly)), rel=1e-3
+        )
+        np.testing.assert_allclose(
+            compute_rul_batch(fine, sample_period=period)[-1], compute_rul(pd.Series(hourly))
+        )
+
+
+class TestComputeRULBatch:
+    @staticmethod
+    def _reference(series: np.ndarray, window_hours: int = 48) -> np.ndarray:
+        out = [compute_rul(pd.Series(series[: i + 1]), window_hours) for i in range(len(series))]
+        return np.array([np.nan if r is None else r for r in out])
+
+    def test_matches_compute_rul_every_hour(self, rng):
+        # Noisy degradation that crosses the critical threshold, then repair
+        hi = np.concatenate([np.linspace(95, 10, 300), np.full(60, 97.0)])
+        hi += rng.normal(0, 1.5, hi.size)
+        np.testing.assert_array_equal(compute_rul_batch(hi), self._reference(hi))
+
+    def test_matches_compute_rul_per_series(self, rng):
+        fleet = 90 - np.cumsum(rng.exponential(0.3, (3, 200)), axis=1)
+        fleet[1] = 90.0  # flat series: polyfit noise must stay under the guard
+        batch = compute_rul_batch(fleet, window_hours=24)
+        for row, series in zip(batch, fleet, strict=True):
+            np.testing.assert_array_equal(row, self._reference(series, 24))
+
+    @pytest.mark.parametrize("window_hours", [2, 3, 4])
+    def test_matches_compute_rul_on_short_windows(self, window_hours):
+        hi = np.linspace(90.0, 60.0, 12)
+        batch = compute_rul_batch(hi, window_hours=window_hours)
+        np.testing.assert_array_equal(batch, self._reference(hi, window_hours))
+        assert np.isnan(batch[:3]).all() and not np.isnan(batch[3:]).any()
+
+    def test_short_series_is_all_nan(self):
+        assert np.isnan(compute_rul_batch(np.array([80.0, 75.0, 70.0]))).all()
+
 
 class TestComputeFleetHealth:
     def test_fleet_health_is_minimum(self, now):
@@ -7,7 +7,14 @@ Tests for Pydantic v2 data models.
 import pytest
 from pydantic import ValidationError
 
-from src.data.models import Alert, DegradationMode, HealthSummary, SensorReading
+from src.data.models import (
+    Alert,
+    DegradationMode,
+    HealthSummary,
+    ReadingRecord,
+    SensorReading,
+    validate_readings,
+)
 
 
 class TestSensorReading:
@@ -92,6 +99,45 @@ class TestAlert:
         assert not alert.acknowledged
 
 
+class TestReadingRecord:
+    def test_same_fields_as_sensor_reading(self, sample_sag_reading):
+        record = ReadingRecord(**sample_sag_reading.model_dump())
+        assert record.to_model() == sample_sag_reading
+
+    def test_from_row_maps_nan_to_none(self, now):
+        row = {
+            "vibration_mms": 1.1,
+            "bearing_temp_c": 53.0,
+            "hydraulic_pressure_bar": 109.0,
+            "power_kw": 6_100.0,
+            "load_pct": 43.0,
+            "liner_wear_pct": float("nan"),
+            "throughput_tph": 1_760.0,
+            "degradation_mode": "bearing",
+            "health_index": 71.5,
+        }
+        record = ReadingRecord.from_row(row, "BALL-01", now)
+        assert record.liner_wear_pct is None and record.seal_condition_pct is None
+        assert record.degradation_mode == DegradationMode.BEARING
+        assert record.health_index == 71.5
+
+    def test_to_model_validates(self, now):
+        record = ReadingRecord(now, "SAG-01", 99.0, 60.0, 150.0, 12_000.0, 40.0)
+        with pytest.raises(ValidationError):
+            record.to_model()
+
+
+class TestValidateReadings:
+    def test_validates_dicts_and_records(self, sample_sag_reading, sample_ball_reading):
+        batch = [sample_sag_reading.model_dump(), ReadingRecord(**sample_ball_reading.model_dump())]
+        assert validate_readings(batch) == [sample_sag_reading, sample_ball_reading]
+
+    def test_rejects_out_of_range_values(self, sample_sag_reading):
+        bad = sample_sag_reading.model_dump() | {"bearing_temp_c": -5.0}
+        with pytest.raises(ValidationError):
+            validate_readings([sample_sag_reading.model_dump(), bad])
+
+
 class TestHealthSummary:
     def test_health_summary_valid(self, now):
         summary = HealthSummary(
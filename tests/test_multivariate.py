@@ -0,0 +1,183 @@
+"""
+tests/test_multivariate.py
+──────────────────────────
+Tests for the streaming / batch Mahalanobis detector.
+"""
+
+import math
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.multivariate import (
+    ALERT_D2,
+    CLEAR_D2,
+    MIN_WEIGHT,
+    VARIABLES,
+    MahalanobisTracker,
+    alert_onsets,
+    chi2_isf,
+    chi2_sf,
+    mahalanobis_frame,
+    onset_alerts,
+)
+
+T0 = datetime(2024, 6, 1, tzinfo=UTC)
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Vibration and bearing temperature strongly correlated, as on a real bearing
+_MIX = np.array(
+    [
+        [0.3, 0.0, 0.0, 0.0],
+        [1.8, 0.8, 0.0, 0.0],
+        [0.0, 0.0, 3.0, 0.0],
+        [60.0, 0.0, 0.0, 150.0],
+    ]
+)
+_LEVEL = np.array([3.0, 60.0, 150.0, 12_000.0])
+
+
+def _sensors(rng, n: int) -> np.ndarray:
+    return rng.standard_normal((n, 4)) @ _MIX.T + _LEVEL
+
+
+def _times(hours: np.ndarray) -> tuple[list[datetime], np.ndarray]:
+    stamps = [T0 + timedelta(hours=float(h)) for h in hours]
+    return stamps, np.array([(s - _EPOCH) // timedelta(microseconds=1) for s in stamps])
+
+
+def _stream(x, stamps) -> tuple[MahalanobisTracker, np.ndarray]:
+    tracker = MahalanobisTracker.start(x[0], stamps[0])
+    return tracker, np.array([tracker.update(x[i], stamps[i]) for i in range(1, len(x))])
+
+
+class TestChiSquare:
+    @pytest.mark.parametrize(
+        "x, dof, expected",
+        [
+            (3.841459, 1, 0.05),
+            (5.991465, 2, 0.05),
+            (7.814728, 3, 0.05),
+            (13.276704, 4, 0.01),
+            (20.515006, 5, 0.001),
+        ],
+    )
+    def test_tail_matches_tables(self, x, dof, expected):
+        assert chi2_sf(x, dof) == pytest.approx(expected, rel=1e-5)
+
+    def test_isf_inverts_sf(self):
+        for dof in (1, 4, 7):
+            assert chi2_sf(chi2_isf(1e-4, dof), dof) == pytest.approx(1e-4, rel=1e-9)
+        assert chi2_sf(0.0, 4) == 1.0
+
+
+class TestTracker:
+    def test_batch_matches_streaming(self, rng):
+        n = 1_500
+        hours = np.cumsum(rng.choice([0.25, 0.5, 1.0, 2.0], size=n))
+        hours[900:] += 24 * 5.0  # an outage long enough to need a new warm-up
+        x = _sensors(rng, n)
+        stamps, epoch_us = _times(hours)
+
+        streamed, scores = _stream(x, stamps)
+        batched = MahalanobisTracker.start(x[0], stamps[0])
+        result = batched.update_many(x[1:], epoch_us[1:])
+
+        np.testing.assert_array_equal(np.isnan(result.d2), np.isnan(scores))
+        np.testing.assert_allclose(result.d2, scores, rtol=1e-7)
+        np.testing.assert_allclose(batched.mean, streamed.mean, rtol=1e-12)
+        np.testing.assert_allclose(batched.scatter, streamed.scatter, rtol=1e-9, atol=1e-9)
+        assert batched.weight == pytest.approx(streamed.weight, rel=1e-12)
+        assert (batched.n, batched.timestamp) == (streamed.n, streamed.timestamp)
+        # The first reading after the outage is scored against the old state,
+        # the next ones wait until the state is rebuilt
+        assert not np.isnan(scores[899]) and np.isnan(scores[900:920]).all()
+
+    def test_batches_compose(self, rng):
+        x = _sensors(rng, 600)
+        _, epoch_us = _times(np.arange(600.0))
+        one = MahalanobisTracker.start(x[0], T0)
+        whole = one.update_many(x[1:], epoch_us[1:]).d2
+        split = MahalanobisTracker.start(x[0], T0)
+        parts = [
+            split.update_many(x[a:b], epoch_us[a:b]).d2 for a, b in ((1, 97), (97, 102), (102, 600))
+        ]
+        np.testing.assert_allclose(np.concatenate(parts), whole, rtol=1e-9)
+        np.testing.assert_allclose(split.scatter, one.scatter, rtol=1e-9)
+
+    def test_stale_readings_are_skipped(self, rng):
+        x = _sensors(rng, 4)
+        tracker = MahalanobisTracker.start(x[0], T0)
+        assert math.isnan(tracker.update(x[1], T0))
+        _, epoch_us = _times(np.array([1.0, 1.0, 0.5]))
+        assert np.isnan(tracker.update_many(x[1:], epoch_us).d2).all()
+        assert tracker.n == 2 and tracker.timestamp == T0 + timedelta(hours=1)
+
+    def test_warm_up_by_weight(self, rng):
+        x = _sensors(rng, 200)
+        tracker, scores = _stream(x, [T0 + timedelta(hours=i) for i in range(200)])
+        first = int(np.flatnonzero(~np.isnan(scores))[0])
+        assert first + 1 >= MIN_WEIGHT
+        assert not np.isnan(scores[first:]).any()
+
+    def test_normal_data_is_chi_square(self, rng):
+        x = _sensors(rng, 20_000)
+        _, epoch_us = _times(np.arange(20_000.0))
+        d2 = MahalanobisTracker.start(x[0], T0).update_many(x[1:], epoch_us[1:]).d2
+        d2 = d2[~np.isnan(d2)]
+        # A finite forgetting window inflates D² slightly above its dof
+        assert len(VARIABLES) < d2.mean() < 1.2 * len(VARIABLES)
+        assert (d2 > ALERT_D2).mean() < 2e-3
+
+    def test_joint_shift_no_single_variable_flags(self, rng):
+        x = _sensors(rng, 400)
+        tracker = MahalanobisTracker.start(x[0], T0)
+        _, epoch_us = _times(np.arange(400.0))
+        tracker.update_many(x[1:], epoch_us[1:])
+        std = np.sqrt(np.diag(tracker.covariance))
+        # Vibration up and temperature down by 2σ each: against their correlation
+        reading = tracker.mean + np.array([2.0, -2.0, 0.0, 0.0]) * std
+        _, stamp = _times(np.array([400.0]))
+        scores = tracker.update_many(reading[None], stamp)
+        assert scores.d2[0] > ALERT_D2
+        assert scores.contributions[0].sum() == pytest.approx(scores.d2[0])
+        assert set(np.argsort(scores.contributions[0])[-2:]) == {0, 1}
+
+
+class TestAlerts:
+    def test_onsets_with_hysteresis(self):
+        high, mid, low = ALERT_D2 + 1, (ALERT_D2 + CLEAR_D2) / 2, CLEAR_D2 - 1
+        d2 = np.array([np.nan, high, high, mid, high, low, mid, high, np.nan, high])
+        onsets, open_ = alert_onsets(d2)
+        assert onsets.tolist() == [1, 7]
+        assert open_
+        onsets, open_ = alert_onsets(d2[:3], in_alert=True)
+        assert onsets.tolist() == [] and open_
+
+    def test_alert_names_top_variables(self, rng):
+        x = _sensors(rng, 300)
+        _, epoch_us = _times(np.arange(300.0))
+        tracker = MahalanobisTracker.start(x[0], T0)
+        tracker.update_many(x[1:-1], epoch_us[1:-1])
+        reading = tracker.mean + np.array([0.0, 0.0, 8.0, 0.0]) * np.sqrt(
+            np.diag(tracker.covariance)
+        )
+        scores = tracker.update_many(reading[None], epoch_us[-1:])
+        (alert,) = onset_alerts("SAG-01", epoch_us[-1:], scores, np.array([0]))
+        assert alert.category == "multivariate" and alert.severity == "critical"
+        assert alert.timestamp == T0 + timedelta(hours=299)
+        assert "hydraulic_pressure_bar" in alert.message.split("aporte:")[1].split(",")[0]
+
+
+class TestMahalanobisFrame:
+    def test_aligned_distance(self, rng):
+        n = 120
+        df = pd.DataFrame(_sensors(rng, n), columns=list(VARIABLES))
+        df.insert(0, "timestamp", pd.date_range(T0, periods=n, freq="1h"))
+        df.index = df.index + 10
+        dist = mahalanobis_frame(df)
+        assert dist.index.equals(df.index)
+        assert dist.iloc[:40].isna().all() and dist.iloc[-20:].notna().all()
+        assert mahalanobis_frame(df.iloc[:0]).empty
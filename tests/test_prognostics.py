@@ -0,0 +1,62 @@
+"""
+tests/test_prognostics.py
+──────────────────────────
+Tests for the Monte-Carlo probabilistic RUL engine.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from src.analytics.prognostics import forecast_rul
+from src.data.models import DegradationMode
+
+_TAU = np.linspace(0.0, 1.0, 168)
+
+
+class TestForecastRUL:
+    def test_percentiles_are_ordered(self, rng):
+        hi = 90 - 25 * _TAU + rng.normal(0, 1.0, _TAU.size)
+        fc = forecast_rul(hi, DegradationMode.NORMAL)
+        assert fc is not None
+        assert 0 < fc.p10_days <= fc.p50_days <= fc.p90_days
+
+    def test_linear_drift_matches_extrapolation(self, rng):
+        # 25 HI points per week from 90 → 65: ~13.4 more days to reach 20
+        hi = 90 - 25 * _TAU + rng.normal(0, 0.5, _TAU.size)
+        fc = forecast_rul(hi, "normal")
+        assert 12.0 < fc.p50_days < 15.0
+
+    def test_bearing_curve_forecasts_earlier_than_linear(self, rng):
+        hi = 95 - 40 * _TAU**1.8 + rng.normal(0, 0.5, _TAU.size)
+        bearing = forecast_rul(hi, DegradationMode.BEARING)
+        linear = forecast_rul(hi, DegradationMode.NORMAL)
+        assert bearing.p50_days < linear.p50_days
+
+    def test_auto_mode_picks_curved_model(self, rng):
+        hi = 95 - 40 * _TAU**1.8 + rng.normal(0, 0.3, _TAU.size)
+        assert forecast_rul(hi).mode != DegradationMode.NORMAL
+
+    def test_flat_series_is_beyond_horizon(self):
+        fc = forecast_rul(np.full(168, 90.0), "normal")
+        assert fc.p50_days is None
+
+    def test_already_critical_is_zero(self):
+        fc = forecast_rul(np.linspace(40, 15, 48), "normal")
+        assert fc.p10_days == fc.p90_days == 0.0
+
+    def test_band_shape_and_order(self, rng):
+        hi = 90 - 25 * _TAU + rng.normal(0, 1.0, _TAU.size)
+        fc = forecast_rul(hi, "liner", band_hours=24)
+        assert fc.band_hours.shape == fc.band_p50.shape == (24,)
+        assert (fc.band_p10 <= fc.band_p50).all() and (fc.band_p50 <= fc.band_p90).all()
+
+    def test_too_few_points_returns_none(self):
+        assert forecast_rul(np.array([80.0, 79.0, 78.0])) is None
+
+    def test_sub_hourly_series_forecasts_in_days(self, rng):
+        # The same week of drift sampled every 10 minutes: same days to failure
+        tau = np.linspace(0.0, 1.0, 168 * 6)
+        hi = 90 - 25 * tau + rng.normal(0, 0.5, tau.size)
+        fc = forecast_rul(hi, "normal", sample_period=timedelta(minutes=10))
+        assert 12.0 < fc.p50_days < 15.0
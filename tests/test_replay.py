@@ -0,0 +1,120 @@
+"""
+tests/test_replay.py
+────────────────────
+Tests for the accelerated replay clock and stream.
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from src.data.replay import ReplayClock, replay
+from src.data.simulator import iter_history
+
+
+class FakeTime:
+    """monotonic()/sleep() pair where sleeping only advances the counter."""
+
+    def __init__(self) -> None:
+        self.t = 100.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.t
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.t += seconds
+
+
+class TestReplayClock:
+    def test_scenario_time_runs_at_speed(self, now):
+        fake = FakeTime()
+        clock = ReplayClock(now, 1000.0, monotonic=fake.monotonic, sleep=fake.sleep)
+        fake.t += 3.6
+        assert clock.now() == now + timedelta(hours=1)
+
+    def test_sleep_until_waits_or_reports_lag(self, now):
+        fake = FakeTime()
+        clock = ReplayClock(now, 1000.0, monotonic=fake.monotonic, sleep=fake.sleep)
+        assert clock.sleep_until(now + timedelta(seconds=500)) == 0.0
+        assert fake.slept == [pytest.approx(0.5)]
+        fake.t += 2.0  # ingest took two wall seconds
+        assert clock.sleep_until(now + timedelta(seconds=1000)) == pytest.approx(1.5)
+
+    def test_rejects_non_positive_speed(self, now):
+        with pytest.raises(ValueError):
+            ReplayClock(now, 0.0)
+
+
+class TestReplay:
+    def test_streams_everything_in_paced_batches(self):
+        fake = FakeTime()
+        readings = list(iter_history(seed=1, days=2, sample_period=timedelta(minutes=10)))
+        batches: list[list] = []
+        clock = ReplayClock(
+            readings[0].timestamp, 3600.0, monotonic=fake.monotonic, sleep=fake.sleep
+        )
+        stats = replay(readings, tick_s=1.0, ingest=batches.append, clock=clock)
+
+        assert [r for batch in batches for r in batch] == readings
+        # One scenario hour per wall second: 6 readings of each mill per batch
+        assert stats.batches == len(batches) == 48
+        assert {len(batch) for batch in batches} == {12}
+        assert stats.readings == 576
+        assert stats.wall_s == pytest.approx(48.0)
+        assert stats.speedup == pytest.approx(3600.0)
+        assert stats.max_lag_s == 0.0
+
+    def test_batches_are_not_ingested_before_their_time(self):
+        fake = FakeTime()
+        readings = list(iter_history(seed=1, days=1, sample_period=timedelta(minutes=1)))
+        clock = ReplayClock(
+            readings[0].timestamp, 600.0, monotonic=fake.monotonic, sleep=fake.sleep
+        )
+
+        def ingest(batch):
+            assert max(r.timestamp for r in batch) < clock.now()
+
+        replay(readings, tick_s=0.5, ingest=ingest, clock=clock)
+
+    def test_slow_ingest_shows_up_as_lag(self, now):
+        fake = FakeTime()
+        readings = list(iter_history(seed=1, days=1))
+        clock = ReplayClock(
+            readings[0].timestamp, 3600.0, monotonic=fake.monotonic, sleep=fake.sleep
+        )
+
+        def slow(batch):
+            fake.t += 2.0
+
+        stats = replay(readings, tick_s=1.0, ingest=slow, clock=clock)
+        assert stats.max_lag_s == pytest.approx(23 * 1.0)
+
+    def test_into_the_store(self):
+        from src.data import store
+
+        store.initialize_db()
+        readings = list(iter_history(seed=3, days=1, sample_period=timedelta(minutes=30)))
+        stats = replay(readings, 1e9)
+        assert stats.readings == 96
+        latest = store.get_latest("BALL-01")
+        assert latest["timestamp"] == readings[-1].timestamp.isoformat()
+
+    def test_replayed_readings_are_scored(self):
+        from src.analytics.health_index import compute_health_summary
+        from src.data import store
+
+        store.initialize_db()
+        readings = list(iter_history(seed=4, days=1, sample_period=timedelta(minutes=30)))
+        replay(readings, 1e9)
+        for record in readings[-2:]:
+            latest = store.get_latest(record.equipment_id)
+            assert record.health_index == 100.0  # the model default, not a score
+            assert latest["health_index"] == pytest.approx(
+                compute_health_summary(record).health_index, abs=0.01
+            )
+            assert latest["weights_version"] is not None
+
+    def test_empty_stream(self):
+        assert replay([]).readings == 0
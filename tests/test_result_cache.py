@@ -0,0 +1,61 @@
+"""
+tests/test_result_cache.py
+───────────────────────────
+Tests for the cross-process, version-keyed result cache.
+"""
+
+import pandas as pd
+
+from src.data.result_cache import ResultCache
+
+
+def _counter(value):
+    def compute():
+        compute.calls += 1
+        return value
+
+    compute.calls = 0
+    return compute
+
+
+class TestResultCache:
+    def test_hit_at_same_version(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "r.cache"))
+        compute = _counter({"a": 1})
+        cache.get_or_compute("k", 1, compute)
+        assert cache.get_or_compute("k", 1, compute) == {"a": 1}
+        assert compute.calls == 1
+
+    def test_none_results_are_cached(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "r.cache"))
+        compute = _counter(None)
+        cache.get_or_compute("k", 1, compute)
+        assert cache.get_or_compute("k", 1, compute) is None
+        assert compute.calls == 1
+
+    def test_new_version_is_a_miss(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "r.cache"))
+        cache.put("k", 1, "old")
+        assert cache.get("k", 2) is None
+        assert cache.get_or_compute("k", 2, _counter("new")) == "new"
+
+    def test_shared_between_instances(self, tmp_path):
+        # Two instances on one file behave like two worker processes
+        path = str(tmp_path / "r.cache")
+        df = pd.DataFrame({"x": [1.0, 2.0]})
+        ResultCache(path).put("frame", 3, df)
+        pd.testing.assert_frame_equal(ResultCache(path).get("frame", 3), df)
+
+    def test_prunes_oldest_entries(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "r.cache"), max_entries=8)
+        for i in range(64):
+            cache.put(f"k{i}", 1, i)
+        assert cache.get("k63", 1) == 63
+        assert cache.get("k0", 1) is None
+
+    def test_disabled_calls_through(self):
+        cache = ResultCache(None)
+        compute = _counter(5)
+        cache.get_or_compute("k", 1, compute)
+        cache.get_or_compute("k", 1, compute)
+        assert compute.calls == 2
@@ -0,0 +1,170 @@
+"""
+tests/test_rolling.py
+─────────────────────
+Tests for time-indexed rolling statistics (batch and streaming).
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics import rolling
+from src.analytics.rolling import (
+    MadWindow,
+    MedianWindow,
+    TimeWindow,
+    rolling_mean_std,
+    rolling_median,
+    rolling_median_mad,
+)
+
+SPAN = timedelta(hours=6)
+
+
+def _irregular(rng, n: int = 400) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """Jittered timestamps with bursts, duplicates, a long gap and NaNs."""
+    steps = rng.exponential(20.0, n)
+    steps[rng.random(n) < 0.1] = 0.0  # duplicate timestamps
+    steps[n // 2] = 60 * 24.0  # a day without readings
+    times = pd.Timestamp("2024-06-01", tz="UTC") + pd.to_timedelta(np.cumsum(steps), unit="min")
+    values = rng.normal(50.0, 5.0, n)
+    values[rng.random(n) < 0.03] = np.nan
+    return times, values
+
+
+def _reference(times, values, span, min_periods=1):
+    """Brute force: rows up to i (stable time order) within (t_i − span, t_i]."""
+    order = np.argsort(times.asi8, kind="stable")
+    t, x = times[order], values[order]
+    mean, std = np.full(x.size, np.nan), np.full(x.size, np.nan)
+    for i in range(x.size):
+        window = x[: i + 1][t[: i + 1] > t[i] - span]
+        window = window[~np.isnan(window)]
+        if window.size >= min_periods:
+            mean[i] = window.mean()
+            std[i] = window.std(ddof=1) if window.size > 1 else np.nan
+    out_mean, out_std = np.empty_like(mean), np.empty_like(std)
+    out_mean[order], out_std[order] = mean, std
+    return out_mean, out_std
+
+
+class TestRollingMeanStd:
+    def test_regular_series_matches_row_window(self, rng):
+        times = pd.date_range("2024-06-01", periods=200, freq="1h", tz="UTC")
+        s = pd.Series(rng.normal(size=200))
+        mean, std = rolling_mean_std(s, times, "24h", min_periods=4)
+        pd.testing.assert_series_equal(mean, s.rolling(24, min_periods=4).mean(), rtol=1e-9)
+        pd.testing.assert_series_equal(std, s.rolling(24, min_periods=4).std(), rtol=1e-9)
+
+    def test_irregular_duplicates_and_gaps(self, rng):
+        times, values = _irregular(rng)
+        mean, std = rolling_mean_std(values, times, SPAN, min_periods=3)
+        ref_mean, ref_std = _reference(times, values, SPAN, min_periods=3)
+        np.testing.assert_allclose(mean, ref_mean, rtol=1e-9)
+        np.testing.assert_allclose(std, ref_std, rtol=1e-7)
+
+    def test_unsorted_input_keeps_caller_order(self, rng):
+        times, values = _irregular(rng)
+        shuffle = rng.permutation(values.size)
+        s = pd.Series(values[shuffle], index=pd.RangeIndex(values.size) + 100)
+        mean, _ = rolling_mean_std(s, times[shuffle], SPAN)
+        assert mean.index.equals(s.index)
+        # Ties are ordered by row, so compare against the reference on the same rows
+        np.testing.assert_allclose(mean, _reference(times[shuffle], values[shuffle], SPAN)[0])
+
+
+class TestTimeWindow:
+    def test_matches_batch_and_tracks_extremes(self, rng):
+        times, values = _irregular(rng)
+        mean, std = rolling_mean_std(values, times, SPAN)
+        window = TimeWindow(SPAN)
+        for i, (ts, x) in enumerate(zip(times, values, strict=True)):
+            stats = window.push(ts.to_pydatetime(), x)
+            assert stats.mean == pytest.approx(mean[i], rel=1e-9, nan_ok=True)
+            assert stats.std == pytest.approx(std[i], rel=1e-6, nan_ok=True)
+            inside = values[: i + 1][times[: i + 1] > ts - SPAN]
+            inside = inside[~np.isnan(inside)]
+            assert stats.count == inside.size
+            assert (stats.min, stats.max) == (inside.min(), inside.max())
+
+    def test_empties_after_a_gap(self, now):
+        window = TimeWindow("1h")
+        window.push(now, 1.0)
+        stats = window.push(now + timedelta(hours=2), float("nan"))
+        assert stats.count == 0 and np.isnan(stats.mean)
+        assert window.push(now + timedelta(hours=2), 3.0).mean == 3.0
+
+    def test_rejects_readings_back_in_time(self, now):
+        window = TimeWindow("1h")
+        window.push(now, 1.0)
+        with pytest.raises(ValueError):
+            window.push(now - timedelta(seconds=1), 2.0)
+
+
+class TestMedianWindow:
+    def test_matches_batch_median(self, rng):
+        times, values = _irregular(rng)
+        values = np.round(values)  # plenty of equal values for the lazy deletes
+        batch = rolling_median(values, times, SPAN)
+        window = MedianWindow(SPAN)
+        for i, (ts, x) in enumerate(zip(times, values, strict=True)):
+            assert window.push(ts.to_pydatetime(), x) == pytest.approx(batch[i], nan_ok=True)
+            inside = values[: i + 1][times[: i + 1] > ts - SPAN]
+            assert len(window) == np.count_nonzero(~np.isnan(inside))
+
+    def test_batch_median_on_unsorted_times(self, rng):
+        times, values = _irregular(rng)
+        times, first = np.unique(times, return_index=True)  # ties would depend on row order
+        values = values[first]
+        shuffle = rng.permutation(values.size)
+        shuffled = rolling_median(values[shuffle], times[shuffle], SPAN)
+        np.testing.assert_array_equal(
+            shuffled.to_numpy()[np.argsort(shuffle)], rolling_median(values, times, SPAN)
+        )
+
+
+def _median_mad_reference(times, values, span):
+    """Brute force: each window's median and median |x − that median|."""
+    median, mad = np.full(values.size, np.nan), np.full(values.size, np.nan)
+    for i in range(values.size):
+        window = values[: i + 1][times[: i + 1] > times[i] - span]
+        window = window[~np.isnan(window)]
+        if window.size:
+            median[i] = np.median(window)
+            mad[i] = np.median(np.abs(window - median[i]))
+    return median, mad
+
+
+class TestMedianMad:
+    @pytest.mark.parametrize("widest_sorted", [rolling._SORTED_WINDOW_MAX, 0])
+    def test_matches_brute_force(self, rng, monkeypatch, widest_sorted):
+        monkeypatch.setattr(rolling, "_SORTED_WINDOW_MAX", widest_sorted)  # 0: sorted-list kernel
+        times, values = _irregular(rng)
+        values = np.round(values)  # ties around the median
+        median, mad = rolling_median_mad(values, times, SPAN)
+        expected = _median_mad_reference(times, values, SPAN)
+        np.testing.assert_allclose(median, expected[0])
+        np.testing.assert_allclose(mad, expected[1])
+
+    def test_row_windows(self, rng):
+        values = rng.normal(size=200)
+        values[::17] = np.nan
+        median, mad = rolling_median_mad(values, None, 5, min_periods=3)
+        for i in range(values.size):
+            window = values[max(0, i - 4) : i + 1]
+            window = window[~np.isnan(window)]
+            if window.size < 3:
+                assert np.isnan(median[i]) and np.isnan(mad[i])
+            else:
+                assert mad[i] == pytest.approx(np.median(np.abs(window - np.median(window))))
+
+    def test_streaming_matches_batch(self, rng):
+        times, values = _irregular(rng)
+        median, mad = rolling_median_mad(values, times, SPAN)
+        window = MadWindow(SPAN)
+        for i, (ts, x) in enumerate(zip(times, values, strict=True)):
+            assert window.push(ts.to_pydatetime(), x) == pytest.approx(
+                (median[i], mad[i]), nan_ok=True
+            )
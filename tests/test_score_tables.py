@@ -0,0 +1,90 @@
+"""
+tests/test_score_tables.py
+───────────────────────────
+Tests for the compiled piecewise-linear sub-index scoring tables.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from config.equipment import BALL_THRESHOLDS, SAG_THRESHOLDS
+from src.analytics.score_tables import PiecewiseLinear, compile_thresholds
+
+_SUB_INDICES = ("vibration", "thermal", "pressure", "power")
+
+
+def _probe_points(table: PiecewiseLinear, rng, lo: float, hi: float) -> np.ndarray:
+    """Random values (some rounded, as sensors report them) plus every breakpoint ± 1 ulp."""
+    bp = table.breakpoints
+    return np.concatenate(
+        [
+            rng.uniform(lo, hi, 5_000),
+            rng.uniform(lo, hi, 5_000).round(2),
+            bp,
+            np.nextafter(bp, np.inf),
+            np.nextafter(bp, -np.inf),
+        ]
+    )
+
+
+class TestPiecewiseLinear:
+    @pytest.mark.parametrize("thr", [SAG_THRESHOLDS, BALL_THRESHOLDS])
+    @pytest.mark.parametrize(
+        ("name", "hi"), [("vibration", 40.0), ("thermal", 150.0), ("pressure", 300.0)]
+    )
+    def test_scalar_and_batch_agree_bit_for_bit(self, rng, thr, name, hi):
+        table = getattr(compile_thresholds(thr), name)
+        x = _probe_points(table, rng, 0.0, hi)
+        assert table.scores(x).tolist() == [table.score(v) for v in x.tolist()]
+
+    def test_power_scalar_and_batch_agree(self, rng):
+        table = compile_thresholds(SAG_THRESHOLDS).power
+        x = _probe_points(table, rng, 0.0, 25_000.0)
+        assert table.scores(x).tolist() == [table.score(v) for v in x.tolist()]
+
+    def test_scores_stay_in_range(self, rng):
+        tables = compile_thresholds(BALL_THRESHOLDS)
+        for name in _SUB_INDICES:
+            s = getattr(tables, name).scores(rng.uniform(0.0, 25_000.0, 1_000))
+            assert ((s >= 0.0) & (s <= 100.0)).all()
+
+    def test_breakpoints_must_increase(self):
+        with pytest.raises(ValueError):
+            PiecewiseLinear([2.0, 1.0], [(0.0, 1.0, 1.0, 0.0)] * 3)
+
+
+class TestCompiledTails:
+    def test_zone_d_reaches_zero_at_twice_zone_c(self):
+        vib = compile_thresholds(SAG_THRESHOLDS).vibration
+        zc = SAG_THRESHOLDS.vibration.zone_c
+        assert vib.score(zc) == 30.0
+        assert vib.score(1.5 * zc) == pytest.approx(15.0)
+        assert vib.score(2 * zc) == vib.score(10 * zc) == 0.0
+
+    def test_above_critical_temperature_tail(self):
+        thermal = compile_thresholds(SAG_THRESHOLDS).thermal
+        crit = SAG_THRESHOLDS.bearing_temp_c["critical"]
+        assert thermal.score(crit) == 10.0
+        assert thermal.score(crit + 2.5) == pytest.approx(5.0)
+        assert thermal.score(crit + 30.0) == 0.0
+        assert thermal.score(5.0) == 100.0  # flat below the 20 °C baseline
+
+    def test_pressure_drops_to_zero_just_above_critical_high(self):
+        pressure = compile_thresholds(SAG_THRESHOLDS).pressure
+        crit_high = SAG_THRESHOLDS.hydraulic_pressure_bar["critical_high"]
+        assert pressure.score(crit_high) == 30.0
+        assert pressure.score(math.nextafter(crit_high, math.inf)) == 0.0
+
+    def test_power_steps_up_to_full_score_at_min(self):
+        power = compile_thresholds(SAG_THRESHOLDS).power
+        p_min = SAG_THRESHOLDS.power_kw["min"]
+        assert power.score(math.nextafter(p_min, 0.0)) == pytest.approx(80.0)
+        assert power.score(p_min) == 100.0
+
+
+class TestCompileThresholds:
+    def test_compiled_once_per_thresholds(self):
+        assert compile_thresholds(SAG_THRESHOLDS) is compile_thresholds(SAG_THRESHOLDS)
+        assert compile_thresholds(SAG_THRESHOLDS) is not compile_thresholds(BALL_THRESHOLDS)
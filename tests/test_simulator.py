@@ -4,12 +4,15 @@ tests/test_simulator.py
 Tests for the synthetic data simulator.
 """
 
+from datetime import timedelta
+
 from src.data.models import DegradationMode
 from src.data.simulator import (
     _degradation_progress,
     derive_alerts,
     generate_history,
     generate_realtime_reading,
+    iter_history,
     to_dataframe,
 )
 
@@ -79,6 +82,36 @@ class TestGenerateHistory:
         assert len(modes) > 1
 
 
+class TestSamplePeriod:
+    def test_sub_hourly_count_and_spacing(self):
+        history = generate_history(seed=42, days=1, sample_period=timedelta(minutes=10))
+        stamps = [r.timestamp for r in history["SAG-01"]]
+        assert len(stamps) == 144
+        assert {b - a for a, b in zip(stamps, stamps[1:], strict=False)} == {timedelta(minutes=10)}
+        assert stamps[-1].minute % 10 == 0 and stamps[-1].second == 0
+
+    def test_hourly_period_is_the_default(self):
+        h1 = generate_history(seed=7, days=3)
+        h2 = generate_history(seed=7, days=3, sample_period=timedelta(hours=1))
+        assert h1 == h2
+
+    def test_events_keep_their_time_span(self):
+        """The same seed degrades over the same hours at any period."""
+        hourly = generate_history(seed=42, days=30)["SAG-01"]
+        fine = generate_history(seed=42, days=30, sample_period=timedelta(minutes=15))["SAG-01"]
+        assert len(fine) == 4 * len(hourly)
+        assert [r.degradation_mode for r in fine[::4]] == [r.degradation_mode for r in hourly]
+
+    def test_iter_history_is_time_ordered_and_matches_events(self):
+        stream = list(iter_history(seed=42, days=30))
+        assert [r.equipment_id for r in stream[:4]] == ["SAG-01", "BALL-01"] * 2
+        stamps = [r.timestamp for r in stream]
+        assert stamps == sorted(stamps)
+        history = generate_history(seed=42, days=30)
+        sag = [r for r in stream if r.equipment_id == "SAG-01"]
+        assert [r.degradation_mode for r in sag] == [r.degradation_mode for r in history["SAG-01"]]
+
+
 class TestDeriveAlerts:
     def test_no_alerts_for_healthy_readings(self):
         history = generate_history(seed=42, days=3)
@@ -0,0 +1,108 @@
+"""
+tests/test_spectral.py
+──────────────────────
+Tests for the batched vibration spectral features.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.equipment import BALL_DRIVE, SAG_DRIVE
+from src.analytics.anomaly import get_anomaly_periods
+from src.analytics.health_index import compute_health_batch, compute_health_summary
+from src.analytics.spectral import (
+    spectral_features,
+    spectral_frame,
+    summarize,
+)
+from src.data.models import DegradationMode
+from src.data.simulator import generate_waveform
+from src.data.waveforms import WaveformStore
+
+FS = 10_000.0
+
+
+def _tone(freq_hz: float, rms: float, seconds: float = 4.0) -> np.ndarray:
+    t = np.arange(int(seconds * FS)) / FS
+    return rms * np.sqrt(2) * np.sin(2 * np.pi * freq_hz * t + 0.3)
+
+
+class TestSpectralFeatures:
+    def test_order_bands_measure_tone_rms(self):
+        x = _tone(SAG_DRIVE.shaft_hz, 2.0) + _tone(2 * SAG_DRIVE.shaft_hz, 0.5)
+        f = spectral_features(x, FS, SAG_DRIVE)
+        assert f.rms.shape == (4, 1)
+        np.testing.assert_allclose(f.order_1x, 2.0, rtol=1e-3)
+        np.testing.assert_allclose(f.order_2x, 0.5, rtol=1e-3)
+        np.testing.assert_allclose(f.rms, np.sqrt(2.0**2 + 0.5**2), rtol=1e-3)
+
+    def test_channels_and_partial_window(self, rng):
+        x = np.column_stack([rng.normal(size=25_500), 2 * rng.normal(size=25_500)])
+        f = spectral_features(x.astype(np.float32), FS, BALL_DRIVE)
+        assert f.rms.shape == (2, 2)
+        assert (f.rms[:, 1] > f.rms[:, 0]).all()
+
+    def test_healthy_bearing_ratio_near_one(self, rng):
+        f = spectral_features(rng.normal(size=int(60 * FS)), FS, SAG_DRIVE)
+        assert 0.7 < np.median(f.bearing_ratio) < 1.5
+
+    def test_windows_too_short_for_the_bands(self):
+        with pytest.raises(ValueError):
+            spectral_features(np.zeros(1_000), FS, SAG_DRIVE, window_s=0.05)
+
+
+class TestDiagnosis:
+    @pytest.mark.parametrize(
+        ("mode", "progress", "expected"),
+        [
+            (DegradationMode.NORMAL, 0.0, DegradationMode.NORMAL),
+            (DegradationMode.MISALIGNMENT, 0.8, DegradationMode.MISALIGNMENT),
+            (DegradationMode.BEARING, 0.5, DegradationMode.BEARING),
+        ],
+    )
+    def test_simulated_faults_are_recognised(self, rng, mode, progress, expected):
+        x = generate_waveform("BALL-01", 20, mode=mode, progress=progress, rng=rng)
+        assert summarize(spectral_features(x, FS, BALL_DRIVE)).mode == expected
+
+    def test_health_summary_reports_diagnosis_without_changing_hi(self, rng, sample_ball_reading):
+        x = generate_waveform(
+            "BALL-01", 20, mode=DegradationMode.MISALIGNMENT, progress=0.9, rng=rng
+        )
+        spectral = summarize(spectral_features(x, FS, BALL_DRIVE))
+        plain = compute_health_summary(sample_ball_reading)
+        summary = compute_health_summary(sample_ball_reading, spectral)
+        assert summary.spectral_mode == DegradationMode.MISALIGNMENT
+        assert summary.order_2x_ratio == round(spectral.order_2x_ratio, 2)
+        assert plain.spectral_mode is None
+        assert summary.health_index == plain.health_index
+        hi, _ = compute_health_batch(
+            "BALL-01",
+            np.array([sample_ball_reading.vibration_mms]),
+            np.array([sample_ball_reading.bearing_temp_c]),
+            np.array([sample_ball_reading.hydraulic_pressure_bar]),
+            np.array([sample_ball_reading.power_kw]),
+        )
+        assert hi[0] == summary.health_index
+
+
+class TestSpectralFrame:
+    def test_anomaly_periods_catch_misalignment_onset(self, rng, tmp_path, now):
+        wf = WaveformStore(tmp_path / "wf")
+        for i, progress in enumerate([0.0] * 40 + [0.9] * 10):
+            x = generate_waveform(
+                "BALL-01", 1, mode=DegradationMode.MISALIGNMENT, progress=progress, rng=rng
+            )
+            wf.append("BALL-01", now + timedelta(seconds=i), x, FS)
+        frame = spectral_frame(wf.read("BALL-01", now, now + timedelta(minutes=1)), BALL_DRIVE)
+        wf.close()
+        assert len(frame) == 50
+        assert frame["timestamp"].iloc[40] == pd.Timestamp(now) + pd.Timedelta(seconds=40)
+        periods = get_anomaly_periods(frame, "order_2x_ratio")
+        strongest = max(periods, key=lambda p: p["peak_zscore"])
+        assert strongest["start"] == frame["timestamp"].iloc[40]
+
+    def test_empty(self):
+        assert spectral_frame([], SAG_DRIVE).empty
@@ -0,0 +1,542 @@
+"""
+tests/test_store.py
+────────────────────
+Tests for the SQLite data store (in-memory DB, see conftest.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.drift import DRIFT_CONFIG, ewma_chart
+from src.data import store
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded_db():
+    store.initialize_db(force_reseed=True)
+    yield
+
+
+class TestGetReadings:
+    def test_returns_typed_columns(self):
+        df = store.get_readings("SAG-01")
+        assert not df.empty
+        assert isinstance(df["timestamp"].dtype, pd.DatetimeTZDtype)
+        assert str(df["timestamp"].dt.tz) == "UTC"
+        assert df["vibration_mms"].dtype == np.float64
+        assert df["id"].dtype == np.int64
+
+    def test_chronological_order(self):
+        df = store.get_readings("SAG-01")
+        assert df["timestamp"].is_monotonic_increasing
+
+    def test_matches_sql_values(self):
+        df = store.get_readings("BALL-01")
+        conn = store._get_conn()
+        ref = pd.read_sql_query(
+            "SELECT * FROM readings WHERE equipment_id = ? ORDER BY timestamp ASC",
+            conn,
+            params=("BALL-01",),
+        )
+        assert len(df) == len(ref)
+        np.testing.assert_array_equal(df["health_index"], ref["health_index"])
+        expected_ts = pd.to_datetime(ref["timestamp"], utc=True)
+        assert (df["timestamp"].values == expected_ts.values).all()
+
+    def test_nullable_columns_are_nan(self):
+        df = store.get_readings("BALL-01")
+        assert df["liner_wear_pct"].isna().all()
+        assert store.get_readings("SAG-01")["liner_wear_pct"].notna().all()
+
+    def test_limit_and_unknown_equipment(self):
+        full = store.get_readings("SAG-01")
+        newest = store.get_readings("SAG-01", limit=5)
+        assert newest["timestamp"].tolist() == full["timestamp"].tail(5).tolist()
+        empty = store.get_readings("NOPE-99")
+        assert empty.empty
+        assert "health_index" in empty.columns
+
+
+class TestSubscores:
+    def test_stored_with_readings(self):
+        df = store.get_readings("SAG-01")
+        scores = df[["vibration_score", "thermal_score", "pressure_score", "power_score"]]
+        assert scores.notna().all().all()
+        weighted = scores @ np.array([0.30, 0.25, 0.20, 0.25])
+        np.testing.assert_allclose(weighted, df["health_index"], atol=0.02)
+
+    def test_rescore_restores_missing_scores(self):
+        before = store.get_readings("BALL-01", limit=50)
+        conn = store._get_conn()
+        with conn:
+            conn.execute(
+                "UPDATE readings SET vibration_score = NULL, power_score = NULL, "
+                "weights_version = NULL"
+            )
+        assert store.rescore_health(chunk_size=1_000) > 0
+        after = store.get_readings("BALL-01", limit=50)
+        pd.testing.assert_frame_equal(before, after)
+        assert store.rescore_health() == 0
+
+    def test_old_schema_gets_columns(self):
+        import sqlite3
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute(
+            "CREATE TABLE readings (id INTEGER PRIMARY KEY, timestamp TEXT, "
+            "equipment_id TEXT, health_index REAL)"
+        )
+        store._create_tables(conn)
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(readings)")}
+        assert {"vibration_score", "power_score", "weights_version"} <= cols
+
+
+class TestRescoreHealth:
+    def test_new_weight_profile_rescores_history(self, monkeypatch):
+        from config.equipment import HI_WEIGHT_PROFILES, WeightProfile
+
+        before = store.get_readings("SAG-01")
+        version_before = store.get_data_version()
+        rewrites = {
+            eq: store.get_data_version("rewrites", equipment_id=eq) for eq in ("SAG-01", "BALL-01")
+        }
+        v2 = WeightProfile(version=2, vibration=0.55, thermal=0.15, pressure=0.15, power=0.15)
+        monkeypatch.setitem(HI_WEIGHT_PROFILES, "SAG", (*HI_WEIGHT_PROFILES["SAG"], v2))
+        calls = []
+        done = store.rescore_health(chunk_size=100, progress=lambda d, t: calls.append((d, t)))
+
+        assert done == len(before)  # only SAG-01 uses the SAG profile
+        assert calls[-1] == (done, done) and len(calls) == -(-done // 100)
+        after = store.get_readings("SAG-01")
+        scores = after[["vibration_score", "thermal_score", "pressure_score", "power_score"]]
+        np.testing.assert_allclose(
+            scores @ np.array([0.55, 0.15, 0.15, 0.15]), after["health_index"], atol=0.02
+        )
+        assert not np.allclose(after["health_index"], before["health_index"])
+        assert store.get_data_version() > version_before
+        assert store.get_data_version("rewrites", equipment_id="SAG-01") == rewrites["SAG-01"] + 1
+        assert store.get_data_version("rewrites", equipment_id="BALL-01") == rewrites["BALL-01"]
+        assert store.get_trend_tracker("SAG-01").level == pytest.approx(
+            after["health_index"].iloc[-1], abs=5
+        )
+
+        monkeypatch.undo()
+        store.rescore_health()
+        np.testing.assert_array_equal(
+            store.get_readings("SAG-01")["health_index"], before["health_index"]
+        )
+
+    def test_force_rescores_everything(self):
+        total = len(store.get_readings("SAG-01")) + len(store.get_readings("BALL-01"))
+        assert store.rescore_health(force=True) == total
+
+
+@pytest.fixture
+def bulk_ids():
+    ids = ("BULK-01", "BULK-02")
+    yield ids
+    conn = store._get_conn()
+    with conn:
+        for table in ("readings", "trend_state", "mahalanobis_state", "drift_state", "alerts"):
+            conn.execute(f"DELETE FROM {table} WHERE equipment_id IN (?, ?)", ids)
+
+
+class TestBulkInsert:
+    _STORED = (
+        "SELECT timestamp, vibration_mms, bearing_temp_c, hydraulic_pressure_bar, power_kw, "
+        "load_pct, liner_wear_pct, seal_condition_pct, throughput_tph, degradation_mode, "
+        "health_index, vibration_score, thermal_score, pressure_score, power_score, "
+        "weights_version FROM readings WHERE equipment_id = ? ORDER BY id"
+    )
+
+    def test_frame_matches_model_path(self, bulk_ids):
+        from src.data.frames import to_dataframe
+        from src.data.simulator import generate_history
+
+        frame_id, model_id = bulk_ids
+        readings = generate_history(seed=3, days=3)["SAG-01"]
+        df = to_dataframe(readings).drop(columns="health_index")
+        df["equipment_id"] = frame_id
+        assert store.insert_readings_frame(df) == len(readings)
+
+        for r in readings:
+            r.equipment_id = model_id  # health_index left at its default of 100
+        store.insert_readings(readings)
+
+        conn = store._get_conn()
+        stored = [[tuple(row) for row in conn.execute(self._STORED, (eq,))] for eq in bulk_ids]
+        assert stored[0] == stored[1]
+        frame_tracker = store.get_trend_tracker(frame_id)
+        assert frame_tracker == store.get_trend_tracker(model_id)
+        assert frame_tracker.n == len(readings)
+
+    def test_arrays_timestamps_and_nulls(self, bulk_ids):
+        from datetime import UTC, datetime
+
+        stamps = pd.DatetimeIndex(["2030-01-01 00:00:00", "2030-01-01 01:00:00.250000"])
+        n = store.insert_readings_arrays(
+            bulk_ids[0],
+            stamps,  # naive → UTC
+            vibration_mms=np.array([1.2, 1.3]),
+            bearing_temp_c=[55.0, 56.0],
+            hydraulic_pressure_bar=[150.0, 151.0],
+            power_kw=[12_000.0, 12_100.0],
+            load_pct=[40.0, 41.0],
+            throughput_tph=[3_000.0, 3_010.0],
+            liner_wear_pct=[np.nan, 20.0],
+            degradation_mode=["normal", "liner"],
+        )
+        assert n == 2
+        rows = store._get_conn().execute(self._STORED, (bulk_ids[0],)).fetchall()
+        expected = [datetime(2030, 1, 1, tzinfo=UTC), datetime(2030, 1, 1, 1, 0, 0, 250_000, UTC)]
+        assert [row["timestamp"] for row in rows] == [t.isoformat() for t in expected]
+        assert [row["liner_wear_pct"] for row in rows] == [None, 20.0]
+        assert [row["seal_condition_pct"] for row in rows] == [None, None]
+        assert [row["degradation_mode"] for row in rows] == ["normal", "liner"]
+
+    def test_live_writes_keep_the_default_synchronous_level(self, bulk_ids, monkeypatch):
+        def bulk_load(*args, **kwargs):
+            raise AssertionError("only the seed may relax synchronous")
+
+        monkeypatch.setattr(store, "_bulk_load", bulk_load)
+        assert store.insert_readings_frame(_frame(bulk_ids[0], "2030-01-01", range(2))) == 2
+
+    def test_record_default_health_index_is_scored(self, bulk_ids):
+        from src.analytics.health_index import compute_health_summary
+        from src.data.models import ReadingRecord
+
+        record = ReadingRecord(
+            equipment_id=bulk_ids[0],
+            timestamp=pd.Timestamp("2030-01-01", tz="UTC").to_pydatetime(),
+            vibration_mms=9.0,
+            bearing_temp_c=80.0,
+            hydraulic_pressure_bar=150.0,
+            power_kw=12_000.0,
+            load_pct=40.0,
+            throughput_tph=3_000.0,
+        )
+        assert record.health_index == 100.0
+        store.insert_readings([record])
+        row = store._get_conn().execute(self._STORED, (bulk_ids[0],)).fetchone()
+        assert row["health_index"] == pytest.approx(
+            compute_health_summary(record).health_index, abs=0.01
+        )
+        assert row["health_index"] < 100.0
+        assert row["weights_version"] == store.weight_profile(bulk_ids[0]).version
+
+    def test_given_health_index_is_left_for_rescoring(self, bulk_ids):
+        frame = _frame(bulk_ids[0], "2030-01-01", range(3), vibration=9.0)
+        frame["health_index"] = 100.0
+        store.insert_readings_frame(frame)
+        query = "SELECT health_index, weights_version FROM readings WHERE equipment_id = ?"
+        conn = store._get_conn()
+        assert [tuple(row) for row in conn.execute(query, (bulk_ids[0],))] == [(100.0, None)] * 3
+
+        assert store.rescore_health() == 3
+        rows = conn.execute(query, (bulk_ids[0],)).fetchall()
+        assert all(row["health_index"] < 100.0 for row in rows)
+        assert {row["weights_version"] for row in rows} == {
+            store.weight_profile(bulk_ids[0]).version
+        }
+
+        # Read back and redelivered: the stored HI is the score, nothing changes
+        assert store.insert_readings_frame(store.get_readings(bulk_ids[0])) == 0
+
+    @pytest.mark.parametrize(
+        ("override", "match"),
+        [
+            ({"vibration_mms": [1.0, 51.0]}, "vibration_mms"),
+            ({"load_pct": [40.0, np.nan]}, "load_pct"),
+            ({"power_kw": [1.0]}, "expected 2"),
+            ({"degradation_mode": "worn"}, "degradation_mode"),
+        ],
+    )
+    def test_arrays_rejects_bad_values(self, bulk_ids, override, match):
+        columns = {
+            "vibration_mms": [1.0, 1.1],
+            "bearing_temp_c": [55.0, 55.0],
+            "hydraulic_pressure_bar": [150.0, 150.0],
+            "power_kw": [12_000.0, 12_000.0],
+            "load_pct": [40.0, 40.0],
+            "throughput_tph": [3_000.0, 3_000.0],
+        } | override
+        stamps = pd.date_range("2030-01-01", periods=2, freq="h", tz="UTC")
+        with pytest.raises(ValueError, match=match):
+            store.insert_readings_arrays(bulk_ids[0], stamps, **columns)
+        assert store.get_trend_tracker(bulk_ids[0]) is None
+
+
+def _frame(equipment_id, start, hours, vibration=1.2):
+    n = len(hours)
+    return pd.DataFrame(
+        {
+            "timestamp": pd.Timestamp(start).tz_localize(None).tz_localize("UTC")
+            + pd.to_timedelta(hours, unit="h"),
+            "equipment_id": equipment_id,
+            "vibration_mms": vibration,
+            "bearing_temp_c": np.linspace(55.0, 60.0, n),
+            "hydraulic_pressure_bar": 150.0,
+            "power_kw": 12_000.0,
+            "load_pct": 40.0,
+            "throughput_tph": 3_000.0,
+        }
+    )
+
+
+class TestUpsert:
+    def test_replayed_batch_is_a_no_op(self, bulk_ids):
+        df = _frame(bulk_ids[0], "2030-01-01", range(24))
+        assert store.insert_readings_frame(df) == 24
+        version = store.get_data_version()
+        assert store.insert_readings_frame(df) == 0
+        assert store.get_data_version() == version
+        (count,) = (
+            store._get_conn()
+            .execute("SELECT COUNT(*) FROM readings WHERE equipment_id = ?", (bulk_ids[0],))
+            .fetchone()
+        )
+        assert count == 24
+
+    def test_new_values_replace_the_row(self, bulk_ids):
+        store.insert_readings_frame(_frame(bulk_ids[0], "2030-01-01", range(3)))
+        assert store.insert_readings_frame(_frame(bulk_ids[0], "2030-01-01", [1], 30.0)) == 1
+        rows = (
+            store._get_conn()
+            .execute(
+                "SELECT vibration_mms, vibration_score FROM readings WHERE equipment_id = ? "
+                "ORDER BY timestamp",
+                (bulk_ids[0],),
+            )
+            .fetchall()
+        )
+        assert [r["vibration_mms"] for r in rows] == [1.2, 30.0, 1.2]
+        assert rows[1]["vibration_score"] < rows[0]["vibration_score"]
+
+    def test_late_rows_replay_the_trend_tracker(self, bulk_ids):
+        late, in_order = bulk_ids
+        store.insert_readings_frame(_frame(late, "2030-01-01", range(0, 48, 2)))
+        rewrites = store.get_data_version("rewrites", equipment_id=late)
+        store.insert_readings_frame(_frame(late, "2030-01-01", range(1, 48, 2)))
+        assert store.get_data_version("rewrites", equipment_id=late) == rewrites + 1
+
+        # The same rows ingested in time order give the same trend state
+        stored = store.get_readings(late).assign(equipment_id=in_order)
+        store.insert_readings_frame(stored)
+        assert store.get_trend_tracker(late) == store.get_trend_tracker(in_order)
+        assert store.get_trend_tracker(late).n == 48
+
+    def test_redelivered_rows_fold_only_the_new_ones(self, bulk_ids):
+        redelivered, in_order = bulk_ids
+        vibration = np.where(np.arange(240) < 200, 1.2, 4.0)  # a step in the new rows
+        df = _frame(redelivered, "2030-01-01", range(240), vibration)
+        for eq in bulk_ids:
+            store.insert_readings_frame(df[:180].assign(equipment_id=eq))
+        rewrites = store.get_data_version("rewrites", equipment_id=redelivered)
+
+        # At-least-once delivery: the batch repeats rows already stored
+        assert store.insert_readings_frame(df[150:240]) == 60
+        store.insert_readings_frame(df[180:240].assign(equipment_id=in_order))
+
+        assert store.get_data_version("rewrites", equipment_id=redelivered) == rewrites
+        assert store.get_trend_tracker(redelivered) == store.get_trend_tracker(in_order)
+        assert store.get_drift_detectors(redelivered) == store.get_drift_detectors(in_order)
+        a, b = map(store.get_mahalanobis_tracker, bulk_ids)
+        assert a.n == b.n == 240 and a.timestamp == b.timestamp
+        np.testing.assert_array_equal(a.scatter, b.scatter)
+        alerts = store.get_alerts(days=365 * 20)
+        assert (alerts["equipment_id"] == redelivered).sum() > 0
+        assert (alerts["equipment_id"] == redelivered).sum() == (
+            alerts["equipment_id"] == in_order
+        ).sum()
+
+    def test_versions_are_per_equipment_and_window(self, bulk_ids):
+        eq = bulk_ids[0]
+        now = pd.Timestamp.now(tz="UTC").floor("h")
+        store.insert_readings_frame(_frame(eq, now - pd.Timedelta(hours=10), range(10)))
+        sag = store.get_data_version(equipment_id="SAG-01")
+        recent = store.get_data_version(equipment_id=eq, hours=24)
+        overall = store.get_data_version(equipment_id=eq)
+
+        # A late row from two weeks ago: outside the 24 h window
+        store.insert_readings_frame(_frame(eq, now - pd.Timedelta(days=14), [0]))
+        assert store.get_data_version(equipment_id=eq, hours=24) == recent
+        assert store.get_data_version(equipment_id=eq) > overall
+        assert store.get_data_version(equipment_id="SAG-01") == sag
+
+    def test_duplicates_collapse_when_the_key_is_added(self):
+        import sqlite3
+
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(
+            store._CREATE_READINGS
+            + "CREATE INDEX idx_readings_eq_ts ON readings (equipment_id, timestamp);"
+        )
+        rows = [("2030-01-01T00:00:00+00:00", hi) for hi in (70.0, 80.0)]
+        rows.append(("2030-01-01T01:00:00+00:00", 90.0))
+        conn.executemany(
+            "INSERT INTO readings (timestamp, equipment_id, vibration_mms, bearing_temp_c, "
+            "hydraulic_pressure_bar, power_kw, load_pct, throughput_tph, health_index) "
+            "VALUES (?, 'OLD-01', 1, 50, 150, 12000, 40, 3000, ?)",
+            rows,
+        )
+        store._create_tables(conn)
+        stored = conn.execute("SELECT health_index FROM readings ORDER BY timestamp").fetchall()
+        assert [row[0] for row in stored] == [80.0, 90.0]
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        assert "ux_readings_eq_ts" in names and "idx_readings_eq_ts" not in names
+        assert conn.execute("SELECT COUNT(*) FROM bucket_versions").fetchone()[0] == 2
+
+
+class TestGetLatestMany:
+    def test_matches_get_latest(self):
+        df = store.get_latest_many(["SAG-01", "BALL-01"])
+        assert list(df["equipment_id"]) == ["SAG-01", "BALL-01"]
+        for row in df.to_dict("records"):
+            single = store.get_latest(row["equipment_id"])
+            assert row["id"] == single["id"]
+            assert row["health_index"] == single["health_index"]
+
+    def test_preserves_requested_order(self):
+        df = store.get_latest_many(["BALL-01", "SAG-01"])
+        assert list(df["equipment_id"]) == ["BALL-01", "SAG-01"]
+
+    def test_unknown_and_empty_ids(self):
+        assert list(store.get_latest_many(["NOPE-99", "SAG-01"])["equipment_id"]) == ["SAG-01"]
+        assert store.get_latest_many([]).empty
+
+
+class TestTrendTracker:
+    def test_state_follows_ingested_readings(self):
+        df = store.get_readings("SAG-01")
+        tracker = store.get_trend_tracker("SAG-01")
+        assert tracker.n == len(df)
+        assert tracker.timestamp == df["timestamp"].iloc[-1].to_pydatetime()
+
+    def test_unknown_equipment(self):
+        assert store.get_trend_tracker("NOPE-99") is None
+
+
+class TestMahalanobisTracker:
+    def test_state_follows_ingested_readings(self):
+        df = store.get_readings("BALL-01")
+        tracker = store.get_mahalanobis_tracker("BALL-01")
+        assert tracker.n == len(df)
+        assert tracker.timestamp == df["timestamp"].iloc[-1].to_pydatetime()
+        assert store.get_mahalanobis_tracker("NOPE-99") is None
+
+    def test_joint_excursion_raises_one_alert(self, bulk_ids, rng):
+        eq = bulk_ids[0]
+        df = _frame(eq, "2030-01-01", range(200))
+        df["vibration_mms"] = rng.normal(2.0, 0.2, 200)
+        df["bearing_temp_c"] = 55.0 + 5.0 * df["vibration_mms"] + rng.normal(0.0, 0.3, 200)
+        df["hydraulic_pressure_bar"] = rng.normal(150.0, 2.0, 200)
+        df["power_kw"] = rng.normal(12_000.0, 100.0, 200)
+        store.insert_readings_frame(df.iloc[:190])
+        version = store.get_data_version("alerts")
+
+        # Vibration up while the temperature does not follow: each within 2σ
+        df.loc[190:, "vibration_mms"] = 2.35
+        df.loc[190:, "bearing_temp_c"] = 64.0
+        for i in range(190, 200):
+            store.insert_readings_frame(df.iloc[i : i + 1])
+        alerts = store._query_alerts("2000-01-01", eq, None, 10)
+        alerts = alerts[alerts["category"] != "degradation"]  # the drift detectors see it too
+        assert list(alerts["category"]) == ["multivariate"]
+        assert alerts["timestamp"].iloc[0] == df["timestamp"].iloc[190]
+        assert store.get_data_version("alerts") > version
+
+        # Same rows in one batch, in time order: same state
+        stored = store.get_readings(eq).assign(equipment_id=bulk_ids[1])
+        store.insert_readings_frame(stored)
+        one, many = store.get_mahalanobis_tracker(bulk_ids[1]), store.get_mahalanobis_tracker(eq)
+        np.testing.assert_allclose(one.scatter, many.scatter, rtol=1e-9)
+        assert (one.n, one.timestamp, one.in_alert) == (many.n, many.timestamp, many.in_alert)
+
+    def test_rewrite_rebuilds_without_alerting(self, bulk_ids, rng):
+        eq = bulk_ids[0]
+        store.insert_readings_frame(_frame(eq, "2030-01-01", range(0, 100, 2)))
+        before = store.get_mahalanobis_tracker(eq)
+        alerts = store.get_data_version("alerts")
+        late = _frame(eq, "2030-01-01", range(1, 100, 2))
+        late["hydraulic_pressure_bar"] = 290.0
+        store.insert_readings_frame(late)
+        after = store.get_mahalanobis_tracker(eq)
+        assert after.n == before.n + 50
+        assert store.get_data_version("alerts") == alerts
+
+
+class TestDriftDetectors:
+    def test_state_follows_ingested_readings(self):
+        df = store.get_readings("SAG-01")
+        detectors = store.get_drift_detectors("SAG-01")
+        assert set(detectors) == {(v, d) for v in DRIFT_CONFIG for d in ("cusum", "ewma")}
+        cusum = detectors["bearing_temp_c", "cusum"]
+        assert cusum.timestamp == df["timestamp"].iloc[-1].to_pydatetime()
+        assert cusum.reference.mean == pytest.approx(
+            df["bearing_temp_c"].tail(300).mean(), rel=0.02
+        )
+        assert store.get_drift_detectors("NOPE-99")["power_kw", "ewma"].timestamp is None
+
+    def test_slow_rise_alerts_once_per_detector(self, bulk_ids, rng):
+        eq = bulk_ids[0]
+        df = _frame(eq, "2030-01-01", range(400))
+        df["bearing_temp_c"] = rng.normal(55.0, 0.5, 400)
+        df.loc[300:, "bearing_temp_c"] += np.linspace(0.0, 4.0, 100)
+        store.insert_readings_frame(df.iloc[:300])
+        for i in range(300, 400, 10):
+            store.insert_readings_frame(df.iloc[i : i + 10])
+
+        alerts = store._query_alerts("2000-01-01", eq, None, 10)
+        alerts = alerts[alerts["variable"] == "bearing_temp_c"]
+        assert sorted(alerts["message"].str.extract(r"por (\w+)$")[0]) == ["CUSUM", "EWMA"]
+        assert (alerts["category"] == "degradation").all() and (alerts["value"] > 0).all()
+        assert (alerts["timestamp"] > df["timestamp"].iloc[300]).all()
+
+        # Same rows in one batch: same detector state
+        store.insert_readings_frame(store.get_readings(eq).assign(equipment_id=bulk_ids[1]))
+        one = store.get_drift_detectors(bulk_ids[1])["bearing_temp_c", "cusum"]
+        many = store.get_drift_detectors(eq)["bearing_temp_c", "cusum"]
+        assert one.upper == pytest.approx(many.upper, rel=1e-9)
+        assert (one.up, one.reference.timestamp_us) == (many.up, many.reference.timestamp_us)
+
+    def test_rewrite_rebuilds_without_alerting(self, bulk_ids):
+        eq = bulk_ids[0]
+        store.insert_readings_frame(_frame(eq, "2030-01-01", range(0, 200, 2)))
+        alerts = store.get_data_version("alerts")
+        late = _frame(eq, "2030-01-01", range(1, 200, 2))
+        late["hydraulic_pressure_bar"] = 170.0
+        store.insert_readings_frame(late)
+        detector = store.get_drift_detectors(eq)["hydraulic_pressure_bar", "ewma"]
+        stored = store.get_readings(eq)
+        replay = ewma_chart(stored["hydraulic_pressure_bar"], stored["timestamp"])
+        assert detector.count == np.count_nonzero(~np.isnan(replay.z))
+        assert detector.value == pytest.approx(replay.upper[-1], rel=1e-9)
+        assert store.get_data_version("alerts") == alerts
+
+
+class TestResetAfterFork:
+    def test_keeps_ready_state_and_memory_db(self):
+        conn = store._get_conn()
+        store.reset_after_fork()
+        assert store.is_ready()
+        # The in-memory DB is the child's private copy, so it is kept
+        assert store._get_conn() is conn
+        assert not store.get_readings("SAG-01", limit=1).empty
+
+
+class TestInitializeDb:
+    def test_ready_after_seeding(self):
+        assert store.is_ready()
+
+    def test_indexes_rebuilt_after_seeding(self):
+        conn = store._get_conn()
+        names = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert {"ux_readings_eq_ts", "idx_alerts_eq_ts"} <= names
+
+    def test_second_call_does_not_reseed(self):
+        before = store.get_latest("SAG-01")["id"]
+        store.initialize_db()
+        assert store.get_latest("SAG-01")["id"] == before
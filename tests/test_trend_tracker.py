@@ -0,0 +1,57 @@
+"""
+tests/test_trend_tracker.py
+────────────────────────────
+Tests for the online (Kalman) health-index trend tracker.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from src.analytics.trend_tracker import TrendTracker
+
+
+def _track(values, now):
+    tracker = TrendTracker.start(values[0], now)
+    for i, v in enumerate(values[1:], start=1):
+        tracker.update(v, now + timedelta(hours=i))
+    return tracker
+
+
+class TestTrendTracker:
+    def test_converges_to_true_slope(self, rng, now):
+        hi = 90 - 0.12 * np.arange(300) + rng.normal(0, 1.0, 300)
+        tracker = _track(hi, now)
+        assert abs(tracker.slope - (-0.12)) < 0.02
+        assert abs(tracker.level - (90 - 0.12 * 299)) < 1.5
+
+    def test_rul_from_state(self, rng, now):
+        hi = 90 - 0.12 * np.arange(300) + rng.normal(0, 1.0, 300)
+        rul = _track(hi, now).rul_days()
+        # True remaining: (54.1 - 20) / 0.12 h ≈ 11.8 days
+        assert 10.0 < rul < 14.0
+
+    def test_flat_series_is_stable(self, now):
+        assert _track(np.full(100, 88.0), now).rul_days() is None
+
+    def test_below_critical_is_zero(self, now):
+        assert _track(np.linspace(40, 15, 60), now).rul_days() == 0.0
+
+    def test_ignores_out_of_order_readings(self, now):
+        tracker = _track([90.0, 89.0, 88.0, 87.0], now)
+        state = (tracker.level, tracker.slope, tracker.n)
+        tracker.update(10.0, now)
+        assert (tracker.level, tracker.slope, tracker.n) == state
+
+    def test_too_few_points_returns_none(self, now):
+        assert _track([80.0, 70.0], now).rul_days() is None
+
+    def test_update_many_matches_update(self, rng, now):
+        hi = (90 - 0.1 * np.arange(50) + rng.normal(0, 1.0, 50)).tolist()
+        epoch_us = [int(now.timestamp() * 1e6) + i * 3_600_000_123 for i in range(50)]
+        one_by_one = TrendTracker.start(hi[0], now)
+        for i, v in enumerate(hi[1:], start=1):
+            one_by_one.update(v, now + timedelta(microseconds=i * 3_600_000_123))
+        batched = TrendTracker.start(hi[0], now)
+        batched.update_many(hi[1:] + [5.0], epoch_us[1:] + [epoch_us[3]])  # last is stale
+        assert batched == one_by_one
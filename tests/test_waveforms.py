@@ -0,0 +1,112 @@
+"""
+tests/test_waveforms.py
+───────────────────────
+Tests for the memory-mapped waveform store.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.data.waveforms import WaveformStore
+
+T0 = datetime(2024, 6, 1, 12, 0, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def wf(tmp_path):
+    store = WaveformStore(tmp_path / "wf")
+    yield store
+    store.close()
+
+
+def _blocks(store, equipment_id):
+    return (
+        store._get_conn()
+        .execute("SELECT COUNT(*) FROM blocks WHERE equipment_id = ?", (equipment_id,))
+        .fetchone()[0]
+    )
+
+
+class TestAppendAndRead:
+    def test_round_trip(self, wf, rng):
+        samples = rng.normal(size=(5_000, 3)).astype(np.float32)
+        wf.append("SAG-01", T0, samples, 1_000.0)
+        (sl,) = wf.read("SAG-01", T0, T0 + timedelta(seconds=5))
+        assert sl.start == T0
+        assert sl.sample_rate_hz == 1_000.0
+        np.testing.assert_array_equal(sl.data, samples)
+
+    def test_slice_is_zero_copy_view(self, wf, rng):
+        wf.append("SAG-01", T0, rng.normal(size=10_000), 10_000.0)
+        (sl,) = wf.read("SAG-01", T0 + timedelta(milliseconds=250), T0 + timedelta(seconds=1))
+        assert isinstance(sl.data, np.memmap)
+        assert not sl.data.flags.owndata
+        assert not sl.data.flags.writeable
+        assert sl.data.shape == (7_500, 1)
+        assert sl.start == T0 + timedelta(milliseconds=250)
+
+    def test_window_bounds_are_half_open(self, wf):
+        wf.append("SAG-01", T0, np.arange(100, dtype=np.float32), 100.0)
+        (sl,) = wf.read("SAG-01", T0 + timedelta(seconds=0.105), T0 + timedelta(seconds=0.5))
+        assert sl.data[:, 0].tolist() == list(range(11, 50))
+        assert sl.times_us()[0] == sl.start_us
+
+    def test_continuous_appends_extend_one_block(self, wf, rng):
+        chunks = [rng.normal(size=(2_560, 2)) for _ in range(10)]
+        for i, chunk in enumerate(chunks):
+            wf.append("BALL-01", T0 + timedelta(seconds=0.1 * i), chunk, 25_600.0)
+        assert _blocks(wf, "BALL-01") == 1
+        (sl,) = wf.read("BALL-01", T0, T0 + timedelta(seconds=1))
+        np.testing.assert_array_equal(sl.data, np.vstack(chunks).astype(np.float32))
+
+    def test_gap_starts_a_new_block(self, wf):
+        wf.append("SAG-01", T0, np.zeros(1_000), 1_000.0)
+        wf.append("SAG-01", T0 + timedelta(seconds=5), np.ones(1_000), 1_000.0)
+        slices = wf.read("SAG-01", T0, T0 + timedelta(seconds=10))
+        assert [s.start for s in slices] == [T0, T0 + timedelta(seconds=5)]
+        assert wf.read("SAG-01", T0 + timedelta(seconds=2), T0 + timedelta(seconds=3)) == []
+
+    def test_append_across_midnight_splits_segments(self, wf):
+        start = datetime(2024, 6, 1, 23, 59, 59, tzinfo=UTC)
+        wf.append("SAG-01", start, np.arange(2_000, dtype=np.float32), 1_000.0)
+        assert wf.days("SAG-01") == ["2024-06-01", "2024-06-02"]
+        slices = wf.read("SAG-01", start, start + timedelta(seconds=2))
+        assert [len(s.data) for s in slices] == [1_000, 1_000]
+        assert slices[1].start == datetime(2024, 6, 2, tzinfo=UTC)
+        assert np.concatenate([s.data[:, 0] for s in slices]).tolist() == list(range(2_000))
+
+
+class TestIntegrity:
+    def test_rejects_overlap_and_channel_change(self, wf):
+        wf.append("SAG-01", T0, np.zeros((1_000, 2)), 1_000.0)
+        with pytest.raises(ValueError):
+            wf.append("SAG-01", T0 + timedelta(seconds=0.5), np.zeros((10, 2)), 1_000.0)
+        with pytest.raises(ValueError):
+            wf.append("SAG-01", T0 + timedelta(seconds=1), np.zeros((10, 3)), 1_000.0)
+
+    def test_unindexed_tail_is_truncated(self, wf, tmp_path):
+        wf.append("SAG-01", T0, np.zeros(100), 100.0)
+        wf.close()
+        # An append whose index commit never happened leaves stray bytes
+        with open(tmp_path / "wf" / "SAG-01" / "2024-06-01.f32", "ab") as fh:
+            fh.write(b"\xff" * 64)
+        wf.append("SAG-01", T0 + timedelta(seconds=1), np.ones(100), 100.0)
+        (sl,) = wf.read("SAG-01", T0, T0 + timedelta(seconds=2))
+        assert sl.data[:, 0].tolist() == [0.0] * 100 + [1.0] * 100
+
+    def test_visible_to_another_reader(self, wf, tmp_path):
+        reader = WaveformStore(tmp_path / "wf")
+        wf.append("SAG-01", T0, np.zeros(100), 100.0)
+        assert len(reader.read("SAG-01", T0, T0 + timedelta(seconds=9))[0].data) == 100
+        wf.append("SAG-01", T0 + timedelta(seconds=1), np.ones(100), 100.0)
+        assert len(reader.read("SAG-01", T0, T0 + timedelta(seconds=9))[0].data) == 200
+        reader.close()
+
+    def test_prune_drops_old_days(self, wf):
+        wf.append("SAG-01", T0 - timedelta(days=2), np.zeros(10), 10.0)
+        wf.append("SAG-01", T0, np.zeros(10), 10.0)
+        assert wf.prune(T0) == 1
+        assert wf.days("SAG-01") == ["2024-06-01"]
+        assert not (wf.root / "SAG-01" / "2024-05-30.f32").exists()